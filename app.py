@@ -1,77 +1,269 @@
 from __future__ import annotations
+from time import perf_counter
+_t_import = perf_counter()
+import csv
+import itertools
 import json
+from functools import partial
 from pathlib import Path
 import numpy as np
-import pandas as pd
 import joblib
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from datascience.config_manager import load_config
+from datascience.flat_forest import FlatForest
+from datascience.inference import InferencePipeline
+from datascience.serving.batching import MicroBatcher
+from datascience.serving.cache import PredictionCache
+from datascience.serving import columnar
+from datascience.serving.decoder import RequestDecoder
+from datascience.serving.drift import DriftMonitor, DriftReference, bin_counts
+from datascience.serving.metrics import CONTENT_TYPE, ApiMetrics
+from datascience.serving.reloader import ModelReloader, ModelSnapshot, artifact_version
+from datascience.serving.uncertainty import as_json, parse_uncertainty, tree_spread
+from datascience.split_store import SplitStore
+
+# Serving imports stop here: pandas, sklearn and matplotlib stay unloaded unless a
+# legacy (unfused) model needs them.
+_IMPORT_S = perf_counter() - _t_import
 
 def _load_artifacts(cfg):
     model_dir = Path(cfg["paths"]["model_dir"])
     features = json.loads((model_dir / "features.json").read_text())
-    model = joblib.load(model_dir / "model.joblib")
+    pipeline_path = model_dir / "pipeline.joblib"
+    if pipeline_path.exists():
+        # Memory-mapped arrays are shared page-cache pages across gunicorn workers (and
+        # across reloads in each of them). Artifacts are published write-then-rename, so a
+        # mapping keeps its old inode; never rewrite pipeline.joblib in place (cp, joblib.dump).
+        if (cfg.get("serving", {}) or {}).get("mmap", False):
+            return features, joblib.load(pipeline_path, mmap_mode="r")
+        return features, joblib.load(pipeline_path)
 
+    # Artifacts trained before the fused pipeline existed: fuse on load
+    model = joblib.load(model_dir / "model.joblib")
     scaler = None
     scaler_path = Path(cfg["paths"]["data_processed_dir"]) / "scaler.joblib"
     if scaler_path.exists():
         scaler = joblib.load(scaler_path)
-    return features, model, scaler
-
-def _validate_and_frame(payload, feature_order):
-    # Accept {"data": {...}} or {"data": [{...}, {...}]}
-    if not isinstance(payload, dict) or "data" not in payload:
-        raise ValueError("Body must be JSON with a 'data' key.")
-
-    data = payload["data"]
-    if isinstance(data, dict):
-        rows = [data]
-    elif isinstance(data, list) and all(isinstance(r, dict) for r in data):
-        rows = data
-    else:
-        raise ValueError("'data' must be an object or a list of objects.")
-
-    # Check keys
-    missing = [f for f in feature_order if f not in rows[0]]
-    extra = [k for k in rows[0].keys() if k not in feature_order]
-    if missing:
-        raise ValueError(f"Missing keys: {missing}")
-    if extra:
-        raise ValueError(f"Unexpected keys: {extra}")
-
-    # Build DataFrame in the right column order
-    X = pd.DataFrame(rows, columns=feature_order)
-
-    # Coerce to numeric
-    for c in feature_order:
-        X[c] = pd.to_numeric(X[c], errors="raise")
-
-    return X
+    return features, InferencePipeline.fuse(features, model, scaler)
+
+def _model_files(cfg) -> list[Path]:
+    model_dir = Path(cfg["paths"]["model_dir"])
+    return [model_dir / "pipeline.joblib", model_dir / "model.joblib", model_dir / "features.json"]
+
+def _predictor(cfg, pipeline, metrics: ApiMetrics, cache: PredictionCache | None = None, version: str = ""):
+    """(run, close): decoded matrix -> predictions, timed per stage; micro-batched and cached if configured."""
+    def run(X):
+        # Decoded matrices are private to the request, so scaling can happen in place
+        t0 = perf_counter()
+        X = pipeline.transform(X)
+        t1 = perf_counter()
+        preds = pipeline.predict_transformed(X)
+        metrics.scale.observe(t1 - t0)
+        metrics.predict.observe(perf_counter() - t1)
+        metrics.batch_rows.observe(len(X))
+        return preds
+
+    close = None
+    batching = (cfg.get("serving", {}) or {}).get("batching", {}) or {}
+    if batching.get("enabled", False):
+        # Coalesce concurrent requests (threaded workers) into one predict call
+        batcher = MicroBatcher(
+            run,
+            max_batch_size=batching.get("max_batch_size", 64),
+            max_wait_ms=batching.get("max_wait_ms", 2),
+        )
+        run, close = batcher.predict, batcher.close
+
+    if cache is not None:
+        # Keyed per model version: a request still on the old snapshot after a swap
+        # must not store old answers where the new model would read them
+        run = partial(cache.predict, fn=run, tag=version.encode())
+    return run, close
+
+def _spread(pipeline, X, metrics: ApiMetrics, std: bool, quantiles: list[float]) -> dict:
+    """Mean plus per-tree std/quantiles from one stacked (rows, trees) evaluation; skips batching and the cache."""
+    t0 = perf_counter()
+    X = pipeline.transform(X)
+    t1 = perf_counter()
+    out = tree_spread(pipeline.predict_trees_transformed(X), std, quantiles)
+    metrics.scale.observe(t1 - t0)
+    metrics.predict.observe(perf_counter() - t1)
+    metrics.batch_rows.observe(len(X))
+    return out
+
+def _drift_monitor(cfg, features: list[str]) -> DriftMonitor | None:
+    """Monitor of live inputs against the training split the current model was fit on."""
+    opts = (cfg.get("serving", {}) or {}).get("drift", {}) or {}
+    if not opts.get("enabled", False):
+        return None
+    try:
+        X = SplitStore(cfg).load_array("X_train_raw", features)
+    except FileNotFoundError:
+        return None
+    reference = DriftReference.from_matrix(X, features, bins=opts.get("bins", 100))
+    return DriftMonitor(reference, cfg["paths"].get("drift_dir"), flush_s=opts.get("flush_s", 5),
+                        stale_s=opts.get("stale_s"))
+
+def _canary(cfg):
+    """Check a freshly loaded snapshot must pass before it serves traffic."""
+    raw = Path(cfg["paths"].get("data_raw", ""))
+    sep = (cfg.get("io", {}) or {}).get("csv_sep", ",")
+
+    def check(snap: ModelSnapshot):
+        X = np.zeros((1, len(snap.features)))
+        if raw.is_file():
+            with open(raw, newline="") as fh:
+                header, *rows = itertools.islice(csv.reader(fh, delimiter=sep), 9)
+            cols = [header.index(f) for f in snap.features]
+            X = np.array([[float(r[i]) for i in cols] for r in rows], dtype=np.float64)
+        preds = snap.pipeline.predict(X)
+        if preds.shape != (len(X),) or not np.isfinite(preds).all():
+            raise ValueError("Canary predictions are not one finite value per row.")
+    return check
+
+def _warm_up(snap: ModelSnapshot):
+    """Throwaway pass over each request-path step, so the first real request finds nothing lazy left to do."""
+    X = snap.decoder.decode({"data": [{f: 0.0 for f in snap.features}]})
+    snap.pipeline.predict(X)
+    if isinstance(snap.pipeline.model, FlatForest):
+        snap.pipeline.predict_trees_transformed(snap.pipeline.transform(X.copy()))
+    if snap.monitor is not None:
+        bin_counts(snap.monitor.reference.edges, X)  # not update(): live drift state stays empty
+
+def _serving_model(cfg, metrics: ApiMetrics) -> ModelReloader:
+    serving = cfg.get("serving", {}) or {}
+    reload = serving.get("reload", {}) or {}
+    reloading = reload.get("enabled", False)
+
+    cache = None
+    caching = serving.get("cache", {}) or {}
+    if caching.get("enabled", False):
+        # With hot reload the swap flushes the cache; otherwise it watches the files itself
+        cache = PredictionCache(
+            max_size=caching.get("max_size", 10000),
+            ttl_s=caching.get("ttl_s", 0),
+            watch=() if reloading else _model_files(cfg),
+        )
+        metrics.track_cache(cache)
+
+    def load() -> ModelSnapshot:
+        features, pipeline = _load_artifacts(cfg)
+        version = artifact_version(_model_files(cfg))
+        run, close = _predictor(cfg, pipeline, metrics, cache, version)
+        monitor = _drift_monitor(cfg, features)
+        snap = ModelSnapshot(version, features, pipeline, RequestDecoder(features), run, close, monitor)
+        if serving.get("warmup", True):
+            t0 = perf_counter()
+            _warm_up(snap)
+            metrics.startup.labels("warmup").set(perf_counter() - t0)
+        return snap
+
+    def on_swap(old: ModelSnapshot, new: ModelSnapshot):
+        if cache is not None:
+            cache.clear()
+
+    def on_retire(old: ModelSnapshot):
+        # No request holds the old snapshot any more: its batcher and drift flusher can stop
+        if old.close is not None:
+            old.close()
+        if old.monitor is not None:
+            old.monitor.close()
+
+    return ModelReloader(
+        load,
+        watch=_model_files(cfg),
+        poll_s=reload.get("poll_s", 2) if reloading else 0,
+        canary=_canary(cfg),
+        on_swap=on_swap,
+        on_retire=on_retire,
+    )
 
 def create_app(config_path: str = "config/config.yaml") -> Flask:
+    t0 = perf_counter()
     cfg = load_config(config_path)
-    features, model, scaler = _load_artifacts(cfg)
+    metrics = ApiMetrics()
+    model = _serving_model(cfg, metrics)
+    metrics.track_reloader(model)
+    metrics.startup.labels("import").set(_IMPORT_S)
+    metrics.startup.labels("load").set(perf_counter() - t0)
 
     app = Flask(__name__)
     CORS(app)
 
+    @app.before_request
+    def start_reloader():
+        # Not during create_app()'s warm-up: under preload_app that runs in the gunicorn master
+        if not request.environ.get("wine.warmup"):
+            model.ensure_started()
+
     @app.get("/health")
     def health():
-        return jsonify({"status": "ok", "model_dir": cfg["paths"]["model_dir"]})
+        return jsonify({"status": "ok", "model_dir": cfg["paths"]["model_dir"], "model_version": model.current.version})
+
+    @app.get("/metrics")
+    def prometheus_metrics():
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+    @app.get("/drift")
+    def drift():
+        monitor = model.current.monitor
+        if monitor is None:
+            return jsonify({"error": "Drift monitoring is disabled."}), 404
+        opts = cfg["serving"].get("drift", {}) or {}
+        return jsonify(monitor.report(psi_bins=opts.get("psi_bins", 10), psi_alert=opts.get("psi_alert", 0.2)))
 
     @app.post("/predict")
     def predict():
+        snap = model.acquire()  # one snapshot for the whole request, even across a swap
+        metrics.in_flight.inc()
+        t0 = perf_counter()
         try:
-            payload = request.get_json(force=True, silent=False)
-            X = _validate_and_frame(payload, features)
-            if scaler is not None:
-                X = pd.DataFrame(scaler.transform(X), columns=X.columns, index=X.index)
-            preds = model.predict(X)
-            return jsonify({"predictions": [float(p) for p in np.ravel(preds)], "n": len(X)})
+            binary = request.mimetype == columnar.CONTENT_TYPE
+            if binary:
+                body = request.get_data()
+                t1 = perf_counter()
+                X = snap.decoder.columnar.decode(body)  # read-only view of the body
+            else:
+                payload = request.get_json(force=True, silent=False)
+                t1 = perf_counter()
+                X = snap.decoder.decode(payload)
+            std, quantiles = parse_uncertainty(request.args)
+            t2 = perf_counter()
+            if snap.monitor is not None:
+                snap.monitor.update(X)  # before run: an unfused scaler transforms X in place
+                metrics.monitor.observe(perf_counter() - t2)
+                t2 = perf_counter()
+            if std or quantiles:
+                out = _spread(snap.pipeline, X, metrics, std, quantiles)
+            else:
+                out = {"predictions": snap.run(X)}
+            t3 = perf_counter()
+            if binary and columnar.wants_binary(request.headers.get("Accept")):
+                resp = Response(columnar.encode(columnar.prediction_columns(out)), content_type=columnar.CONTENT_TYPE)
+            else:
+                resp = jsonify({**as_json(out), "n": len(X)})
+            status, counter = 200, metrics.ok
+            metrics.parse.observe(t1 - t0)
+            metrics.validate.observe(t2 - t1)
+            metrics.serialize.observe(perf_counter() - t3)
         except Exception as e:
-            return jsonify({"error": str(e)}), 400
+            metrics.errors.labels(type(e).__name__).inc()
+            resp, status, counter = jsonify({"error": str(e)}), 400, metrics.rejected
+        finally:
+            model.release(snap)
+            metrics.in_flight.dec()
+        metrics.request.observe(perf_counter() - t0)
+        counter.inc()
+        return resp, status
 
+    if (cfg.get("serving", {}) or {}).get("warmup", True):
+        # Routing, JSON provider and request machinery set themselves up on first use;
+        # /health pays for that here (the model path was warmed in load()) without touching
+        # /predict metrics, the cache, drift state or the reloader thread.
+        t1 = perf_counter()
+        app.test_client().get("/health", environ_overrides={"wine.warmup": True})
+        metrics.startup.labels("warmup").inc(perf_counter() - t1)
     return app
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+"""Async (ASGI) serving entry point with the same /health, /predict and /metrics contracts as app.py.
+
+    uvicorn --factory asgi:create_asgi_app --host 0.0.0.0 --port 8000
+
+The event loop only reads request bodies and writes responses; parsing,
+validation and inference run on a bounded thread pool. Requests beyond
+``workers + max_queue`` get a 429 straight away, and each request is cut
+off with a 504 after ``timeout_ms`` (``serving.async`` in config.yaml).
+"""
+from __future__ import annotations
+import asyncio
+import json
+from urllib.parse import parse_qsl
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from app import _IMPORT_S, _serving_model, _spread
+from datascience.config_manager import load_config
+from datascience.serving import columnar
+from datascience.serving.metrics import CONTENT_TYPE, ApiMetrics
+from datascience.serving.uncertainty import as_json, parse_uncertainty
+
+_JSON = [(b"content-type", b"application/json")]
+_COLUMNAR = [(b"content-type", columnar.CONTENT_TYPE.encode())]
+
+def _json(obj) -> bytes:
+    return json.dumps(obj).encode()
+
+async def _respond(send, status: int, body: bytes, headers=_JSON):
+    headers = [*headers, (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+async def _read_body(receive, limit: int) -> bytes:
+    chunks, size = [], 0
+    while True:
+        msg = await receive()
+        if msg["type"] == "http.disconnect":
+            raise ConnectionError("Client disconnected.")
+        chunk = msg.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise ValueError(f"Body exceeds {limit} bytes.")
+        chunks.append(chunk)
+        if not msg.get("more_body", False):
+            return b"".join(chunks)
+
+async def _lifespan(receive, send, executor: ThreadPoolExecutor, model):
+    while True:
+        msg = await receive()
+        if msg["type"] == "lifespan.startup":
+            model.ensure_started()
+            await send({"type": "lifespan.startup.complete"})
+        elif msg["type"] == "lifespan.shutdown":
+            executor.shutdown(wait=False, cancel_futures=True)
+            model.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+def create_asgi_app(config_path: str = "config/config.yaml"):
+    t0 = perf_counter()
+    cfg = load_config(config_path)
+    metrics = ApiMetrics()
+    model = _serving_model(cfg, metrics)
+    metrics.track_reloader(model)
+    metrics.startup.labels("import").set(_IMPORT_S)
+    metrics.startup.labels("load").set(perf_counter() - t0)
+
+    opts = (cfg.get("serving", {}) or {}).get("async", {}) or {}
+    workers = int(opts.get("workers", 4))
+    max_pending = workers + int(opts.get("max_queue", 32))
+    timeout = float(opts.get("timeout_ms", 2000)) / 1000.0
+    max_body = int(opts.get("max_body_bytes", 1 << 20))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predict")
+    pending = 0  # admitted /predict requests; only touched from the event loop
+
+    def infer(snap, body: bytes, scope: dict) -> tuple[bytes, list]:
+        headers = {k.decode().lower(): v.decode() for k, v in scope.get("headers", [])}
+        binary = headers.get("content-type", "").split(";")[0].strip() == columnar.CONTENT_TYPE
+        query = scope.get("query_string", b"")
+        t0 = perf_counter()
+        if binary:
+            t1 = perf_counter()
+            X = snap.decoder.columnar.decode(body)
+        else:
+            payload = json.loads(body)
+            t1 = perf_counter()
+            X = snap.decoder.decode(payload)
+        std, quantiles = parse_uncertainty(dict(parse_qsl(query.decode())))
+        t2 = perf_counter()
+        if snap.monitor is not None:
+            snap.monitor.update(X)
+            metrics.monitor.observe(perf_counter() - t2)
+            t2 = perf_counter()
+        if std or quantiles:
+            res = _spread(snap.pipeline, X, metrics, std, quantiles)
+        else:
+            res = {"predictions": snap.run(X)}
+        t3 = perf_counter()
+        if binary and columnar.wants_binary(headers.get("accept")):
+            out, kind = columnar.encode(columnar.prediction_columns(res)), _COLUMNAR
+        else:
+            out, kind = _json({**as_json(res), "n": len(X)}), _JSON
+        metrics.parse.observe(t1 - t0)
+        metrics.validate.observe(t2 - t1)
+        metrics.serialize.observe(perf_counter() - t3)
+        return out, kind
+
+    def held(body: bytes, scope: dict) -> tuple[bytes, list]:
+        # Taken on the pool thread: a job cancelled while queued never holds a snapshot
+        snap = model.acquire()
+        try:
+            return infer(snap, body, scope)
+        finally:
+            model.release(snap)
+
+    async def predict(scope, receive, send):
+        nonlocal pending
+        if pending >= max_pending:
+            metrics.overloaded.inc()
+            await _respond(send, 429, _json({"error": "Server busy, retry later."}), _JSON + [(b"retry-after", b"1")])
+            return
+        pending += 1
+        metrics.in_flight.inc()
+        t0 = perf_counter()
+        try:
+            body = await asyncio.wait_for(_read_body(receive, max_body), timeout)
+            job = asyncio.wrap_future(executor.submit(held, body, scope))
+            # Cancelling the wrapper drops the job if it is still queued
+            out, kind = await asyncio.wait_for(job, max(0.0, timeout - (perf_counter() - t0)))
+            status, counter = 200, metrics.ok
+        except asyncio.TimeoutError:
+            metrics.errors.labels("TimeoutError").inc()
+            out, kind, status, counter = _json({"error": f"Timed out after {timeout * 1000:.0f} ms."}), _JSON, 504, metrics.timed_out
+        except Exception as e:
+            metrics.errors.labels(type(e).__name__).inc()
+            out, kind, status, counter = _json({"error": str(e)}), _JSON, 400, metrics.rejected
+        finally:
+            pending -= 1
+            metrics.in_flight.dec()
+        metrics.request.observe(perf_counter() - t0)
+        counter.inc()
+        await _respond(send, status, out, kind)
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await _lifespan(receive, send, executor, model)
+        if scope["type"] != "http":
+            return
+        route = (scope["method"], scope["path"])
+        if route == ("POST", "/predict"):
+            return await predict(scope, receive, send)
+        if route == ("GET", "/health"):
+            model.ensure_started()
+            status = {"status": "ok", "model_dir": cfg["paths"]["model_dir"], "model_version": model.current.version}
+            return await _respond(send, 200, _json(status))
+        if route == ("GET", "/drift"):
+            monitor = model.current.monitor
+            if monitor is None:
+                return await _respond(send, 404, _json({"error": "Drift monitoring is disabled."}))
+            drift = cfg["serving"].get("drift", {}) or {}
+            report = await asyncio.get_running_loop().run_in_executor(
+                executor, lambda: monitor.report(psi_bins=drift.get("psi_bins", 10), psi_alert=drift.get("psi_alert", 0.2)))
+            return await _respond(send, 200, _json(report))
+        if route == ("GET", "/metrics"):
+            return await _respond(send, 200, metrics.render().encode(), [(b"content-type", CONTENT_TYPE.encode())])
+        await _respond(send, 404, _json({"error": "Not found."}))
+
+    return app
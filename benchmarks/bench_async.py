@@ -0,0 +1,124 @@
+"""Load test: sync gunicorn (app.py) vs async uvicorn (asgi.py) tail latency at high concurrency.
+
+Both servers run the same number of processes. ``--slow`` of the ``--concurrency``
+clients trickle their request body over ``--trickle-ms``, which pins a sync
+worker for the whole upload but costs the event loop nothing.
+
+Usage: python benchmarks/bench_async.py [--concurrency 64] [--slow 8] [--seconds 10] [--workers 2]
+"""
+import argparse, asyncio, json, os, signal, socket, subprocess, sys, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from datascience.config_manager import load_config
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _start(kind: str, port: int, workers: int) -> subprocess.Popen:
+    if kind == "sync":
+        env = {**os.environ, "GUNICORN_BIND": f"127.0.0.1:{port}", "GUNICORN_WORKERS": str(workers)}
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:create_app()"]
+    else:
+        env = dict(os.environ)
+        cmd = [sys.executable, "-m", "uvicorn", "--factory", "asgi:create_asgi_app", "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def _wait_ready(port: int, proc: subprocess.Popen):
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            _, w = await asyncio.open_connection("127.0.0.1", port)
+            w.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+
+async def _client(port: int, body: bytes, stop_at: float, trickle: float, out: list):
+    head = (f"POST /predict HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode()
+    reader = writer = None
+    while time.perf_counter() < stop_at:
+        t0 = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(head + body[: len(body) // 2])
+            if trickle:
+                await writer.drain()
+                await asyncio.sleep(trickle)
+            writer.write(body[len(body) // 2:])
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length, close = 0, False
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+                elif name.lower() == "connection" and value.strip().lower() == "close":
+                    close = True
+            await reader.readexactly(length)
+        except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+            status, close = 0, True
+        out.append((trickle > 0, status, time.perf_counter() - t0))
+        if close and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+async def _load(port: int, body: bytes, args) -> list:
+    out = []
+    stop_at = time.perf_counter() + args.seconds
+    trickle = args.trickle_ms / 1000.0
+    await asyncio.gather(*(
+        _client(port, body, stop_at, trickle if i < args.slow else 0.0, out) for i in range(args.concurrency)
+    ))
+    return out
+
+def _summary(samples: list, seconds: float) -> dict:
+    fast = [(s, t) for slow, s, t in samples if not slow]
+    ok = np.array([t for s, t in fast if s == 200]) * 1e3
+    statuses = pd.Series([s for s, _ in fast]).value_counts().sort_index()
+    res = {"ok_rps": len(ok) / seconds, "status_counts": {str(k): int(v) for k, v in statuses.items()}}
+    if len(ok):
+        res.update({f"p{q}_ms": float(np.percentile(ok, q)) for q in (50, 95, 99)})
+    return res
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--slow", type=int, default=8)
+    ap.add_argument("--trickle-ms", type=float, default=200.0)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--workers", type=int, default=2)
+    args = ap.parse_args()
+
+    cfg = load_config(ROOT / "config/config.yaml")
+    features = json.loads((Path(cfg["paths"]["model_dir"]) / "features.json").read_text())
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    body = json.dumps({"data": df[features].iloc[0].to_dict()}).encode()
+
+    results = {"concurrency": args.concurrency, "slow_clients": args.slow, "workers": args.workers}
+    for kind in ("sync", "async"):
+        port = _free_port()
+        proc = _start(kind, port, args.workers)
+        try:
+            asyncio.run(_wait_ready(port, proc))
+            time.sleep(1.0)  # let every worker finish booting
+            results[kind] = _summary(asyncio.run(_load(port, body, args)), args.seconds)
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(timeout=30)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Throughput vs latency of /predict with and without micro-batching.
+
+Each client thread posts single-row payloads through its own Flask test client.
+
+Usage: python benchmarks/bench_batching.py [--levels 1 4 16 32] [--requests 20]
+"""
+import argparse, json, sys, tempfile, threading, time
+from pathlib import Path
+import numpy as np
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app import create_app
+from datascience.config_manager import load_config
+
+def _make_app(base_cfg: dict, tmpdir: Path, batching: dict):
+    cfg = {k: v for k, v in base_cfg.items() if not k.startswith("_")}
+    cfg["serving"] = {"batching": batching}
+    path = tmpdir / f"config_{int(batching['enabled'])}.yaml"
+    path.write_text(yaml.safe_dump(cfg))  # paths are already absolute
+    app = create_app(str(path))
+    app.testing = True
+    return app
+
+def _run_level(app, body: str, concurrency: int, per_client: int) -> dict:
+    lat = [[] for _ in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client(i):
+        c = app.test_client()
+        barrier.wait()
+        for _ in range(per_client):
+            t0 = time.perf_counter()
+            r = c.post("/predict", data=body, content_type="application/json")
+            lat[i].append(time.perf_counter() - t0)
+            assert r.status_code == 200, r.get_json()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    ms = np.concatenate([np.asarray(x) for x in lat]) * 1e3
+    return {
+        "concurrency": concurrency,
+        "requests": int(ms.size),
+        "throughput_rps": ms.size / wall,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=str(ROOT / "config/config.yaml"))
+    ap.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 32])
+    ap.add_argument("--requests", type=int, default=20, help="requests per client")
+    ap.add_argument("--max-batch-size", type=int, default=64)
+    ap.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = ap.parse_args()
+
+    base = load_config(args.config)
+    body = (ROOT / "single_payload.json").read_text()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for enabled in (False, True):
+            app = _make_app(base, Path(tmp), {
+                "enabled": enabled,
+                "max_batch_size": args.max_batch_size,
+                "max_wait_ms": args.max_wait_ms,
+            })
+            key = "batched" if enabled else "unbatched"
+            results[key] = [_run_level(app, body, c, args.requests) for c in args.levels]
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""sklearn RandomForestRegressor.predict vs the flattened FlatForest evaluator.
+
+Also times per-tree uncertainty (std + 5/95% quantiles): one stacked
+FlatForest pass against a Python loop over ``estimators_``.
+
+Usage: python benchmarks/bench_forest.py [--batches 1 10 100 1000] [--n 50]
+"""
+import argparse, json, sys, time, warnings
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from datascience.config_manager import load_config
+from datascience.flat_forest import FlatForest
+from datascience.serving.uncertainty import tree_spread
+
+def _p50_ms(fn, n: int) -> float:
+    fn()
+    ts = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        ts.append(time.perf_counter() - t0)
+    return float(np.median(ts) * 1e3)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=str(ROOT / "config/config.yaml"))
+    ap.add_argument("--batches", type=int, nargs="+", default=[1, 10, 100, 1000])
+    ap.add_argument("--n", type=int, default=50)
+    args = ap.parse_args()
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    cfg = load_config(args.config)
+    model_dir, proc = Path(cfg["paths"]["model_dir"]), Path(cfg["paths"]["data_processed_dir"])
+    model = joblib.load(model_dir / "model.joblib")
+    scaler = joblib.load(proc / "scaler.joblib") if (proc / "scaler.joblib").exists() else None
+    forest = FlatForest.load(model_dir / "forest.npz")
+
+    features = list(model.feature_names_in_)
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    raw = df[features].to_numpy(dtype=np.float64)
+
+    results = {"trees": forest.n_trees, "nodes": forest.n_nodes, "depth": forest.depth, "batches": []}
+    for b in args.batches:
+        X = raw[np.arange(b) % len(raw)]
+        Xs = scaler.transform(X) if scaler is not None else X
+        sk = _p50_ms(lambda: model.predict(Xs), args.n)
+        flat = _p50_ms(lambda: forest.predict(X), args.n)
+        spread = _p50_ms(lambda: tree_spread(forest.predict_trees(X), True, [0.05, 0.95]), args.n)
+        loop = _p50_ms(lambda: tree_spread(np.stack([t.predict(Xs) for t in model.estimators_], axis=1), True, [0.05, 0.95]), args.n)
+        results["batches"].append({
+            "rows": b,
+            "sklearn_p50_ms": sk,
+            "flat_p50_ms": flat,
+            "speedup": sk / flat,
+            "spread_p50_ms": spread,
+            "spread_loop_p50_ms": loop,
+            "max_abs_diff": float(np.abs(model.predict(Xs) - forest.predict(X)).max()),
+        })
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
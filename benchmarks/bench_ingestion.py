@@ -0,0 +1,65 @@
+"""Peak memory and time: untyped pd.read_csv vs chunked, schema-typed ingestion.
+
+Builds a synthetic export by repeating the red wine rows, then measures each
+mode in a fresh subprocess (peak RSS via getrusage).
+
+Usage: python benchmarks/bench_ingestion.py [--rows 2000000] [--chunk-rows 100000]
+"""
+import argparse, json, subprocess, sys, tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from datascience.config_manager import load_config
+
+_MODE = r"""
+import json, resource, sys, time
+import pandas as pd
+sys.path.insert(0, {root!r})
+from datascience.components.data_ingestion import DataIngestion
+from datascience.components.data_validation import DataValidation
+from datascience.config_manager import load_config, load_schema
+
+mode, raw, chunk_rows = {mode!r}, {raw!r}, {chunk_rows}
+cfg = load_config({config!r})
+schema = load_schema(cfg["paths"]["schema_file"])
+float32 = mode == "load_float32"
+cfg = {{**cfg, "paths": {{**cfg["paths"], "data_raw": raw}}, "ingestion": {{"chunk_rows": chunk_rows, "float32": float32}}}}
+t0 = time.perf_counter()
+if mode == "read_csv":
+    df = pd.read_csv(raw, sep=cfg["io"]["csv_sep"])
+    rows = len(df)
+elif mode == "scan":
+    rows = DataIngestion(cfg, schema).scan(DataValidation(schema, cfg))["rows"]
+else:
+    df = DataIngestion(cfg, schema).load(DataValidation(schema, cfg))
+    rows = len(df)
+print(json.dumps({{"rows": rows, "seconds": time.perf_counter() - t0,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=str(ROOT / "config/config.yaml"))
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--chunk-rows", type=int, default=100_000)
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    header, *lines = Path(cfg["paths"]["data_raw"]).read_text().splitlines(keepends=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / "export.csv"
+        with open(raw, "w") as fh:
+            fh.write(header)
+            for i in range(args.rows):
+                fh.write(lines[i % len(lines)])
+        results = {"rows": args.rows, "file_mb": raw.stat().st_size / 2**20}
+        for mode in ("read_csv", "scan", "load", "load_float32"):
+            code = _MODE.format(root=str(ROOT), mode=mode, raw=str(raw), chunk_rows=args.chunk_rows, config=args.config)
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+            results[mode] = json.loads(out.stdout)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""JSON records vs the columnar binary body on /predict (Flask test client, no network).
+
+For each batch size: request bytes, p50 latency, rows/s and MB/s of
+request body, plus the server-side decode alone (RequestDecoder vs
+ColumnarDecoder) and the client-side encode.
+
+Usage: python benchmarks/bench_payload.py [--rows 100 1000 10000] [--n 30]
+"""
+import argparse, json, sys, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app import create_app
+from datascience.config_manager import load_config
+from datascience.serving import columnar
+from datascience.serving.decoder import RequestDecoder
+
+def _p50_ms(fn, n: int) -> float:
+    fn()
+    ts = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        ts.append(time.perf_counter() - t0)
+    return float(np.median(ts) * 1e3)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=str(ROOT / "config/config.yaml"))
+    ap.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--n", type=int, default=30)
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    df = df.drop(columns=[cfg["features"]["target"]])
+    features = json.loads((Path(cfg["paths"]["model_dir"]) / "features.json").read_text())
+    client = create_app(args.config).test_client()
+    decoder = RequestDecoder(features)
+
+    results = []
+    for rows in args.rows:
+        batch = df.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+        records = {"data": batch.to_dict(orient="records")}
+        body = {"json": json.dumps(records).encode(),
+                "binary": columnar.encode({c: batch[c].to_numpy() for c in features})}
+        kinds = {"json": "application/json", "binary": columnar.CONTENT_TYPE}
+        entry = {"rows": rows}
+        for name, data in body.items():
+            post = lambda: client.post("/predict", data=data, content_type=kinds[name])
+            assert post().status_code == 200
+            ms = _p50_ms(post, args.n)
+            entry[name] = {"bytes": len(data), "p50_ms": round(ms, 3), "rows_per_s": round(rows / ms * 1e3),
+                           "mb_per_s": round(len(data) / ms / 1e3, 1)}
+        entry["json"]["encode_ms"] = round(_p50_ms(lambda: json.dumps(records).encode(), args.n), 3)
+        entry["binary"]["encode_ms"] = round(_p50_ms(lambda: columnar.encode({c: batch[c].to_numpy() for c in features}), args.n), 3)
+        entry["json"]["decode_ms"] = round(_p50_ms(lambda: decoder.decode(json.loads(body["json"])), args.n), 3)
+        entry["binary"]["decode_ms"] = round(_p50_ms(lambda: decoder.columnar.decode(body["binary"]), args.n), 3)
+        entry["speedup"] = round(entry["json"]["p50_ms"] / entry["binary"]["p50_ms"], 2)
+        results.append(entry)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
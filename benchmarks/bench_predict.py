@@ -0,0 +1,93 @@
+"""Micro-benchmark: legacy pandas /predict path vs decoder + fused inference pipeline.
+
+Usage: python benchmarks/bench_predict.py [--n 500] [--rows 1]
+"""
+import argparse, json, sys, time
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app import _load_artifacts
+from datascience.config_manager import load_config
+from datascience.serving.decoder import RequestDecoder
+
+def _legacy_frame(payload, features: list[str]) -> pd.DataFrame:
+    # The pandas framing /predict used before RequestDecoder: key checks, DataFrame, to_numeric
+    data = payload["data"]
+    rows = [data] if isinstance(data, dict) else data
+    missing = [f for f in features if f not in rows[0]]
+    extra = [k for k in rows[0] if k not in features]
+    if missing or extra:
+        raise ValueError(f"Missing keys: {missing}; unexpected keys: {extra}")
+    X = pd.DataFrame(rows, columns=features)
+    for c in features:
+        X[c] = pd.to_numeric(X[c], errors="raise")
+    return X
+
+def _timeit(fn, payload, n: int) -> np.ndarray:
+    fn(payload)  # warm-up
+    out = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn(payload)
+        out[i] = time.perf_counter() - t0
+    return out * 1e3
+
+def _summary(ms: np.ndarray) -> dict:
+    return {"p50_ms": float(np.percentile(ms, 50)), "p99_ms": float(np.percentile(ms, 99))}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=str(ROOT / "config/config.yaml"))
+    ap.add_argument("--n", type=int, default=500)
+    ap.add_argument("--rows", type=int, default=1)
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    features, pipeline = _load_artifacts(cfg)
+    # Legacy path: separate model + scaler artifacts stitched together per request
+    model = joblib.load(Path(cfg["paths"]["model_dir"]) / "model.joblib")
+    scaler_path = Path(cfg["paths"]["data_processed_dir"]) / "scaler.joblib"
+    scaler = joblib.load(scaler_path) if scaler_path.exists() else None
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    rows = df[features].head(args.rows).to_dict(orient="records")
+    payload = json.loads(json.dumps({"data": rows if args.rows > 1 else rows[0]}))
+
+    decoder = RequestDecoder(features)
+
+    def legacy_decode(p):
+        X = _legacy_frame(p, features)
+        if scaler is not None:
+            X = pd.DataFrame(scaler.transform(X), columns=X.columns, index=X.index)
+        return X
+
+    def legacy_full(p):
+        return np.ravel(model.predict(legacy_decode(p)))
+
+    def fast_decode(p):
+        return pipeline.transform(decoder.decode(p))
+
+    def fast_full(p):
+        return pipeline.predict(decoder.decode(p), copy=False)
+
+    assert np.allclose(legacy_full(payload), fast_full(payload))
+    results = {
+        "rows": args.rows,
+        "n": args.n,
+        "decode+scale": {
+            "legacy": _summary(_timeit(legacy_decode, payload, args.n)),
+            "fast": _summary(_timeit(fast_decode, payload, args.n)),
+        },
+        "end_to_end": {
+            "legacy": _summary(_timeit(legacy_full, payload, args.n)),
+            "fast": _summary(_timeit(fast_full, payload, args.n)),
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cold start of the Flask app: per-module import time and time to first prediction.
+
+Each run is a fresh interpreter under ``python -X importtime`` that imports
+``app``, calls ``create_app()`` and posts ``single_payload.json`` twice
+through the test client. Reported per run (median over ``--repeat``):
+process start -> import / create_app / first and second response, the
+heaviest modules by cumulative import time, and which heavy libraries
+ended up loaded.
+
+Usage: python benchmarks/bench_startup.py [--repeat 5] [--top 15] [--root .]
+"""
+import argparse, json, os, subprocess, sys, time
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("pandas", "sklearn", "scipy", "matplotlib", "mlflow", "pyarrow", "flask_cors")
+
+CHILD = """
+import json, sys, time
+t0 = time.time()
+from app import create_app
+t1 = time.time()
+client = create_app({config!r}).test_client()
+t2 = time.time()
+body = open("single_payload.json", "rb").read()
+assert client.post("/predict", data=body, content_type="application/json").status_code == 200
+t3 = time.time()
+client.post("/predict", data=body, content_type="application/json")
+t4 = time.time()
+print(json.dumps({{"t": [t0, t1, t2, t3, t4], "heavy": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+def parse_importtime(text: str) -> dict:
+    """``-X importtime`` stderr -> {module: (self_us, cumulative_us, depth)}."""
+    out = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        out[name.strip()] = (int(self_us), int(cum_us), depth)
+    return out
+
+def run_once(root: Path, config: str) -> dict:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(root / "src"), str(root), os.environ.get("PYTHONPATH", "")])}
+    code = CHILD.format(config=config, heavy=HEAVY)
+    start = time.time()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=root, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-4000:])
+    res = json.loads(proc.stdout.strip().splitlines()[-1])
+    t0, t1, t2, t3, t4 = res["t"]
+    return {
+        "interpreter_s": t0 - start, "import_app_s": t1 - t0, "create_app_s": t2 - t1,
+        "first_request_s": t3 - t2, "second_request_s": t4 - t3, "time_to_first_prediction_s": t3 - start,
+        "heavy_modules": res["heavy"], "imports": parse_importtime(proc.stderr),
+    }
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", default=str(ROOT), help="tree to measure (e.g. a git worktree of an older commit)")
+    ap.add_argument("--config", default="config/config.yaml")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    root = Path(args.root).resolve()
+    runs = [run_once(root, args.config) for _ in range(args.repeat)]
+    timings = {k: round(float(np.median([r[k] for r in runs])), 4) for k in runs[0] if k.endswith("_s")}
+    # Median cumulative import time per module; the top level is what `import app` pays for each
+    names = set.intersection(*(set(r["imports"]) for r in runs))
+    cumulative = {n: float(np.median([r["imports"][n][1] for r in runs])) / 1e6 for n in names}
+    top = sorted(cumulative, key=cumulative.get, reverse=True)[:args.top]
+    direct = sorted((n for n in names if runs[0]["imports"][n][2] == 1), key=cumulative.get, reverse=True)[:args.top]
+    print(json.dumps({
+        "root": str(root), "repeat": args.repeat, **timings, "heavy_modules": runs[0]["heavy_modules"],
+        "app_imports_s": {n: round(cumulative[n], 4) for n in direct},
+        "slowest_modules_s": {n: round(cumulative[n], 4) for n in top},
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
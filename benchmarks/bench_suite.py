@@ -0,0 +1,179 @@
+"""End-to-end benchmark suite: main.py stages and Flask /predict on synthetic wine data.
+
+Usage: python benchmarks/bench_suite.py [--scales 1 10 100] [--requests 200]
+           [--out benchmarks/results.json] [--baseline benchmarks/baseline.json]
+           [--tolerance 0.25] [--save-baseline] [--fail-on-regression]
+
+For each scale the red wine file is resampled to ``scale`` times its rows
+(feature jitter of 5% of each column's std, clipped to the observed range,
+seeded) into a scratch copy of config/ + params.yaml. ``main.py --force``
+then runs there in a child process, and so does a /predict client
+(``single_payload.json``, ``batch_payload.json``). Each child reports its
+peak RSS. Results are written as JSON and, when a baseline exists, every
+number is compared against it and regressions beyond ``--tolerance`` are listed.
+"""
+import argparse, json, os, platform, resource, runpy, shutil, subprocess, sys, tempfile, time
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Metrics where larger is better; everything else (seconds, ms, MB) should not grow
+_HIGHER_IS_BETTER = ("rps", "rows_per_s")
+
+def _peak_mb() -> float:
+    # ru_maxrss is KiB on Linux; children covers process pools (diagnostics, sweep)
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, kids) / 1024.0
+
+def synthesize(src: Path, dst: Path, scale: int, sep: str, target: str, seed: int = 0) -> int:
+    import pandas as pd
+    df = pd.read_csv(src, sep=sep)
+    rng = np.random.default_rng(seed)
+    out = df.iloc[rng.integers(0, len(df), len(df) * scale)].reset_index(drop=True)
+    feats = [c for c in df.columns if c != target]
+    noise = rng.normal(size=(len(out), len(feats))) * (0.05 * df[feats].std().to_numpy())
+    out[feats] = np.clip(out[feats].to_numpy() + noise, df[feats].min().to_numpy(), df[feats].max().to_numpy())
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    out.to_csv(dst, sep=sep, index=False)
+    return len(out)
+
+def _workdir(base: Path, scale: int) -> Path:
+    from datascience.config_manager import load_config
+    work = base / f"x{scale}"
+    shutil.copytree(ROOT / "config", work / "config", dirs_exist_ok=True)
+    shutil.copy(ROOT / "params.yaml", work / "params.yaml")
+    cfg = load_config(work / "config" / "config.yaml")
+    src = load_config(ROOT / "config" / "config.yaml")["paths"]["data_raw"]
+    sep = cfg.get("io", {}).get("csv_sep", ",")
+    rows = synthesize(Path(src), Path(cfg["paths"]["data_raw"]), scale, sep, cfg["features"]["target"])
+    (work / "rows").write_text(str(rows))
+    return work
+
+def _child(mode: str, work: Path, args) -> dict:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT), os.environ.get("PYTHONPATH", "")])}
+    cmd = [sys.executable, __file__, f"--{mode}-child", str(work), "--requests", str(args.requests)]
+    proc = subprocess.run(cmd, cwd=work, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} child failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-4000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def pipeline_child(work: Path) -> dict:
+    """Runs main.py --force in this process (cwd = work) and reports stage seconds and peak RSS."""
+    os.chdir(work)
+    sys.argv = ["main.py", "--force"]
+    t0 = time.perf_counter()
+    runpy.run_path(str(ROOT / "main.py"), run_name="__main__")
+    wall = time.perf_counter() - t0
+    from datascience.config_manager import load_config
+    from datascience.stage_cache import StageCache
+    stages = StageCache(load_config(work / "config" / "config.yaml")).state["stages"]
+    return {"wall_s": wall, "peak_rss_mb": _peak_mb(),
+            "stages": {name: {"seconds": rec["seconds"]} for name, rec in stages.items()}}
+
+def serve_child(work: Path, n: int) -> dict:
+    """Times Flask /predict through the test client (no network) for the repo's sample payloads."""
+    t0 = time.perf_counter()
+    from app import create_app
+    client = create_app(str(work / "config" / "config.yaml")).test_client()
+    startup = time.perf_counter() - t0
+    out = {"startup_s": startup}
+    for name in ("single_payload", "batch_payload"):
+        body = (ROOT / f"{name}.json").read_bytes()
+        rows = len(np.atleast_1d(json.loads(body)["data"]))
+        post = lambda: client.post("/predict", data=body, content_type="application/json")
+        assert post().status_code == 200  # warm-up
+        ms = np.empty(n)
+        t1 = time.perf_counter()
+        for i in range(n):
+            t = time.perf_counter()
+            post()
+            ms[i] = (time.perf_counter() - t) * 1e3
+        total = time.perf_counter() - t1
+        out[name] = {"rows": rows, "p50_ms": float(np.percentile(ms, 50)), "p99_ms": float(np.percentile(ms, 99)),
+                     "rps": n / total, "rows_per_s": n * rows / total}
+    out["peak_rss_mb"] = _peak_mb()
+    return out
+
+def _flatten(d: dict, prefix: str = "") -> dict:
+    flat = {}
+    for k, v in d.items():
+        key = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            flat.update(_flatten(v, key))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            flat[key] = float(v)
+    return flat
+
+def compare(results: dict, baseline: dict, tolerance: float) -> dict:
+    """Ratio (new / baseline) for every shared number; regressions are slower/bigger (or lower throughput)."""
+    new, old = _flatten(results["scales"]), _flatten(baseline["scales"])
+    ratios, regressions = {}, []
+    for key in sorted(new.keys() & old.keys()):
+        if key.endswith("rows") or old[key] <= 0:
+            continue
+        ratio = new[key] / old[key]
+        ratios[key] = round(ratio, 3)
+        worse = ratio < 1 / (1 + tolerance) if key.endswith(_HIGHER_IS_BETTER) else ratio > 1 + tolerance
+        if worse:
+            regressions.append(key)
+    return {"baseline_commit": baseline.get("env", {}).get("commit"), "tolerance": tolerance,
+            "ratios": ratios, "regressions": regressions}
+
+def _env() -> dict:
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return {"commit": commit or None, "python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--out", default=str(ROOT / "benchmarks" / "results.json"))
+    ap.add_argument("--baseline", default=str(ROOT / "benchmarks" / "baseline.json"))
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--workdir", help="keep scratch data here instead of a temp dir")
+    ap.add_argument("--pipeline-child", type=Path, help=argparse.SUPPRESS)
+    ap.add_argument("--serve-child", type=Path, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.pipeline_child:
+        res = pipeline_child(args.pipeline_child)
+        print(json.dumps(res))
+        return
+    if args.serve_child:
+        print(json.dumps(serve_child(args.serve_child, args.requests)))
+        return
+
+    base = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="wine-bench-"))
+    results = {"env": _env(), "requests": args.requests, "scales": {}}
+    try:
+        for scale in args.scales:
+            t0 = time.perf_counter()
+            work = _workdir(base, scale)
+            entry = {"rows": int((work / "rows").read_text()), "synthesize_s": time.perf_counter() - t0}
+            entry["pipeline"] = _child("pipeline", work, args)
+            entry["serving"] = _child("serve", work, args)
+            results["scales"][f"{scale}x"] = entry
+            print(f"[{scale}x] {entry['rows']} rows: pipeline {entry['pipeline']['wall_s']:.1f}s, "
+                  f"single p50 {entry['serving']['single_payload']['p50_ms']:.2f} ms", file=sys.stderr)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(base, ignore_errors=True)
+
+    baseline = Path(args.baseline)
+    if baseline.exists() and not args.save_baseline:
+        results["comparison"] = compare(results, json.loads(baseline.read_text()), args.tolerance)
+    Path(args.out).write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        baseline.write_text(json.dumps(results, indent=2))
+    print(json.dumps(results.get("comparison", {"saved": args.out}), indent=2))
+    if args.fail_on_regression and results.get("comparison", {}).get("regressions"):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
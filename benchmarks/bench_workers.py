@@ -0,0 +1,91 @@
+"""Startup time and per-worker memory of gunicorn with and without the shared-model profile.
+
+Launches real gunicorn masters (Linux, needs gunicorn installed) for:
+  - baseline: every worker imports the app and joblib.loads its own copy
+  - shared:   preload in the master + memory-mapped pipeline arrays
+
+Usage: python benchmarks/bench_workers.py [--workers 4] [--requests 200]
+"""
+import argparse, json, os, signal, socket, subprocess, sys, tempfile, time, urllib.request
+from pathlib import Path
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from datascience.config_manager import load_config
+from datascience.serving.memory import memory_usage
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _children(pid: int) -> list[int]:
+    try:
+        return [int(p) for p in Path(f"/proc/{pid}/task/{pid}/children").read_text().split()]
+    except OSError:
+        return []
+
+def _run(config_path: Path, workers: int, preload: bool, n_requests: int) -> dict:
+    port = _free_port()
+    env = {**os.environ, "GUNICORN_BIND": f"127.0.0.1:{port}", "GUNICORN_WORKERS": str(workers),
+           "GUNICORN_PRELOAD": "1" if preload else "0"}
+    cmd = [sys.executable, "-m", "gunicorn", "-c", str(ROOT / "gunicorn.conf.py"),
+           f"app:create_app('{config_path}')"]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            try:
+                urllib.request.urlopen(url + "/health", timeout=1).read()
+                break
+            except OSError:
+                time.sleep(0.02)
+        first_health = time.perf_counter() - t0
+        while len(_children(proc.pid)) < workers:
+            time.sleep(0.02)
+
+        body = (ROOT / "single_payload.json").read_bytes()
+        t1 = time.perf_counter()
+        for _ in range(n_requests):
+            req = urllib.request.Request(url + "/predict", data=body, headers={"Content-Type": "application/json"})
+            urllib.request.urlopen(req, timeout=10).read()
+        rps = n_requests / (time.perf_counter() - t1)
+
+        per_worker = [memory_usage(pid) for pid in _children(proc.pid)]
+        master = memory_usage(proc.pid)
+        total_pss = master["pss_mb"] + sum(m["pss_mb"] for m in per_worker)
+        return {
+            "workers": workers, "preload": preload,
+            "startup_to_first_health_s": first_health,
+            "sequential_rps": rps,
+            "master": master, "per_worker": per_worker,
+            "total_pss_mb": total_pss,
+        }
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=str(ROOT / "config/config.yaml"))
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--requests", type=int, default=200)
+    args = ap.parse_args()
+
+    base = {k: v for k, v in load_config(args.config).items() if not k.startswith("_")}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, mmap, preload in (("baseline", False, False), ("shared", True, True)):
+            cfg = {**base, "serving": {**(base.get("serving") or {}), "mmap": mmap}}
+            path = Path(tmp) / f"{name}.yaml"
+            path.write_text(yaml.safe_dump(cfg))
+            results[name] = _run(path, args.workers, preload, args.requests)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
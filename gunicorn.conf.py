@@ -0,0 +1,25 @@
+# Serving profile: load the pipeline once in the master, then fork workers that
+# share its pages (memory-mapped arrays when serving.mmap is on in config.yaml).
+import gc, os, time
+from datascience.serving.memory import memory_usage
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+_t0 = time.perf_counter()
+
+def when_ready(server):
+    m = memory_usage()
+    server.log.info("master ready in %.2fs (preload=%s) rss=%.1fMB",
+                    time.perf_counter() - _t0, preload_app, m["rss_mb"])
+
+def pre_fork(server, worker):
+    # Keep the GC from touching (and so copying) objects inherited from the master
+    gc.freeze()
+
+def post_worker_init(worker):
+    m = memory_usage()
+    worker.log.info("worker %s ready in %.2fs: rss=%.1fMB pss=%.1fMB uss=%.1fMB shared=%.1fMB",
+                    worker.pid, time.perf_counter() - _t0, m["rss_mb"], m["pss_mb"], m["uss_mb"], m["shared_mb"])
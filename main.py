@@ -1,25 +1,120 @@
+import argparse, json
+from pathlib import Path
 from datascience.config_manager import load_config, load_schema, make_dirs
 from datascience.params_loader import load_params
-from datascience.components.data_ingestion import DataIngestion
-from datascience.components.data_validation import DataValidation
-from datascience.components.data_transformation import DataTransformation
-from datascience.components.model_trainer import ModelTrainer
-from datascience.components.model_evaluation import ModelEvaluation
-from datascience.components.model_diagnostics import ModelDiagnostics
+from datascience.stage_cache import StageCache
 
+# Components are imported inside each stage so a fully cached run never loads sklearn/matplotlib.
+
+ap = argparse.ArgumentParser(description="Run the wine quality pipeline.")
+ap.add_argument("--force", action="store_true", help="ignore the stage cache and rerun every stage")
+ARGS = ap.parse_args()
 
 CFG = load_config("config/config.yaml")
-SCHEMA = load_schema(CFG["paths"].get("schema_file", "config/schema.yaml"))
+SCHEMA_FILE = CFG["paths"].get("schema_file", "config/schema.yaml")
+SCHEMA = load_schema(SCHEMA_FILE)
 PARAMS = load_params("params.yaml")
 make_dirs(CFG)
 
-df = DataIngestion(CFG).load()
-DataValidation(SCHEMA, CFG).check_required(df)
-DataTransformation(PARAMS, CFG).split_and_transform(df)
-ModelTrainer(PARAMS, CFG).train()
-metrics_path = ModelEvaluation(PARAMS, CFG).evaluate()
-diag_paths = ModelDiagnostics(PARAMS, CFG).run()
-print("Diagnostics:", [p.split("/")[-1] for p in diag_paths])
+PATHS = CFG["paths"]
+CACHE = StageCache(CFG, force=ARGS.force)
+
+def _files(key: str) -> list[Path]:
+    return sorted(p for p in Path(PATHS[key]).iterdir() if p.is_file())
+
+def _params(*keys):
+    return {k: PARAMS.get(k) for k in keys}
+
+def transform():
+    from datascience.components.data_ingestion import DataIngestion
+    from datascience.components.data_validation import DataValidation
+    from datascience.components.data_transformation import DataTransformation
+
+    validation = DataValidation(SCHEMA, CFG)
+    df = DataIngestion(CFG, SCHEMA).load(validation)  # typed, validated chunk by chunk
+    DataTransformation(PARAMS, CFG).split_and_transform(df)
+    summary = Path(PATHS["data_processed_dir"]) / "ingestion_summary.json"
+    summary.write_text(json.dumps(validation.summary(), indent=2))
+
+SWEEP = (PARAMS.get("sweep", {}) or {}).get("enabled", False)
+INCREMENTAL = (PARAMS.get("incremental", {}) or {}).get("enabled", False)
+
+def train():
+    if SWEEP:
+        from datascience.components.model_sweep import ModelSweep
+        return ModelSweep(PARAMS, CFG).run()
+    from datascience.components.model_trainer import ModelTrainer
+    return ModelTrainer(PARAMS, CFG).train()
+
+def update():
+    from datascience.components.incremental_trainer import IncrementalTrainer
+    return IncrementalTrainer(PARAMS, CFG, SCHEMA).run()
+
+def evaluate():
+    from datascience.components.model_evaluation import ModelEvaluation
+    return ModelEvaluation(PARAMS, CFG).evaluate()
+
+def diagnostics():
+    from datascience.components.model_diagnostics import ModelDiagnostics
+    return ModelDiagnostics(PARAMS, CFG).run()
+
+# Ingestion and validation write no artifacts, so they run as part of the transform stage.
+# Incremental mode replaces transform + train with one stage that only processes appended rows.
+UPDATE = [
+    ("update", update, lambda: dict(
+        files=[PATHS["data_raw"], SCHEMA_FILE],
+        data={"params": _params("seed", "split", "preprocessing", "model", "incremental"),
+              "io": CFG.get("io"), "features": CFG.get("features"), "ingestion": CFG.get("ingestion")},
+        code=["datascience.components.incremental_trainer", "datascience.components.data_ingestion",
+              "datascience.components.data_validation", "datascience.components.data_transformation",
+              "datascience.components.model_trainer", "datascience.inference", "datascience.flat_forest",
+              "datascience.split_store"],
+        outputs=lambda _: _files("data_processed_dir") + _files("model_dir"),
+    )),
+]
+UPSTREAM = ["update"] if INCREMENTAL else ["transform", "train"]
+
+def _upstream(*extra) -> list:
+    return [p for stage in (*UPSTREAM, *extra) for p in CACHE.outputs(stage)]
+
+STAGES = [
+    ("transform", transform, lambda: dict(
+        files=[PATHS["data_raw"], SCHEMA_FILE],
+        data={"params": _params("seed", "split", "preprocessing"), "io": CFG.get("io"), "features": CFG.get("features"),
+              "ingestion": CFG.get("ingestion")},
+        code=["datascience.components.data_ingestion", "datascience.components.data_validation",
+              "datascience.components.data_transformation", "datascience.split_store"],
+        outputs=lambda _: _files("data_processed_dir"),
+    )),
+    ("train", train, lambda: dict(
+        files=CACHE.outputs("transform"),
+        data={"params": _params("seed", "model", *(("sweep", "evaluation") if SWEEP else ()))},
+        code=["datascience.components.model_trainer", "datascience.inference", "datascience.flat_forest",
+              *(["datascience.components.model_sweep"] if SWEEP else [])],
+        outputs=lambda result: _files("model_dir") + ([result] if SWEEP else []),
+    )),
+    ("evaluate", evaluate, lambda: dict(
+        files=_upstream(),
+        data={"params": _params("seed", "evaluation"), "features": CFG.get("features")},
+        code=["datascience.components.model_evaluation"],
+        outputs=lambda path: [path],
+    )),
+    ("diagnostics", diagnostics, lambda: dict(
+        files=_upstream("evaluate"),
+        data={"params": _params("seed", "evaluation", "diagnostics")},
+        code=["datascience.components.model_diagnostics"],
+        outputs=lambda paths: paths,
+    )),
+]
+
+if INCREMENTAL:
+    STAGES = UPDATE + STAGES[2:]
+
+for name, fn, spec in STAGES:
+    result, ran = CACHE.run(name, fn, **spec())
+    print(f"[{name}] " + (f"done in {CACHE.state['stages'][name]['seconds']:.2f}s" if ran else "cached, skipped"))
+    if name == "diagnostics" and ran:
+        print("Diagnostics:", [Path(p).name for p in result])
 
 print("Data pipeline + training + evaluation complete.")
-print("Metrics at:", metrics_path)
+print("Metrics at:", Path(PATHS["reports_dir"]) / "metrics.json")
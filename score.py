@@ -0,0 +1,139 @@
+"""Stream-score a large CSV or JSONL file with the trained pipeline.
+
+Input is read in fixed-size chunks, scored across a process pool (each worker
+loads the artifacts once via app._load_artifacts) and written incrementally in
+input order, so memory stays bounded by chunk_size * in-flight chunks.
+
+CSV input is split on --sep (default: io.csv_sep from the config). CSV output
+is always comma-separated: a ``prediction`` column, preceded by the input
+columns with --with-input. JSONL output is one object per input row.
+
+Usage:
+    python score.py input.csv predictions.csv [--chunk-size 10000] [--workers -1] [--sep ,]
+    python score.py input.jsonl predictions.jsonl --with-input
+"""
+import argparse, itertools, json, os, sys, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from app import _load_artifacts
+from datascience.config_manager import load_config
+from datascience.serving.decoder import RequestDecoder
+
+_PIPELINE = None
+
+def _init_worker(config_path: str):
+    global _PIPELINE
+    _, _PIPELINE = _load_artifacts(load_config(config_path))
+
+def _score(X: np.ndarray) -> np.ndarray:
+    return _PIPELINE.predict(X, copy=False)
+
+def _fmt(path: str, override: str | None) -> str:
+    fmt = override or Path(path).suffix.lstrip(".").lower()
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Cannot infer format of {path!r}; pass --input-format/--output-format csv|jsonl")
+    return fmt
+
+def read_chunks(path: str, fmt: str, features: list[str], chunk_size: int, sep: str, keep_input: bool):
+    """Yields (X, rows) per chunk; rows is the input chunk when keep_input, else None."""
+    if fmt == "csv":
+        reader = pd.read_csv(path, sep=sep, chunksize=chunk_size, usecols=None if keep_input else features)
+        for chunk in reader:
+            missing = [f for f in features if f not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing columns: {missing}")
+            yield chunk[features].to_numpy(dtype=np.float64), (chunk if keep_input else None)
+        return
+    decoder = RequestDecoder(features, allow_extra=True)
+    with open(path) as fh:
+        lines = (line for line in fh if line.strip())
+        while True:
+            rows = [json.loads(line) for line in itertools.islice(lines, chunk_size)]
+            if not rows:
+                return
+            yield decoder.decode({"data": rows}), (rows if keep_input else None)
+
+class PredictionWriter:
+    def __init__(self, path: str, fmt: str):
+        self.fh = open(path, "w", newline="")
+        self.fmt = fmt
+        self.first = True
+
+    def write(self, preds: np.ndarray, rows):
+        if self.fmt == "csv":
+            if rows is None:
+                if self.first:
+                    self.fh.write("prediction\n")
+                self.fh.write("".join(f"{p!r}\n" for p in preds.tolist()))
+            else:
+                frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+                frame.assign(prediction=preds).to_csv(self.fh, header=self.first, index=False)
+        else:
+            if rows is None:
+                self.fh.write("".join(json.dumps({"prediction": p}) + "\n" for p in preds.tolist()))
+            else:
+                records = rows if isinstance(rows, list) else rows.to_dict(orient="records")
+                self.fh.write("".join(json.dumps({**r, "prediction": p}) + "\n" for r, p in zip(records, preds.tolist())))
+        self.first = False
+
+    def close(self):
+        self.fh.close()
+
+def score_file(input_path: str, output_path: str, config_path: str = "config/config.yaml",
+               chunk_size: int = 10_000, workers: int = -1, input_format: str | None = None,
+               output_format: str | None = None, with_input: bool = False, sep: str | None = None) -> dict:
+    cfg = load_config(config_path)
+    features, pipeline = _load_artifacts(cfg)
+    sep = sep or cfg.get("io", {}).get("csv_sep", ",")
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    chunks = read_chunks(input_path, _fmt(input_path, input_format), features, chunk_size, sep, with_input)
+    writer = PredictionWriter(output_path, _fmt(output_path, output_format))
+
+    t0, n = time.perf_counter(), 0
+    try:
+        if workers == 1:
+            for X, rows in chunks:
+                writer.write(pipeline.predict(X, copy=False), rows)
+                n += len(X)
+        else:
+            # Bounded in-flight window keeps memory constant and output in input order
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(cfg["_config_path"],)) as pool:
+                pending = deque()
+                for X, rows in chunks:
+                    pending.append((pool.submit(_score, X), rows, len(X)))
+                    if len(pending) >= 2 * workers:
+                        fut, rows_done, k = pending.popleft()
+                        writer.write(fut.result(), rows_done)
+                        n += k
+                while pending:
+                    fut, rows_done, k = pending.popleft()
+                    writer.write(fut.result(), rows_done)
+                    n += k
+    finally:
+        writer.close()
+    secs = time.perf_counter() - t0
+    return {"rows": n, "seconds": secs, "rows_per_sec": n / secs if secs else float("inf"), "workers": workers}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stream-score a CSV/JSONL file with the trained pipeline.")
+    ap.add_argument("input")
+    ap.add_argument("output")
+    ap.add_argument("--config", default="config/config.yaml")
+    ap.add_argument("--chunk-size", type=int, default=10_000)
+    ap.add_argument("--workers", type=int, default=-1, help="scoring processes (-1 = all cores)")
+    ap.add_argument("--input-format", choices=["csv", "jsonl"])
+    ap.add_argument("--output-format", choices=["csv", "jsonl"])
+    ap.add_argument("--with-input", action="store_true", help="copy input columns next to each prediction")
+    ap.add_argument("--sep", help="CSV input separator (default: io.csv_sep); CSV output is always comma-separated")
+    args = ap.parse_args(argv)
+
+    stats = score_file(args.input, args.output, args.config, args.chunk_size, args.workers,
+                       args.input_format, args.output_format, args.with_input, args.sep)
+    print(f"scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:.0f} rows/s, {stats['workers']} workers)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import numpy as np
+from datascience import shm
+
+def _scores(metric: str, y: np.ndarray, P: np.ndarray) -> np.ndarray:
+    # One score per row of P (each row is a full prediction vector), vectorized over rows
+    err = P - y
+    if metric == "mae":
+        return np.abs(err).mean(axis=1)
+    if metric == "r2":
+        return 1.0 - (err ** 2).sum(axis=1) / ((y - y.mean()) ** 2).sum()
+    return np.sqrt((err ** 2).mean(axis=1))
+
+def _permuted_scores(repeats: list[int], seed: int, metric: str, batch_rows: int) -> np.ndarray:
+    """(len(repeats), n_features) scores; permuted copies are stacked into predict calls of ~batch_rows rows."""
+    X, y, pipeline = shm.X, shm.y, shm.extra
+    n, k = X.shape
+    perms = {r: np.argsort(np.random.default_rng([seed, r]).random((k, n)), axis=1) for r in repeats}
+    blocks = [(r, j) for r in repeats for j in range(k)]  # X with column j shuffled by repeat r's permutation
+    per_call = max(1, batch_rows // n)
+    out = np.empty(len(blocks))
+    for start in range(0, len(blocks), per_call):
+        chunk = blocks[start:start + per_call]
+        B = np.tile(X, (len(chunk), 1)).reshape(len(chunk), n, k)
+        for b, (r, j) in enumerate(chunk):
+            B[b, :, j] = X[perms[r][j], j]
+        flat = B.reshape(-1, k)
+        # Large test sets: row slices keep the forest's (rows, trees) work arrays bounded
+        preds = np.concatenate([pipeline.predict(flat[i:i + batch_rows], copy=False) for i in range(0, len(flat), batch_rows)])
+        out[start:start + len(chunk)] = _scores(metric, y, preds.reshape(len(chunk), n))
+    return out.reshape(len(repeats), k)
+
+def permutation_importance(pipeline, X, y, metric: str = "rmse", n_repeats: int = 5, seed: int = 42,
+                           n_workers: int = 1, batch_rows: int = 20_000) -> dict:
+    """Score loss when each feature column is shuffled, per feature: {"mean", "std"} plus the base score.
+
+    Positive means the model relies on the feature (rmse/mae rise, r2 drops).
+    Repeats are split across a process pool that maps one shared copy of
+    ``[X | y]``; within a worker the permuted copies are stacked into
+    ``pipeline.predict`` calls of about ``batch_rows`` rows, which bounds memory.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    workers = n_workers if n_workers > 0 else (os.cpu_count() or 1)
+    workers = max(1, min(workers, n_repeats))
+    parts = [list(range(n_repeats))[w::workers] for w in range(workers)]
+    with shm.shared_xy(X, y, workers, pipeline) as pool:
+        if pool is not None:
+            futures = [pool.submit(_permuted_scores, part, seed, metric, batch_rows) for part in parts]
+            scores = np.vstack([f.result() for f in futures])
+        else:
+            scores = _permuted_scores(parts[0], seed, metric, batch_rows)
+
+    base = float(_scores(metric, y, pipeline.predict(X)[None])[0])
+    drop = (base - scores) if metric == "r2" else (scores - base)
+    return {"metric": metric, "base": base, "n_repeats": n_repeats,
+            "mean": drop.mean(axis=0), "std": drop.std(axis=0)}
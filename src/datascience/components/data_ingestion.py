@@ -1,11 +1,90 @@
 from pathlib import Path
+import numpy as np
 import pandas as pd
+from datascience.components.data_validation import INT_KINDS
+
+FLOAT_KINDS = {"float": "float64", "float32": "float32", "float64": "float64"}
+
+def _max_rows(path: Path) -> int:
+    # Upper bound on data rows (line breaks, \n or bare \r, plus an unterminated last line) without parsing
+    nl = cr = 0
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            nl += block.count(b"\n")
+            cr += block.count(b"\r")
+    return max(nl, cr) + 1
+
+def _empty(dtype, n: int):
+    if isinstance(dtype, np.dtype):
+        return np.empty(n, dtype=dtype)
+    return dtype.construct_array_type()._empty((n,), dtype)  # e.g. nullable Int64
 
 class DataIngestion:
-    def __init__(self, cfg: dict):
+    """Streams ``data_raw`` in ``ingestion.chunk_rows`` chunks typed by the schema.
+
+    Schema ``float`` columns are read as float32 when ``ingestion.float32`` is
+    set; int columns are read as float and cast after validation, so a stray
+    null or fraction is reported with its row instead of a parser error.
+    """
+
+    def __init__(self, cfg: dict, schema: dict | None = None):
         self.raw = Path(cfg["paths"]["data_raw"])
         self.sep = cfg.get("io", {}).get("csv_sep", ",")
+        opts = cfg.get("ingestion", {}) or {}
+        self.chunk_rows = int(opts.get("chunk_rows", 100_000))
+        self.float32 = bool(opts.get("float32", False))
+        self.schema = schema or {}
 
-    def load(self) -> pd.DataFrame:
+    def dtypes(self) -> dict:
+        out = {}
+        for col, kind in (self.schema.get("columns", {}) or {}).items():
+            kind = str(kind).lower()
+            if kind in FLOAT_KINDS:
+                out[col] = "float32" if self.float32 and kind == "float" else FLOAT_KINDS[kind]
+            elif kind in INT_KINDS:
+                out[col] = "float64"
+        return out
+
+    def chunks(self, validation=None):
+        """Yields typed chunks; with a DataValidation each one is checked before it is yielded."""
         assert self.raw.exists(), f"Missing file: {self.raw}"
-        return pd.read_csv(self.raw, sep=self.sep)
+        start = 0
+        with pd.read_csv(self.raw, sep=self.sep, dtype=self.dtypes(), chunksize=self.chunk_rows) as reader:
+            while True:
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    return
+                except ValueError as e:
+                    raise ValueError(f"{self.raw.name}: chunk starting at data row {start}: {e}") from e
+                if validation is not None:
+                    chunk = validation.check_chunk(chunk, start)
+                start += len(chunk)
+                yield chunk
+
+    def load(self, validation=None) -> pd.DataFrame:
+        """The whole file as one frame, filled chunk by chunk into preallocated columns.
+
+        Peak memory is the frame plus one chunk: no list of chunks and no concat copy.
+        """
+        n, cols, filled = _max_rows(self.raw), None, 0
+        for chunk in self.chunks(validation):
+            if cols is None:
+                cols = {c: _empty(chunk[c].dtype, n) for c in chunk.columns}
+            for c, col in cols.items():
+                part = chunk[c]
+                if isinstance(col, np.ndarray) and not isinstance(part.dtype, np.dtype):
+                    # Nullable int column whose earlier chunks had no nulls
+                    cols[c] = _empty(part.dtype, n)
+                    cols[c][:filled] = col[:filled]
+                cols[c][filled:filled + len(chunk)] = part.array
+            filled += len(chunk)
+        if cols is None:
+            return pd.read_csv(self.raw, sep=self.sep, dtype=self.dtypes())
+        return pd.DataFrame({c: col[:filled] for c, col in cols.items()}, copy=False)
+
+    def scan(self, validation) -> dict:
+        """Validates the whole file and returns its summary without holding more than one chunk."""
+        for _ in self.chunks(validation):
+            pass
+        return validation.summary()
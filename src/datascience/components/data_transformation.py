@@ -2,6 +2,7 @@ from pathlib import Path
 import pandas as pd, joblib
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from datascience.split_store import SplitStore
 
 class DataTransformation:
     def __init__(self, params: dict, cfg: dict):
@@ -26,14 +27,21 @@ class DataTransformation:
             random_state=self.params["seed"],
         )
 
+        # Unscaled features feed the fused inference pipeline at evaluation time
+        # and let incremental runs rescale history after a scaler partial_fit
+        Xtr_raw, Xte_raw = Xtr, Xte
+
         scaler = self._scaler()
+        scaler_path = self.outdir / "scaler.joblib"
         if scaler is not None:
             Xtr = pd.DataFrame(scaler.fit_transform(Xtr), columns=X.columns, index=Xtr.index)
             Xte = pd.DataFrame(scaler.transform(Xte), columns=X.columns, index=Xte.index)
-            joblib.dump(scaler, self.outdir / "scaler.joblib")
+            joblib.dump(scaler, scaler_path)
+        elif scaler_path.exists():
+            scaler_path.unlink()  # stale scaler from a previous run must not be fused
 
-        Xtr.to_csv(self.outdir / "X_train.csv", index=False)
-        Xte.to_csv(self.outdir / "X_test.csv", index=False)
-        ytr.to_csv(self.outdir / "y_train.csv", index=False)
-        yte.to_csv(self.outdir / "y_test.csv", index=False)
+        SplitStore(self.cfg).save({
+            "X_train": Xtr, "X_test": Xte, "X_train_raw": Xtr_raw, "X_test_raw": Xte_raw,
+            "y_train": ytr, "y_test": yte,
+        })
         return Xtr, Xte, ytr, yte
@@ -1,10 +1,88 @@
+import numpy as np
+import pandas as pd
+
+INT_KINDS = {"int", "int32", "int64"}
+
 class DataValidation:
+    """Schema checks for the raw data: required columns, and per chunk the
+    declared types, nulls (only columns listed under ``nullable``) and
+    ``ranges``. Column statistics accumulate over the chunks seen."""
+
     def __init__(self, schema: dict, cfg: dict):
         self.target = schema.get("target", cfg["features"]["target"])
         self.required = set(schema.get("required", [])) | {self.target}
+        self.columns = schema.get("columns", {}) or {}
+        self.ranges = schema.get("ranges", {}) or {}
+        self.nullable = set(schema.get("nullable", []) or [])
+        self.rows = 0
+        self._stats = {}
 
     def check_required(self, df):
         missing = self.required - set(df.columns)
         if missing:
             raise ValueError(f"Missing required columns: {sorted(missing)}")
         return True
+
+    def check_chunk(self, chunk: pd.DataFrame, start: int = 0) -> pd.DataFrame:
+        """Validates one chunk (``start`` = its first data row), casts int columns and updates the stats."""
+        self.check_required(chunk)
+        for col, kind in self.columns.items():
+            if col not in chunk:
+                continue
+            s = chunk[col]
+            if not pd.api.types.is_numeric_dtype(s):
+                raise ValueError(f"Column {col!r}: expected {kind}, got {s.dtype} (rows {start}-{start + len(s) - 1})")
+            nulls = s.isna().to_numpy()
+            if nulls.any() and col not in self.nullable:
+                raise ValueError(f"Column {col!r}: {int(nulls.sum())} nulls, first at data row {start + int(nulls.argmax())}")
+            if str(kind).lower() in INT_KINDS and s.dtype.kind == "f":
+                frac = (s.to_numpy() % 1 != 0) & ~nulls
+                if frac.any():
+                    i = int(frac.argmax())
+                    raise ValueError(f"Column {col!r}: non-integer {s.iloc[i]} at data row {start + i}")
+                chunk[col] = s.astype("Int64" if nulls.any() else "int64")
+            if col in self.ranges:
+                lo, hi = self.ranges[col]
+                v = s.to_numpy(dtype=np.float64)
+                bad = (v < lo) | (v > hi)
+                if bad.any():
+                    i = int(bad.argmax())
+                    raise ValueError(f"Column {col!r}: {v[i]} at data row {start + i} outside [{lo}, {hi}]")
+        self._update_stats(chunk)
+        self.rows += len(chunk)
+        return chunk
+
+    def _update_stats(self, chunk: pd.DataFrame):
+        # Chan et al. pairwise merge of count/mean/M2 so one pass over the chunks suffices
+        for col in chunk.columns:
+            if not pd.api.types.is_numeric_dtype(chunk[col]):
+                continue
+            v = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            ok = v[~np.isnan(v)]
+            n_b = len(ok)
+            st = self._stats.setdefault(col, {"count": 0, "nulls": 0, "mean": 0.0, "m2": 0.0, "min": np.inf, "max": -np.inf})
+            st["nulls"] += len(v) - n_b
+            if n_b == 0:
+                continue
+            mean_b = float(ok.mean())
+            m2_b = float(((ok - mean_b) ** 2).sum())
+            n_a, n = st["count"], st["count"] + n_b
+            delta = mean_b - st["mean"]
+            st["mean"] += delta * n_b / n
+            st["m2"] += m2_b + delta * delta * n_a * n_b / n
+            st["count"] = n
+            st["min"] = min(st["min"], float(ok.min()))
+            st["max"] = max(st["max"], float(ok.max()))
+
+    def summary(self) -> dict:
+        cols = {}
+        for col, st in self._stats.items():
+            n = st["count"]
+            cols[col] = {
+                "count": n, "nulls": st["nulls"],
+                "mean": st["mean"] if n else None,
+                "std": float(np.sqrt(st["m2"] / (n - 1))) if n > 1 else None,
+                "min": st["min"] if n else None,
+                "max": st["max"] if n else None,
+            }
+        return {"rows": self.rows, "columns": cols}
@@ -0,0 +1,195 @@
+from pathlib import Path
+from copy import deepcopy
+from datetime import datetime, timezone
+import hashlib, io, json, time
+import joblib, pandas as pd
+from sklearn.model_selection import train_test_split
+from datascience.components.data_ingestion import DataIngestion
+from datascience.components.data_transformation import DataTransformation
+from datascience.components.data_validation import DataValidation
+from datascience.components.model_trainer import ModelTrainer, _replace
+from datascience.flat_forest import FlatForest
+from datascience.inference import InferencePipeline
+from datascience.split_store import SplitStore
+
+_EDGE = 1 << 16
+
+def _complete_size(path: Path) -> int:
+    # Bytes up to the last newline: a row still being appended waits for the next run
+    size = path.stat().st_size
+    with open(path, "rb") as fh:
+        fh.seek(max(0, size - _EDGE))
+        tail = fh.read()
+    cut = tail.rfind(b"\n")
+    return size if cut < 0 else size - len(tail) + cut + 1
+
+def _edges(path: Path, size: int) -> str:
+    # Head + tail of the consumed prefix: cheap check that history was only appended to
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        h.update(fh.read(min(size, _EDGE)))
+        fh.seek(max(0, size - _EDGE))
+        h.update(fh.read(min(size, _EDGE)))
+    return h.hexdigest()
+
+class IncrementalTrainer:
+    """Grows the model with the rows appended to ``data_raw`` since the last run.
+
+    ``model_dir/incremental.json`` records how many bytes of the CSV the
+    splits already hold and which rows each block of trees was grown on.
+    Once at least ``min_rows`` new complete rows exist, they are split like
+    the originals, folded into the scaler with ``partial_fit`` and fit by
+    warm-start trees: as many per row as the full run grew (so a small
+    delta cannot outvote the history), at least one and at most
+    ``trees_per_update``. When that would take the forest past ``max_growth``
+    times its full-run size, a full retrain consolidates it instead.
+    Every tree keeps the scaler snapshot it was grown under
+    (``scalers.joblib``), so the fused pipeline stays exact in raw units.
+    Edited history, changed params or a model without warm start fall back
+    to a full DataTransformation + ModelTrainer run.
+    """
+
+    def __init__(self, params: dict, cfg: dict, schema: dict | None = None):
+        self.params = params
+        self.cfg = cfg
+        self.schema = schema or {"target": cfg["features"]["target"], "required": []}
+        self.opts = params.get("incremental", {}) or {}
+        self.raw = Path(cfg["paths"]["data_raw"])
+        self.sep = cfg.get("io", {}).get("csv_sep", ",")
+        self.proc = Path(cfg["paths"]["data_processed_dir"])
+        self.out = Path(cfg["paths"]["model_dir"])
+        self.state_path = self.out / "incremental.json"
+        self.scalers_path = self.out / "scalers.joblib"
+        self.target = cfg["features"]["target"]
+
+    def _settings(self) -> str:
+        model = {k: v for k, v in (self.params.get("model", {}) or {}).items() if k not in ("n_estimators", "n_jobs")}
+        keys = {k: self.params.get(k) for k in ("seed", "split", "preprocessing")}
+        return hashlib.sha256(json.dumps({**keys, "model": model}, sort_keys=True).encode()).hexdigest()
+
+    def _state(self) -> dict | None:
+        if not (self.state_path.exists() and self.scalers_path.exists() and (self.out / "model.joblib").exists()):
+            return None
+        return json.loads(self.state_path.read_text())
+
+    def _read(self, start: int, stop: int) -> pd.DataFrame:
+        with open(self.raw, "rb") as fh:
+            header = fh.readline()
+            start = max(start, len(header))
+            fh.seek(start)
+            body = fh.read(stop - start)
+        dtypes = DataIngestion(self.cfg, self.schema).dtypes()
+        df = pd.read_csv(io.BytesIO(header + body), sep=self.sep, dtype=dtypes)
+        return DataValidation(self.schema, self.cfg).check_chunk(df, start=0)
+
+    def _save_state(self, state: dict, scalers: list):
+        _replace(self.scalers_path, lambda p: joblib.dump(scalers, p))
+        _replace(self.state_path, lambda p: p.write_text(json.dumps(state, indent=2)))
+
+    def run(self) -> str:
+        assert self.raw.exists(), f"Missing file: {self.raw}"
+        t0 = time.perf_counter()
+        size = _complete_size(self.raw)
+        state = self._state()
+        mtype = ((self.params.get("model", {}) or {}).get("type") or "random_forest").lower()
+        if mtype != "random_forest":
+            reason = f"model type {mtype!r} has no warm start"
+        elif state is None:
+            reason = "no previous run"
+        elif state["settings"] != self._settings():
+            reason = "params changed"
+        elif size < state["bytes"] or _edges(self.raw, state["bytes"]) != state["edges"]:
+            reason = "data_raw history changed"
+        else:
+            reason = None
+        mode, delta = "noop", None
+        if reason is None and size > state["bytes"]:
+            delta = self._read(state["bytes"], size)
+            first = state["slices"][0]
+            n_full = first["trees"][1] - first["trees"][0]
+            # Trees per row of the full run, so a slice weighs in by its share of the data
+            n_new = min(int(self.opts.get("trees_per_update", 20)), max(1, round(n_full * len(delta) / (first["rows"][1] - first["rows"][0]))))
+            if len(delta) < int(self.opts.get("min_rows", 50)):
+                delta = None  # too few rows to grow trees on: they wait for the next run
+            elif state["slices"][-1]["trees"][1] + n_new > n_full * float(self.opts.get("max_growth", 1.5)):
+                reason = f"forest would exceed max_growth {float(self.opts.get('max_growth', 1.5)):g}x"
+        if reason is not None:
+            mode = "full"
+            self._full(size, reason)
+        elif delta is not None:
+            mode = "update"
+            self._update(state, delta, size, n_new)
+        state = json.loads(self.state_path.read_text())
+        state["last_run"] = {"mode": mode, "reason": reason, "seconds": time.perf_counter() - t0}
+        self.state_path.write_text(json.dumps(state, indent=2))
+        return str(self.state_path)
+
+    def _full(self, size: int, reason: str):
+        df = self._read(0, size)
+        _, _, ytr, _ = DataTransformation(self.params, self.cfg).split_and_transform(df)
+        trainer = ModelTrainer(self.params, self.cfg)
+        trainer.train()
+        model = joblib.load(self.out / "model.joblib")
+        scaler_path = self.proc / "scaler.joblib"
+        scalers = [joblib.load(scaler_path) if scaler_path.exists() else None]
+        n_trees = len(getattr(model, "estimators_", []))
+        state = {
+            "settings": self._settings(),
+            "bytes": size,
+            "edges": _edges(self.raw, size),
+            "rows": len(df),
+            "slices": [self._slice(0, n_trees, 0, len(df), 0, size, 0, len(ytr), reason)],
+        }
+        self._save_state(state, scalers)
+
+    @staticmethod
+    def _slice(tree0, tree1, row0, row1, byte0, byte1, scaler, train_rows, note=None) -> dict:
+        return {
+            "trees": [tree0, tree1], "rows": [row0, row1], "bytes": [byte0, byte1],
+            "scaler": scaler, "train_rows": train_rows, "note": note,
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+    def _update(self, state: dict, delta: pd.DataFrame, size: int, n_new: int):
+        features = json.loads((self.out / "features.json").read_text())
+        X, y = delta[features], delta[self.target]
+        test_size = float(self.params["split"]["test_size"])
+        if len(delta) * test_size >= 1 and len(delta) >= 2:
+            Xtr, Xte, ytr, yte = train_test_split(
+                X, y, test_size=test_size, shuffle=self.params["split"]["shuffle"],
+                random_state=self.params["seed"] + len(state["slices"]),
+            )
+        else:
+            Xtr, Xte, ytr, yte = X, X.iloc[:0], y, y.iloc[:0]
+
+        scalers = joblib.load(self.scalers_path)
+        scaler = deepcopy(scalers[-1])
+        if scaler is not None:
+            scaler.partial_fit(Xtr)
+            joblib.dump(scaler, self.proc / "scaler.joblib")
+        scalers.append(scaler)
+        scale = (lambda F: pd.DataFrame(scaler.transform(F), columns=F.columns, index=F.index)) if scaler is not None else (lambda F: F)
+
+        # Splits hold all history; their scaled copies follow the updated scaler
+        store = SplitStore(self.cfg)
+        Xtr_raw = pd.concat([store.load("X_train_raw"), Xtr], ignore_index=True)
+        Xte_raw = pd.concat([store.load("X_test_raw"), Xte], ignore_index=True)
+        store.save({
+            "X_train": scale(Xtr_raw), "X_test": scale(Xte_raw), "X_train_raw": Xtr_raw, "X_test_raw": Xte_raw,
+            "y_train": pd.concat([store.load("y_train"), ytr], ignore_index=True),
+            "y_test": pd.concat([store.load("y_test"), yte], ignore_index=True),
+        })
+
+        model = joblib.load(self.out / "model.joblib")
+        n0 = len(model.estimators_)
+        model.set_params(warm_start=True, n_estimators=n0 + n_new, n_jobs=(self.params.get("model", {}) or {}).get("n_jobs", -1))
+        model.fit(scale(Xtr), ytr)
+        model.set_params(warm_start=False)
+
+        state["slices"].append(self._slice(n0, n0 + n_new, state["rows"], state["rows"] + len(delta),
+                                           state["bytes"], size, len(scalers) - 1, len(ytr)))
+        tree_scalers = [scalers[s["scaler"]] for s in state["slices"] for _ in range(*s["trees"])]
+        pipeline = InferencePipeline(features, FlatForest.from_model(model, tree_scalers))
+        ModelTrainer(self.params, self.cfg).save(model, pipeline)
+        state.update({"bytes": size, "edges": _edges(self.raw, size), "rows": state["rows"] + len(delta)})
+        self._save_state(state, scalers)
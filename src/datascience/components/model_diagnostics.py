@@ -1,109 +1,236 @@
 from pathlib import Path
-import json, math
+from concurrent.futures import ProcessPoolExecutor
+import json, os, time
 import joblib
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from datascience.attribution import permutation_importance
+from datascience.flat_forest import FlatForest
+from datascience.split_store import SplitStore
+
+# Plots are built on the object-oriented Figure API with an Agg canvas: no pyplot
+# global state, so each one can render in its own process and never needs a display.
+
+def _residuals_hist(d: dict):
+    counts, edges = np.histogram(d["residuals"], bins=30)
+    fig = Figure(figsize=(5, 3))
+    ax = fig.add_subplot()
+    ax.stairs(counts, edges, fill=True)
+    ax.set_title("Residuals (y_true - y_pred)")
+    ax.set_xlabel("residual"); ax.set_ylabel("count")
+    return fig, {"counts": counts.tolist(), "edges": edges.tolist()}
+
+def _pred_vs_true(d: dict):
+    y_true, y_pred = d["y_true"], d["y_pred"]
+    lo = float(min(y_true.min(), y_pred.min()))
+    hi = float(max(y_true.max(), y_pred.max()))
+    idx = np.arange(len(y_true))
+    cap = int(d.get("max_points") or 0)
+    if 0 < cap < len(idx):
+        # Large test sets: a fixed-seed sample keeps the picture and drops the render cost
+        idx = np.sort(np.random.default_rng(d.get("seed", 42)).choice(idx, cap, replace=False))
+    fig = Figure(figsize=(5, 5))
+    ax = fig.add_subplot()
+    ax.scatter(y_true[idx], y_pred[idx], s=8, alpha=0.6)
+    ax.plot([lo, hi], [lo, hi])  # y=x
+    ax.set_xlabel("y_true"); ax.set_ylabel("y_pred")
+    ax.set_title("Predicted vs True" + (f" ({len(idx)} of {len(y_true)} rows)" if len(idx) < len(y_true) else ""))
+    return fig, {"y_true": y_true[idx].tolist(), "y_pred": y_pred[idx].tolist(), "rows": len(y_true)}
+
+def _error_by_target(d: dict):
+    df = pd.DataFrame({"y": d["y_true"], "pred": d["y_pred"]})
+    # bin by target; 6 equal-width bins by range
+    bins = np.linspace(df["y"].min(), df["y"].max(), 7)
+    df["bin"] = pd.cut(df["y"], bins, include_lowest=True)
+    err = (
+        df.assign(abs_err=lambda x: (x["y"] - x["pred"]).abs())
+        .groupby("bin", observed=True)["abs_err"]
+        .mean()
+    )
+    labels = [str(b) for b in err.index]
+    fig = Figure(figsize=(6, 3))
+    ax = fig.add_subplot()
+    ax.bar(range(len(err)), err.to_numpy())
+    ax.set_xticks(range(len(err)), labels, rotation=90)
+    ax.set_ylabel("mean |error|"); ax.set_title("Error by target bin")
+    return fig, {"bins": labels, "mean_abs_error": err.tolist()}
+
+def _feature_importance(d: dict):
+    series = pd.Series(d["values"])[::-1]  # small to large for nicer labels
+    err = pd.Series(d["std"])[series.index].to_numpy() if "std" in d else None
+    fig = Figure(figsize=(6, 3))
+    ax = fig.add_subplot()
+    ax.barh(series.index, series.to_numpy(), xerr=err)
+    ax.set_title(d["title"])
+    return fig, {k: d[k] for k in ("values", "std") if k in d}
+
+PLOTS = {
+    "residuals_hist": _residuals_hist,
+    "pred_vs_true": _pred_vs_true,
+    "error_by_target": _error_by_target,
+    "feature_importance": _feature_importance,
+    "permutation_importance": _feature_importance,
+}
+
+def _render(name: str, data: dict, out: str, formats: list[str], dpi: int, export: bool) -> tuple[list[str], float]:
+    t0 = time.perf_counter()
+    fig, exported = PLOTS[name](data)
+    FigureCanvasAgg(fig)
+    fig.tight_layout()
+    paths = []
+    for fmt in formats:
+        path = Path(out) / f"{name}.{fmt}"
+        fig.savefig(path, format=fmt, dpi=dpi, bbox_inches="tight")
+        paths.append(str(path))
+    if export:
+        path = Path(out) / f"{name}.data.json"
+        path.write_text(json.dumps(exported, indent=2))
+        paths.append(str(path))
+    return paths, time.perf_counter() - t0
 
 class ModelDiagnostics:
     def __init__(self, params: dict, cfg: dict):
         self.params = params
         self.cfg = cfg
+        self.opts = params.get("diagnostics", {}) or {}
         self.proc = Path(cfg["paths"]["data_processed_dir"])
         self.model_dir = Path(cfg["paths"]["model_dir"])
         self.reports = Path(cfg["paths"]["reports_dir"])
         self.reports.mkdir(parents=True, exist_ok=True)
 
-    def _save_residuals_hist(self, residuals: np.ndarray, path: Path):
-        plt.figure(figsize=(5,3))
-        plt.hist(residuals, bins=30)
-        plt.title("Residuals (y_true - y_pred)")
-        plt.xlabel("residual"); plt.ylabel("count")
-        plt.tight_layout(); plt.savefig(path, dpi=150, bbox_inches="tight"); plt.close()
-
-    def _save_pred_vs_true(self, y_true: np.ndarray, y_pred: np.ndarray, path: Path):
-        lo = float(min(y_true.min(), y_pred.min()))
-        hi = float(max(y_true.max(), y_pred.max()))
-        plt.figure(figsize=(5,5))
-        plt.scatter(y_true, y_pred, s=8, alpha=0.6)
-        plt.plot([lo, hi], [lo, hi])  # y=x
-        plt.xlabel("y_true"); plt.ylabel("y_pred")
-        plt.title("Predicted vs True")
-        plt.tight_layout(); plt.savefig(path, dpi=150, bbox_inches="tight"); plt.close()
-
-    def _save_error_by_target(self, y_true: np.ndarray, y_pred: np.ndarray, path: Path):
-        df = pd.DataFrame({"y": y_true, "pred": y_pred})
-        # bin by target; 6 equal-width bins by range
-        bins = np.linspace(df["y"].min(), df["y"].max(), 7)
-        df["bin"] = pd.cut(df["y"], bins, include_lowest=True)
-        err = (
-                        df.assign(abs_err=lambda x: (x["y"] - x["pred"]).abs())
-                        .groupby("bin", observed=True)["abs_err"]   # was: .groupby("bin")["abs_err"]
-                        .mean()
-                    )
-
-       
-        plt.figure(figsize=(6,3))
-        err.plot(kind="bar")
-        plt.ylabel("mean |error|"); plt.title("Error by target bin")
-        plt.tight_layout(); plt.savefig(path, dpi=150, bbox_inches="tight"); plt.close()
-
-    def _save_feature_importance(self, model, feature_names: list[str]) -> tuple[str, str] | tuple[None, None]:
-        imp_json = self.reports / "feature_importance.json"
-        imp_png  = self.reports / "feature_importance.png"
-
+    def _save_feature_importance(self, model, feature_names: list[str]) -> dict | None:
         if hasattr(model, "feature_importances_"):
-            vals = model.feature_importances_
-            series = pd.Series(vals, index=feature_names).sort_values(ascending=False).head(10)
-            imp_json.write_text(json.dumps(series.to_dict(), indent=2))
-            plt.figure(figsize=(6,3))
-            series[::-1].plot(kind="barh")  # small to large for nicer labels
-            plt.title("Top feature importance")
-            plt.tight_layout(); plt.savefig(imp_png, dpi=150, bbox_inches="tight"); plt.close()
-            return str(imp_json), str(imp_png)
-
-        if hasattr(model, "coef_"):
+            series = pd.Series(model.feature_importances_, index=feature_names).sort_values(ascending=False).head(10)
+            title = "Top feature importance"
+        elif hasattr(model, "coef_"):
             vals = np.ravel(model.coef_)
             series = pd.Series(vals, index=feature_names).sort_values(key=lambda s: s.abs(), ascending=False).head(10)
-            imp_json.write_text(json.dumps(series.to_dict(), indent=2))
-            plt.figure(figsize=(6,3))
-            series[::-1].plot(kind="barh")
-            plt.title("Top coefficients (abs)")
-            plt.tight_layout(); plt.savefig(imp_png, dpi=150, bbox_inches="tight"); plt.close()
-            return str(imp_json), str(imp_png)
+            title = "Top coefficients (abs)"
+        else:
+            return None
+        values = {k: float(v) for k, v in series.items()}
+        (self.reports / "feature_importance.json").write_text(json.dumps(values, indent=2))
+        return {"values": values, "title": title}
 
-        return None, None
+    def _permutation_importance(self, pipeline, X: np.ndarray, y: np.ndarray) -> dict | None:
+        repeats = int(self.opts.get("permutation_repeats", 5))
+        if repeats <= 0:
+            return None
+        metric = (self.params.get("evaluation", {}) or {}).get("primary_metric", "rmse")
+        res = permutation_importance(pipeline, X, y, metric=metric, n_repeats=repeats,
+                                     seed=int(self.params.get("seed", 42)), n_workers=int(self.opts.get("n_workers", -1)))
+        order = np.argsort(-res["mean"])
+        out = {
+            "metric": metric, "base": res["base"], "n_repeats": repeats,
+            "mean": {pipeline.features[i]: float(res["mean"][i]) for i in order},
+            "std": {pipeline.features[i]: float(res["std"][i]) for i in order},
+        }
+        (self.reports / "permutation_importance.json").write_text(json.dumps(out, indent=2))
+        return out
 
-    def run(self) -> list[str]:
-        Xte = pd.read_csv(self.proc / "X_test.csv")
-        yte = pd.read_csv(self.proc / "y_test.csv").squeeze("columns")
-        model = joblib.load(self.model_dir / "model.joblib")
+    def _attributions(self, pipeline, X: np.ndarray, yhat: np.ndarray) -> pd.Series | None:
+        if not (self.opts.get("attributions", True) and isinstance(pipeline.model, FlatForest)):
+            return None
+        bias, contrib = pipeline.model.contributions(X)
+        df = pd.DataFrame(contrib, columns=pipeline.features)
+        df.insert(0, "bias", bias)
+        df["prediction"] = yhat
+        df.to_csv(self.reports / "attributions.csv", index=False)
+        return df[pipeline.features].abs().mean().sort_values(ascending=False)
+
+    def _render_all(self, jobs: dict) -> tuple[dict, dict]:
+        formats = list(self.opts.get("formats", ["png"]))
+        args = (str(self.reports), formats, int(self.opts.get("dpi", 150)), bool(self.opts.get("export_data", False)))
+        workers = int(self.opts.get("n_workers", -1))
+        workers = min(workers if workers > 0 else (os.cpu_count() or 1), len(jobs))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {name: pool.submit(_render, name, data, *args) for name, data in jobs.items()}
+                results = {name: f.result() for name, f in futures.items()}
+        else:
+            results = {name: _render(name, data, *args) for name, data in jobs.items()}
+        return {n: r[0] for n, r in results.items()}, {n: round(r[1], 4) for n, r in results.items()}
 
-        yhat = model.predict(Xte)
-        residuals = yte.values - yhat
+    def run(self) -> list[str]:
+        t0 = time.perf_counter()
+        store = SplitStore(self.cfg)
+        Xte = store.load("X_test_raw")
+        yte = store.load("y_test")
+        pipeline = joblib.load(self.model_dir / "pipeline.joblib")
+        model = joblib.load(self.model_dir / "model.joblib")  # unfused, for importances
 
-        # plots
-        paths = []
-        p1 = self.reports / "residuals_hist.png"; self._save_residuals_hist(residuals, p1); paths.append(str(p1))
-        p2 = self.reports / "pred_vs_true.png";   self._save_pred_vs_true(yte.values, yhat, p2); paths.append(str(p2))
-        p3 = self.reports / "error_by_target.png"; self._save_error_by_target(yte.values, yhat, p3); paths.append(str(p3))
+        X = Xte[pipeline.features].to_numpy(dtype=np.float64)
+        yhat = pipeline.predict(X)
+        y = yte.to_numpy(dtype=np.float64)
+        jobs = {
+            "residuals_hist": {"residuals": y - yhat},
+            "pred_vs_true": {"y_true": y, "y_pred": yhat, "max_points": self.opts.get("max_scatter_points", 5000),
+                             "seed": self.params.get("seed", 42)},
+            "error_by_target": {"y_true": y, "y_pred": yhat},
+        }
 
         # feature importance / coefficients
         feats_path = self.model_dir / "features.json"
         feat_names = json.loads(feats_path.read_text()) if feats_path.exists() else list(Xte.columns)
-        imp_json, imp_png = self._save_feature_importance(model, feat_names)
-        if imp_json: paths.extend([imp_json, imp_png])
+        importance = self._save_feature_importance(model, feat_names)
+        if importance:
+            jobs["feature_importance"] = importance
+
+        # model-agnostic importance on X_test, and per-row tree-path attributions
+        analysis = {}
+        t1 = time.perf_counter()
+        perm = self._permutation_importance(pipeline, X, y)
+        analysis["permutation_importance"] = round(time.perf_counter() - t1, 4)
+        if perm:
+            jobs["permutation_importance"] = {"values": perm["mean"], "std": perm["std"],
+                                              "title": f"Permutation importance ({perm['metric']} loss)"}
+        t1 = time.perf_counter()
+        attributions = self._attributions(pipeline, X, yhat)
+        analysis["attributions"] = round(time.perf_counter() - t1, 4)
+
+        rendered, seconds = self._render_all(jobs)
+        paths = [p for name in jobs for p in rendered[name]]
+        for name in ("feature_importance", "permutation_importance"):
+            if name in rendered:
+                paths.insert(paths.index(rendered[name][0]), str(self.reports / f"{name}.json"))
+        if attributions is not None:
+            paths.append(str(self.reports / "attributions.csv"))
+
+        timings = self.reports / "diagnostics_timings.json"
+        timings.write_text(json.dumps({"plots": seconds, "analysis": analysis,
+                                       "total": round(time.perf_counter() - t0, 4)}, indent=2))
+        paths.append(str(timings))
+
+        lines = []
+        if perm:
+            lines.append(f"\n## Permutation importance ({perm['metric']} loss over {perm['n_repeats']} shuffles, "
+                         f"base {perm['base']:.4f})\n")
+            lines += [f"- {f}: {m:.4f} ± {perm['std'][f]:.4f}" for f, m in perm["mean"].items()]
+        if attributions is not None:
+            lines.append("\n## Tree-path attributions (mean |contribution| per row, `attributions.csv`)\n")
+            lines += [f"- {f}: {v:.4f}" for f, v in attributions.items()]
 
         # summary report
         metrics_path = Path(self.cfg["paths"]["reports_dir"]) / "metrics.json"
         metrics = json.loads(metrics_path.read_text()) if metrics_path.exists() else {}
+        boot = metrics.get("bootstrap")
+        intervals = [
+            f"- model {m} {boot['confidence']:.0%} CI: [{ci['low']:.4f}, {ci['high']:.4f}], "
+            f"beats baseline in {boot['model_vs_baseline'][m]['p_better']:.1%} of resamples\n"
+            for m, ci in boot["model"].items()
+        ] if boot else []
         report = self.reports / "report.md"
         report.write_text(
             f"# Evaluation Report\n"
             f"- rows test: {len(yte)}\n"
             f"- baseline: {metrics.get('baseline', {})}\n"
             f"- model: {metrics.get('model', {})}\n"
+            + "".join(intervals) +
             f"- artifacts: {[Path(p).name for p in paths]}\n"
+            f"- render seconds: {seconds}\n"
+            + "\n".join(lines) + ("\n" if lines else "")
         )
         paths.append(str(report))
         return paths
@@ -1,6 +1,54 @@
 from pathlib import Path
-import json, math, joblib, pandas as pd
+import json, math, joblib, numpy as np
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from datascience.split_store import SplitStore
+
+LOWER_IS_BETTER = {"rmse": True, "mae": True, "r2": False}
+
+def _resampled(y: np.ndarray, pred: np.ndarray, idx: np.ndarray) -> dict:
+    # rmse/mae/r2 for every row of the (resamples, n) index matrix at once
+    yt = y[idx]
+    err = pred[idx] - yt
+    sse = (err ** 2).sum(axis=1)
+    return {
+        "rmse": np.sqrt(sse / idx.shape[1]),
+        "mae": np.abs(err).mean(axis=1),
+        "r2": 1.0 - sse / ((yt - yt.mean(axis=1, keepdims=True)) ** 2).sum(axis=1),
+    }
+
+def bootstrap_metrics(y, preds: dict, n_resamples: int = 2000, confidence: float = 0.95, seed: int = 42,
+                      max_cells: int = 10_000_000) -> dict:
+    """Percentile bootstrap CIs for each named prediction vector, plus paired differences vs the first.
+
+    Every prediction is scored on the same resampled rows, so the
+    differences are paired. Resamples are (resamples, n) index matrices,
+    drawn in blocks of at most ``max_cells`` entries to bound memory.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    preds = {k: np.broadcast_to(np.asarray(v, dtype=np.float64), y.shape) for k, v in preds.items()}
+    n = len(y)
+    rng = np.random.default_rng(seed)
+    block = max(1, max_cells // max(n, 1))
+    parts = {k: [] for k in preds}
+    for start in range(0, n_resamples, block):
+        idx = rng.integers(0, n, size=(min(block, n_resamples - start), n))
+        for k, p in preds.items():
+            parts[k].append(_resampled(y, p, idx))
+    scores = {k: {m: np.concatenate([b[m] for b in blocks]) for m in LOWER_IS_BETTER} for k, blocks in parts.items()}
+
+    q = [(1 - confidence) / 2 * 100, (1 + confidence) / 2 * 100]
+    interval = lambda s: dict(zip(("low", "high"), map(float, np.percentile(s, q))), std=float(s.std()))
+    out = {"n_resamples": n_resamples, "confidence": confidence}
+    out.update({k: {m: interval(s) for m, s in v.items()} for k, v in scores.items()})
+    ref, *others = preds
+    for k in others:
+        diffs = {}
+        for m, lower in LOWER_IS_BETTER.items():
+            d = scores[ref][m] - scores[k][m]
+            better = d < 0 if lower else d > 0
+            diffs[m] = {"mean": float(d.mean()), **interval(d), "p_better": float(better.mean())}
+        out[f"{ref}_vs_{k}"] = diffs
+    return out
 
 class ModelEvaluation:
     def __init__(self, params: dict, cfg: dict):
@@ -19,18 +67,26 @@ class ModelEvaluation:
         }
 
     def evaluate(self) -> str:
-        Xte = pd.read_csv(self.proc / "X_test.csv")
-        yte = pd.read_csv(self.proc / "y_test.csv").squeeze("columns")
-        ytr = pd.read_csv(self.proc / "y_train.csv").squeeze("columns")
+        store = SplitStore(self.cfg)
+        Xte = store.load("X_test_raw")
+        yte = store.load("y_test")
+        ytr = store.load("y_train")
 
         baseline_pred = [float(ytr.mean())] * len(yte)
         baseline = self._metrics(yte, baseline_pred)
 
-        model = joblib.load(self.model_dir / "model.joblib")
-        yhat = model.predict(Xte)
+        pipeline = joblib.load(self.model_dir / "pipeline.joblib")
+        yhat = pipeline.predict(Xte[pipeline.features].to_numpy())
         model_m = self._metrics(yte, yhat)
 
         out = {"target": self.cfg["features"]["target"], "baseline": baseline, "model": model_m}
+        boot = (self.params.get("evaluation", {}) or {}).get("bootstrap", {}) or {}
+        if int(boot.get("n_resamples", 0)) > 0:
+            out["bootstrap"] = bootstrap_metrics(
+                yte.to_numpy(), {"model": yhat, "baseline": baseline_pred},
+                n_resamples=int(boot["n_resamples"]), confidence=float(boot.get("confidence", 0.95)),
+                seed=int(self.params.get("seed", 42)),
+            )
         path = self.reports / "metrics.json"
         path.write_text(json.dumps(out, indent=2))
         return str(path)
@@ -0,0 +1,128 @@
+from pathlib import Path
+import copy, itertools, json, math, os, time
+import numpy as np
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from sklearn.model_selection import KFold
+from datascience import shm
+from datascience.components.model_evaluation import LOWER_IS_BETTER
+from datascience.components.model_trainer import ModelTrainer, build_model
+from datascience.split_store import SplitStore
+
+_TREE_KEYS = ("n_estimators", "max_depth")
+
+def _score(metric: str, y_true, y_pred) -> float:
+    if metric == "mae":
+        return float(mean_absolute_error(y_true, y_pred))
+    if metric == "r2":
+        return float(r2_score(y_true, y_pred))
+    return math.sqrt(mean_squared_error(y_true, y_pred))
+
+def _fit_fold(params: dict, model_cfg: dict, fold: int, metric: str) -> tuple[float, float]:
+    t0 = time.perf_counter()
+    X, y, folds = shm.X, shm.y, shm.extra  # the shared training matrix and its CV folds
+    tr, va = folds[fold]
+    model = build_model({**params, "model": {**model_cfg, "n_jobs": 1}})
+    model.fit(X[tr], y[tr])
+    return _score(metric, y[va], model.predict(X[va])), time.perf_counter() - t0
+
+def _values(spec) -> list:
+    # [a, b, c] | {start, stop, step} (stop inclusive) | scalar
+    if isinstance(spec, list):
+        return spec
+    if isinstance(spec, dict):
+        start, stop, step = spec["start"], spec["stop"], spec.get("step", 1)
+        if all(isinstance(v, int) for v in (start, stop, step)):
+            return list(range(start, stop + 1, step))
+        return [float(v) for v in np.arange(start, stop + step / 2, step)]
+    return [spec]
+
+class ModelSweep:
+    """Successive-halving grid search over params.yaml ``model`` settings.
+
+    Candidates are scored with K-fold CV on X_train; each rung evaluates more
+    folds and keeps the best ``1/halving_factor``. Fold fits run in a process
+    pool that reads the training matrix from shared memory. The winning
+    ``model`` section is retrained on the full split by ModelTrainer.
+    """
+
+    def __init__(self, params: dict, cfg: dict):
+        self.params = params
+        self.cfg = cfg
+        self.sweep = params.get("sweep", {}) or {}
+        self.reports = Path(cfg["paths"]["reports_dir"])
+        self.reports.mkdir(parents=True, exist_ok=True)
+        self.metric = (params.get("evaluation", {}) or {}).get("primary_metric", "rmse")
+        self.eta = max(2, int(self.sweep.get("halving_factor", 3)))
+
+    def candidates(self) -> list[dict]:
+        base = self.params.get("model", {}) or {}
+        grid = self.sweep.get("grid", {}) or {}
+        keys = list(grid)
+        seen, out = set(), []
+        for combo in itertools.product(*(_values(grid[k]) for k in keys)):
+            cand = {**base, **dict(zip(keys, combo))}
+            if (cand.get("type") or "random_forest").lower() == "linear":
+                cand = {k: v for k, v in cand.items() if k not in _TREE_KEYS}
+            key = json.dumps(cand, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                out.append(cand)
+        return out
+
+    def _rungs(self, n_candidates: int, n_splits: int) -> list[int]:
+        # Folds evaluated per rung: min_folds, min_folds*eta, ... capped at cv_folds
+        folds, budgets = int(self.sweep.get("min_folds", 1)), []
+        while folds < n_splits and n_candidates > 1:
+            budgets.append(folds)
+            folds *= self.eta
+            n_candidates = math.ceil(n_candidates / self.eta)
+        return budgets + [n_splits]
+
+    def run(self) -> str:
+        store = SplitStore(self.cfg)
+        X = np.asarray(store.load("X_train"), dtype=np.float64)
+        y = np.asarray(store.load("y_train"), dtype=np.float64)
+        n_splits = int(self.sweep.get("cv_folds", 5))
+        workers = int(self.sweep.get("n_workers", -1))
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        lower = LOWER_IS_BETTER.get(self.metric, True)
+        cands = self.candidates()
+        rungs = self._rungs(len(cands), n_splits)
+
+        # One shared [X | y] block; workers map it instead of receiving a pickled copy
+        seed = int(self.params.get("seed", 42))
+        folds = list(KFold(n_splits=n_splits, shuffle=True, random_state=seed).split(np.arange(len(X))))
+        with shm.shared_xy(X, y, workers, folds) as pool:
+            scores = {i: {} for i in range(len(cands))}
+            ids, trials, latest = list(scores), [], {}
+            for rung, budget in enumerate(rungs):
+                jobs = [(i, f) for i in ids for f in range(budget) if f not in scores[i]]
+                args = [(self.params, cands[i], f, self.metric) for i, f in jobs]
+                results = pool.map(_fit_fold, *zip(*args)) if pool and args else map(lambda a: _fit_fold(*a), args)
+                for (i, f), res in zip(jobs, results):
+                    scores[i][f] = res
+                mean = {}
+                for i in ids:
+                    fold_scores = [scores[i][f][0] for f in range(budget)]
+                    mean[i] = float(np.mean(fold_scores))
+                    latest[i] = {
+                        "rung": rung, "folds": budget, "model": cands[i],
+                        self.metric: mean[i], "std": float(np.std(fold_scores)),
+                        "fold_scores": fold_scores,
+                        "wall_time_s": float(sum(scores[i][f][1] for f in range(budget))),
+                    }
+                    trials.append(latest[i])
+                ids = sorted(ids, key=mean.get, reverse=not lower)
+                if rung < len(rungs) - 1:
+                    ids = ids[:max(1, math.ceil(len(ids) / self.eta))]
+
+        best = cands[ids[0]]
+        out = {"metric": self.metric, "cv_folds": n_splits, "rungs": rungs, "best": latest[ids[0]], "trials": trials}
+        path = self.reports / "sweep_trials.json"
+        path.write_text(json.dumps(out, indent=2))
+
+        # The winner becomes the regular training artifact consumed by ModelEvaluation
+        winner = copy.deepcopy(self.params)
+        winner["model"] = {**best, "n_jobs": (self.params.get("model", {}) or {}).get("n_jobs", -1)}
+        ModelTrainer(winner, self.cfg).train()
+        return str(path)
@@ -1,7 +1,28 @@
 from pathlib import Path
-import json, joblib, pandas as pd
+import json, joblib, os, pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
+from datascience.flat_forest import FlatForest
+from datascience.inference import InferencePipeline
+from datascience.split_store import SplitStore
+
+def build_model(params: dict):
+    m = params.get("model", {}) or {}
+    mtype = (m.get("type") or "random_forest").lower()
+    if mtype == "linear":
+        return LinearRegression()
+    return RandomForestRegressor(
+        n_estimators=m.get("n_estimators", 200),
+        max_depth=m.get("max_depth", None),
+        random_state=params.get("seed", 42),
+        n_jobs=m.get("n_jobs", -1),
+    )
+
+def _replace(path: Path, write):
+    # Write-then-rename: a server hot-reloading (or memory-mapping) the old file never sees a partial one
+    tmp = path.with_name(path.name + ".tmp")
+    write(tmp)
+    os.replace(tmp, path)
 
 class ModelTrainer:
     def __init__(self, params: dict, cfg: dict):
@@ -12,26 +33,30 @@ class ModelTrainer:
         self.out.mkdir(parents=True, exist_ok=True)
 
     def _build_model(self):
-        m = self.params.get("model", {})
-        mtype = (m.get("type") or "random_forest").lower()
-        if mtype == "linear":
-            return LinearRegression()
-        return RandomForestRegressor(
-            n_estimators=m.get("n_estimators", 200),
-            max_depth=m.get("max_depth", None),
-            random_state=self.params.get("seed", 42),
-            n_jobs=m.get("n_jobs", -1),
-        )
+        return build_model(self.params)
 
     def train(self) -> str:
-        Xtr = pd.read_csv(self.proc / "X_train.csv")
-        ytr = pd.read_csv(self.proc / "y_train.csv").squeeze("columns")
+        store = SplitStore(self.cfg)
+        Xtr = store.load("X_train")
+        ytr = store.load("y_train")
         if isinstance(ytr, pd.DataFrame):
              ytr = ytr.iloc[:, 0]
         ytr = pd.to_numeric(ytr, errors="coerce")
         model = self._build_model()
         model.fit(Xtr, ytr)
-        (self.out / "features.json").write_text(json.dumps(list(Xtr.columns)))
+        features = list(Xtr.columns)
+        scaler_path = self.proc / "scaler.joblib"
+        scaler = joblib.load(scaler_path) if scaler_path.exists() else None
+        return self.save(model, InferencePipeline.fuse(features, model, scaler))
+
+    def save(self, model, pipeline: InferencePipeline) -> str:
+        _replace(self.out / "features.json", lambda p: p.write_text(json.dumps(pipeline.features)))
         path = self.out / "model.joblib"
-        joblib.dump(model, path)
+        _replace(path, lambda p: joblib.dump(model, p))
+        _replace(self.out / "pipeline.joblib", lambda p: joblib.dump(pipeline, p))
+        forest_path = self.out / "forest.npz"
+        if isinstance(pipeline.model, FlatForest):
+            pipeline.model.save(forest_path)
+        elif forest_path.exists():
+            forest_path.unlink()
         return str(path)
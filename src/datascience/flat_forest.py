@@ -0,0 +1,247 @@
+from pathlib import Path
+import numpy as np
+
+_MASK = np.int64(0x7FFFFFFFFFFFFFFF)
+_SIGN = np.int64(-0x8000000000000000)
+
+def _key(x: np.ndarray) -> np.ndarray:
+    # float64 -> int64 with the same ordering, so bisection can step ulp by ulp
+    b = x.view(np.int64)
+    return np.where(b >= 0, b, -(b & _MASK))
+
+def _unkey(k: np.ndarray) -> np.ndarray:
+    return np.where(k >= 0, k, (-k) | _SIGN).view(np.float64)
+
+def scaler_kind(scaler) -> str | None:
+    # Exact sklearn scaler type, matched by name so serving never imports sklearn for it
+    t = type(scaler)
+    if t.__module__.startswith("sklearn.preprocessing") and t.__name__ in ("StandardScaler", "MinMaxScaler"):
+        return t.__name__
+    return None
+
+def _scaled(scaler, feature: np.ndarray, x: np.ndarray) -> np.ndarray:
+    # Same elementwise arithmetic as scaler.transform, per node feature.
+    if scaler is None:
+        return x
+    if scaler_kind(scaler) == "StandardScaler":
+        if scaler.with_mean:
+            x = x - scaler.mean_[feature]
+        if scaler.with_std:
+            x = x / scaler.scale_[feature]
+        return x
+    return x * scaler.scale_[feature] + scaler.min_[feature]
+
+def _approx_raw(scaler, feature: np.ndarray, t: np.ndarray) -> np.ndarray:
+    if scaler is None:
+        return t.copy()
+    if scaler_kind(scaler) == "StandardScaler":
+        s = scaler.scale_[feature] if scaler.with_std else 1.0
+        m = scaler.mean_[feature] if scaler.with_mean else 0.0
+        return t * s + m
+    return (t - scaler.min_[feature]) / scaler.scale_[feature]
+
+def raw_thresholds(scaler, feature: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """Largest raw float64 x per split with float32(scale(x)) <= threshold.
+
+    sklearn trees cast (scaled) inputs to float32 before comparing, which is a
+    monotone map of the raw value, so ``x <= T`` reproduces every split exactly.
+    """
+    goes_left = lambda x: _scaled(scaler, feature, x).astype(np.float32) <= threshold
+    t0 = _approx_raw(scaler, feature, threshold)
+    delta = 1e-6 * (np.abs(t0) + 1.0)
+    lo, hi = t0 - delta, t0 + delta
+    for _ in range(32):
+        bad_lo, bad_hi = ~goes_left(lo), goes_left(hi)
+        if not (bad_lo.any() or bad_hi.any()):
+            break
+        delta = delta * 16
+        lo = np.where(bad_lo, t0 - delta, lo)
+        hi = np.where(bad_hi, t0 + delta, hi)
+    else:
+        raise ValueError("Could not bracket split thresholds in raw feature space.")
+
+    klo, khi = _key(lo), _key(hi)
+    while (khi - klo > 1).any():
+        mid = klo + (khi - klo) // 2
+        left = goes_left(_unkey(mid))
+        klo = np.where(left, mid, klo)
+        khi = np.where(left, khi, mid)
+    return _unkey(klo)
+
+def tree_estimators(model) -> list:
+    if hasattr(model, "tree_"):
+        trees = [model]
+    else:
+        trees = getattr(model, "estimators_", None)
+        if not isinstance(trees, list) or not trees:
+            return []
+    if all(hasattr(t, "tree_") and t.tree_.n_outputs == 1 for t in trees):
+        return trees
+    return []
+
+class FlatForest:
+    """All trees of a regression forest as contiguous node arrays.
+
+    Leaves point to themselves with an infinite threshold, so a batch walks
+    every tree in lock-step for ``depth`` vectorized steps.
+    """
+
+    _arrays = ("feature", "threshold", "left", "right", "value", "missing_left", "roots")
+
+    def __init__(self, feature, threshold, left, right, value, missing_left, roots, depth: int):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.intp)
+        self.right = np.ascontiguousarray(right, dtype=np.intp)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.missing_left = np.ascontiguousarray(missing_left, dtype=bool)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.depth = int(depth)
+        # children[2 * node + went_left] -> next node; one gather per step
+        self._children = np.empty(2 * len(self.left), dtype=np.intp)
+        self._children[0::2] = self.right
+        self._children[1::2] = self.left
+        self._leaf = self.left == np.arange(len(self.left))
+
+    def __setstate__(self, state):
+        # joblib.load(mmap_mode=...) hands back np.memmap; plain views avoid the
+        # subclass overhead on every gather while still sharing the mapped pages.
+        self.__dict__.update({k: np.asarray(v) if isinstance(v, np.ndarray) else v for k, v in state.items()})
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_model(cls, model, scaler=None) -> "FlatForest":
+        """Flattens a fitted tree/forest regressor, folding an affine scaler into the thresholds.
+
+        ``scaler`` may also be a list with one scaler per tree, for forests whose
+        trees were grown under different scaler statistics (incremental training).
+        """
+        trees = tree_estimators(model)
+        if not trees:
+            raise ValueError(f"{type(model).__name__} is not a single-output tree ensemble.")
+        scalers = list(scaler) if isinstance(scaler, (list, tuple)) else [scaler] * len(trees)
+        if len(scalers) != len(trees):
+            raise ValueError(f"Got {len(scalers)} scalers for {len(trees)} trees.")
+        parts, roots, offset, depth = [], [], 0, 0
+        for est in trees:
+            t = est.tree_
+            n = t.node_count
+            leaf = t.children_left < 0
+            own = np.arange(offset, offset + n)
+            parts.append((
+                np.where(leaf, 0, t.feature),
+                np.where(leaf, np.inf, t.threshold),
+                np.where(leaf, own, t.children_left + offset),
+                np.where(leaf, own, t.children_right + offset),
+                t.value[:, 0, 0],
+                np.where(leaf, True, getattr(t, "missing_go_to_left", np.zeros(n, bool)).astype(bool)),
+            ))
+            roots.append(offset)
+            offset += n
+            depth = max(depth, t.max_depth)
+        feature, threshold, left, right, value, missing_left = (np.concatenate(c) for c in zip(*parts))
+        split = np.isfinite(threshold)
+        tree_of_node = np.repeat(np.arange(len(trees)), np.diff([*roots, offset]))
+        groups = {}
+        for i, s in enumerate(scalers):
+            groups.setdefault(id(s), (s, []))[1].append(i)
+        for s, idx in groups.values():
+            mask = split if len(groups) == 1 else split & np.isin(tree_of_node, idx)
+            threshold[mask] = raw_thresholds(s, feature[mask], threshold[mask])
+        return cls(feature, threshold, left, right, value, missing_left, roots, depth)
+
+    def apply(self, X, compact_every: int = 4, chunk_pairs: int = 1 << 16) -> np.ndarray:
+        """Leaf node index for every (row, tree) pair, shape (n_rows, n_trees).
+
+        Trees are walked in groups of about ``chunk_pairs`` (row, tree) pairs,
+        tree-major within a group, so the node arrays a step gathers from and
+        its temporaries stay in cache on large batches. Pairs that reached a
+        leaf are dropped from the working set every ``compact_every`` steps,
+        so shallow trees stop costing work. Column-major X (e.g. a decoded
+        binary body) is read in place.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n, k = X.shape
+        column_major = X.flags.f_contiguous and not X.flags.c_contiguous
+        flat = X.ravel(order="F" if column_major else "C")
+        has_nan = np.isnan(flat).any()
+        rows = np.arange(n, dtype=np.intp) * (1 if column_major else k)
+        feature = self.feature * n if column_major else self.feature
+        out = np.empty((self.n_trees, n), dtype=np.intp)
+        group = max(1, chunk_pairs // max(n, 1))
+        for t0 in range(0, self.n_trees, group):
+            roots = self.roots[t0:t0 + group]
+            node, row = np.repeat(roots, n), np.tile(rows, len(roots))
+            dest, slot = out[t0:t0 + len(roots)].reshape(-1), None
+            for step in range(1, self.depth + 1):
+                x = flat[row + feature[node]]
+                go_left = x <= self.threshold[node]
+                if has_nan:
+                    go_left |= np.isnan(x) & self.missing_left[node]
+                node = self._children[2 * node + go_left]
+                if step % compact_every == 0:
+                    keep = np.flatnonzero(~self._leaf[node])
+                    if len(keep) < len(node):
+                        if slot is None:
+                            dest[:] = node
+                            slot = keep
+                        else:
+                            dest[slot] = node
+                            slot = slot[keep]
+                        node, row = node[keep], row[keep]
+                        if node.size == 0:
+                            break
+            if slot is None:
+                dest[:] = node
+            else:
+                dest[slot] = node
+        return out.T
+
+    def predict(self, X) -> np.ndarray:
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def predict_trees(self, X) -> np.ndarray:
+        """Every tree's prediction, shape (n_rows, n_trees); its row means are ``predict(X)``."""
+        return self.value[self.apply(X)]
+
+    def contributions(self, X) -> tuple[float, np.ndarray]:
+        """Tree-path attributions: ``predict(X) == bias + contributions.sum(axis=1)``.
+
+        Each split a row passes credits its feature with the change in node
+        value from parent to child, averaged over trees. Leaves point to
+        themselves, so finished paths add zero until the deepest tree is done.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n, k = X.shape
+        flat = X.ravel()
+        has_nan = np.isnan(flat).any()
+        node = np.tile(self.roots, n)
+        row = np.repeat(np.arange(n, dtype=np.intp) * k, self.n_trees)
+        out = np.zeros(n * k)
+        for _ in range(self.depth):
+            cell = row + self.feature[node]
+            x = flat[cell]
+            go_left = x <= self.threshold[node]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left[node]
+            child = self._children[2 * node + go_left]
+            out += np.bincount(cell, weights=self.value[child] - self.value[node], minlength=n * k)
+            node = child
+        return float(self.value[self.roots].mean()), out.reshape(n, k) / self.n_trees
+
+    def save(self, path: str | Path) -> str:
+        arrays = {name: getattr(self, name) for name in self._arrays}
+        np.savez(path, depth=np.int64(self.depth), **arrays)
+        return str(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FlatForest":
+        with np.load(path) as z:
+            return cls(*(z[name] for name in cls._arrays), depth=int(z["depth"]))
@@ -0,0 +1,100 @@
+from copy import deepcopy
+import numpy as np
+from datascience.flat_forest import FlatForest, scaler_kind, tree_estimators
+
+def _is_affine(scaler) -> bool:
+    kind = scaler_kind(scaler)
+    return kind == "StandardScaler" or (kind == "MinMaxScaler" and not scaler.clip)
+
+def _scale(scaler, X: np.ndarray) -> np.ndarray:
+    # Same arithmetic as scaler.transform, applied in place on a float64 matrix.
+    kind = scaler_kind(scaler)
+    if kind == "StandardScaler":
+        if scaler.with_mean:
+            X -= scaler.mean_
+        if scaler.with_std:
+            X /= scaler.scale_
+        return X
+    if kind == "MinMaxScaler" and not scaler.clip:
+        X *= scaler.scale_
+        X += scaler.min_
+        return X
+    return scaler.transform(X)
+
+def _affine(scaler, n_features: int) -> tuple[np.ndarray, np.ndarray]:
+    # (a, b) such that scaled = raw * a + b
+    if scaler_kind(scaler) == "StandardScaler":
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+        return 1.0 / scale, -mean / scale
+    return np.asarray(scaler.scale_, dtype=float), np.asarray(scaler.min_, dtype=float)
+
+def _is_linear(model) -> bool:
+    return (
+        type(model).__module__.startswith("sklearn.linear_model")
+        and np.ndim(getattr(model, "coef_", None)) == 1
+        and np.ndim(getattr(model, "intercept_", None)) == 0
+    )
+
+class InferencePipeline:
+    """Raw feature matrix (features.json order) -> predictions, with the scaler folded in.
+
+    Linear models get the scaler folded into their coefficients and tree
+    ensembles into their split thresholds (as a FlatForest); anything else
+    keeps the scaler as an in-place step before the model.
+    """
+
+    def __init__(self, features: list[str], model, scaler=None):
+        self.features = list(features)
+        self.model = model
+        self.scaler = scaler
+        self.coef_ = None
+        self.intercept_ = None
+
+    @classmethod
+    def fuse(cls, features: list[str], model, scaler=None) -> "InferencePipeline":
+        n = len(features)
+        if _is_linear(model) and (scaler is None or _is_affine(scaler)):
+            a, b = _affine(scaler, n) if scaler is not None else (np.ones(n), np.zeros(n))
+            w = np.asarray(model.coef_, dtype=float)
+            pipe = cls(features, None)
+            pipe.coef_ = w * a
+            pipe.intercept_ = float(model.intercept_ + w @ b)
+            return pipe
+        if tree_estimators(model) and (scaler is None or _is_affine(scaler)):
+            # Split thresholds are mapped back to raw units exactly (see raw_thresholds)
+            return cls(features, FlatForest.from_model(model, scaler))
+        model = deepcopy(model)
+        if hasattr(model, "feature_names_in_"):
+            # Column order is enforced through self.features; inputs are plain arrays.
+            del model.feature_names_in_
+        return cls(features, model, scaler)
+
+    @property
+    def fused(self) -> bool:
+        return self.scaler is None
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Scales X in place when the scaler could not be folded; otherwise a no-op."""
+        if self.scaler is None:
+            return X
+        return _scale(self.scaler, X if X.flags.writeable else X.copy())
+
+    def predict(self, X, copy: bool = True) -> np.ndarray:
+        """Predicts from raw features; copy=False lets an unfused scaler overwrite X."""
+        X = np.asarray(X, dtype=np.float64)
+        if self.scaler is not None:
+            X = self.transform(X.copy() if copy else X)
+        return self.predict_transformed(X)
+
+    def predict_transformed(self, X: np.ndarray) -> np.ndarray:
+        """Predicts from a matrix that already went through transform()."""
+        if self.coef_ is not None:
+            return X @ self.coef_ + self.intercept_
+        return np.ravel(self.model.predict(X))
+
+    def predict_trees_transformed(self, X: np.ndarray) -> np.ndarray:
+        """Per-tree predictions (n_rows, n_trees) from a transformed matrix; forests only."""
+        if not isinstance(self.model, FlatForest):
+            raise ValueError("Per-tree predictions need a tree ensemble model.")
+        return self.model.predict_trees(X)
@@ -0,0 +1,96 @@
+import os, queue, threading, time
+from concurrent.futures import Future
+import numpy as np
+
+class MicroBatcher:
+    """Coalesces concurrent predict calls into one vectorized call.
+
+    Callers block on their own slice of the batch. A batch is flushed once it
+    holds ``max_batch_size`` rows or ``max_wait_ms`` after its first request.
+    After ``close()`` every queued request is still answered and new ones fail.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = float(max_wait_ms) / 1000.0
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+    def _ensure_worker(self):
+        # Under self._lock. Started lazily so the thread lives in the process that
+        # serves requests (gunicorn forks workers after create_app when preloading).
+        if self._thread is None or self._pid != os.getpid():
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def submit(self, X: np.ndarray) -> Future:
+        fut = Future()
+        # One lock with close(): nothing can be queued behind the stop sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed.")
+            self._ensure_worker()
+            self._queue.put((X, fut))
+        return fut
+
+    def predict(self, X: np.ndarray, timeout: float | None = None) -> np.ndarray:
+        return self.submit(X).result(timeout)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            thread = self._thread if self._pid == os.getpid() else None
+            if thread is not None:
+                self._queue.put(None)
+            self._thread = None
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        q = self._queue
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            batch, n = [item], len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while n < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+                n += len(item[0])
+            self._flush(batch, n)
+            if stop:
+                return
+
+    def _flush(self, batch: list, n: int):
+        X = batch[0][0] if len(batch) == 1 else np.concatenate([x for x, _ in batch])
+        try:
+            preds = self.predict_fn(X)
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        self.batches += 1
+        self.rows += n
+        start = 0
+        for x, fut in batch:
+            fut.set_result(preds[start:start + len(x)])
+            start += len(x)
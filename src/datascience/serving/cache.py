@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from pathlib import Path
+import math, threading, time
+import numpy as np
+
+class PredictionCache:
+    """Bounded LRU (optionally TTL) cache of per-row predictions.
+
+    Rows are keyed on their float64 bytes in features.json order, after
+    folding -0.0 into 0.0 and every NaN into one bit pattern. Only the rows
+    of a batch that miss reach the model. The cache empties itself when any
+    ``watch`` file changes on disk (checked at most every ``check_interval_s``).
+    ``tag`` (e.g. the model version) prefixes every key, so callers on
+    different models sharing one cache never see each other's answers.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_s: float = 0.0, watch=(), check_interval_s: float = 1.0):
+        self.max_size = int(max_size)
+        self.ttl = float(ttl_s)
+        self.watch = [Path(p) for p in watch]
+        self.check_interval = float(check_interval_s)
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stamp = self._stat()
+        self._next_check = time.monotonic() + self.check_interval
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _stat(self) -> tuple:
+        stamps = []
+        for p in self.watch:
+            try:
+                st = p.stat()
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _check(self, now: float):
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        stamp = self._stat()
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    @staticmethod
+    def keys(X: np.ndarray) -> list[bytes]:
+        C = np.asarray(X, dtype=np.float64) + 0.0  # -0.0 + 0.0 == 0.0
+        C[np.isnan(C)] = np.nan
+        raw, width = C.tobytes(), C.shape[1] * 8
+        return [raw[i:i + width] for i in range(0, len(raw), width)]
+
+    def predict(self, X: np.ndarray, fn, tag: bytes = b"") -> np.ndarray:
+        """Predictions for X, calling ``fn`` once on the distinct rows that miss."""
+        now = time.monotonic()
+        self._check(now)
+        keys = self.keys(X)
+        if tag:
+            keys = [tag + k for k in keys]
+        out = np.empty(len(keys))
+        missing = {}
+        with self._lock:
+            generation = self._generation
+            for i, k in enumerate(keys):
+                hit = self._data.get(k)
+                if hit is not None and hit[1] > now:
+                    self._data.move_to_end(k)
+                    out[i] = hit[0]
+                else:
+                    missing.setdefault(k, []).append(i)
+            n_miss = sum(len(rows) for rows in missing.values())
+            self.hits += len(keys) - n_miss
+            self.misses += n_miss
+        if not missing:
+            return out
+
+        first = [rows[0] for rows in missing.values()]
+        preds = fn(X if len(first) == len(X) else X[first])
+        expires = now + self.ttl if self.ttl > 0 else math.inf
+        with self._lock:
+            for (k, rows), p in zip(missing.items(), preds):
+                out[rows] = p
+                if generation == self._generation:  # model changed mid-call: don't cache old answers
+                    self._data[k] = (float(p), expires)
+                    self._data.move_to_end(k)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return out
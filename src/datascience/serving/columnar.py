@@ -0,0 +1,84 @@
+"""Compact columnar binary bodies for /predict (``Content-Type: application/x-wine-columnar``).
+
+Layout, all little-endian::
+
+    b"WNC1" | uint32 header length | JSON header, space-padded to 8 bytes | data
+
+The header is ``{"columns": [...], "rows": n, "dtype": "<f8" | "<f4"}`` and the data
+holds one contiguous array per column, in header order. Responses use the same
+layout, with columns ``prediction`` (plus ``std`` and ``q<quantile>`` when asked).
+"""
+import json, struct
+import numpy as np
+
+CONTENT_TYPE = "application/x-wine-columnar"
+MAGIC = b"WNC1"
+DTYPES = ("<f8", "<f4")
+
+def encode(columns: dict, dtype: str = "<f8") -> bytes:
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {list(DTYPES)}.")
+    names = list(columns)
+    arrays = [np.asarray(columns[c], dtype=dtype) for c in names]
+    rows = len(arrays[0]) if arrays else 0
+    if any(len(a) != rows for a in arrays):
+        raise ValueError("All columns must have the same length.")
+    header = json.dumps({"columns": names, "rows": rows, "dtype": dtype}).encode()
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+    return b"".join([MAGIC, struct.pack("<I", len(header)), header, *(a.tobytes() for a in arrays)])
+
+def read_header(body: bytes) -> tuple[dict, int]:
+    if len(body) < 8 or body[:4] != MAGIC:
+        raise ValueError(f"Binary body must start with {MAGIC!r}.")
+    (size,) = struct.unpack_from("<I", body, 4)
+    try:
+        header = json.loads(body[8:8 + size])
+    except ValueError:
+        raise ValueError("Binary body has an unreadable header.") from None
+    if not isinstance(header, dict) or header.get("dtype", "<f8") not in DTYPES:
+        raise ValueError(f"Header 'dtype' must be one of {list(DTYPES)}.")
+    return header, 8 + size
+
+def prediction_columns(out: dict) -> dict:
+    """/predict result (predictions, optional std and quantiles) -> response columns."""
+    cols = {"prediction": out["predictions"]}
+    if "std" in out:
+        cols["std"] = out["std"]
+    cols.update({f"q{q}": v for q, v in out.get("quantiles", {}).items()})
+    return cols
+
+def wants_binary(accept: str | None) -> bool:
+    """Binary requests get a binary answer unless the client asks for JSON only."""
+    accept = accept or ""
+    return CONTENT_TYPE in accept or "application/json" not in accept
+
+class ColumnarDecoder:
+    """Binary body -> (rows, features) float64 matrix in features.json order, without copying when possible.
+
+    With ``<f8`` columns already in features.json order the result is a
+    read-only, column-major view of the request body.
+    """
+
+    def __init__(self, feature_order: list[str]):
+        self.features = list(feature_order)
+        self._keys = frozenset(self.features)
+
+    def decode(self, body: bytes) -> np.ndarray:
+        header, offset = read_header(body)
+        columns, rows = header.get("columns"), header.get("rows")
+        if not isinstance(columns, list) or not isinstance(rows, int) or rows <= 0:
+            raise ValueError("Header needs 'columns' (list) and 'rows' (positive int).")
+        missing = [f for f in self.features if f not in columns]
+        extra = [c for c in columns if c not in self._keys]
+        if missing:
+            raise ValueError(f"Missing keys: {missing}")
+        if extra or len(columns) != len(self.features):
+            raise ValueError(f"Unexpected keys: {extra or columns}")
+        dtype = np.dtype(header.get("dtype", "<f8"))
+        expected = offset + rows * len(columns) * dtype.itemsize
+        if len(body) != expected:
+            raise ValueError(f"Binary body is {len(body)} bytes, header implies {expected}.")
+        data = np.frombuffer(body, dtype=dtype, count=rows * len(columns), offset=offset).reshape(len(columns), rows)
+        if columns != self.features:
+            data = data[[columns.index(f) for f in self.features]]
+        return data.T if dtype == np.float64 else data.T.astype(np.float64)
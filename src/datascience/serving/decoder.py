@@ -0,0 +1,44 @@
+import numpy as np
+from datascience.serving.columnar import ColumnarDecoder
+
+class RequestDecoder:
+    """Decodes /predict JSON bodies straight into a float64 matrix in feature order."""
+
+    def __init__(self, feature_order: list[str], allow_extra: bool = False):
+        self.features = list(feature_order)
+        self.allow_extra = allow_extra
+        self.n_features = len(self.features)
+        self._keys = frozenset(self.features)
+        if len(self._keys) != self.n_features:
+            raise ValueError(f"Duplicate names in feature order: {self.features}")
+        self.columnar = ColumnarDecoder(self.features)  # binary bodies (serving.columnar)
+
+    def _rows(self, payload) -> list[dict]:
+        # Accept {"data": {...}} or {"data": [{...}, {...}]}
+        if not isinstance(payload, dict) or "data" not in payload:
+            raise ValueError("Body must be JSON with a 'data' key.")
+
+        data = payload["data"]
+        if isinstance(data, dict):
+            return [data]
+        if isinstance(data, list) and data and all(isinstance(r, dict) for r in data):
+            return data
+        raise ValueError("'data' must be an object or a non-empty list of objects.")
+
+    def _check_keys(self, row: dict) -> None:
+        missing = [f for f in self.features if f not in row]
+        extra = [k for k in row.keys() if k not in self._keys]
+        if missing:
+            raise ValueError(f"Missing keys: {missing}")
+        if extra and not self.allow_extra:
+            raise ValueError(f"Unexpected keys: {extra}")
+
+    def decode(self, payload) -> np.ndarray:
+        rows = self._rows(payload)
+        X = np.empty((len(rows), self.n_features), dtype=np.float64)
+        features = self.features
+        for i, row in enumerate(rows):
+            if row.keys() != self._keys:
+                self._check_keys(row)
+            X[i] = [row[f] for f in features]
+        return X
@@ -0,0 +1,249 @@
+from pathlib import Path
+import atexit, hashlib, os, socket, threading, time, warnings
+import numpy as np
+
+_EPS = 1e-4  # PSI floor for empty bins
+_STATE_DIRS: set[Path] = set()  # directories this process has written a state file to
+
+def _own_file(state_dir: Path) -> Path:
+    return state_dir / f"{socket.gethostname()}-{os.getpid()}.npz"
+
+@atexit.register
+def _remove_state_files():
+    # One hook per process, not per monitor: replaced monitors are not kept alive by it
+    for d in _STATE_DIRS:
+        _own_file(d).unlink(missing_ok=True)
+
+class DriftReference:
+    """Training distribution per feature: quantile bin edges, counts per bin, mean and std."""
+
+    def __init__(self, features: list[str], edges: np.ndarray, counts: np.ndarray, mean: np.ndarray, std: np.ndarray):
+        self.features = list(features)
+        self.edges = np.ascontiguousarray(edges, dtype=np.float64)  # (n_features, bins - 1)
+        self.counts = np.asarray(counts, dtype=np.int64)           # (n_features, bins)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.std = np.asarray(std, dtype=np.float64)
+        h = hashlib.sha256(self.edges.tobytes() + self.counts.tobytes())
+        self.version = h.hexdigest()[:12]
+
+    @property
+    def bins(self) -> int:
+        return self.counts.shape[1]
+
+    @classmethod
+    def from_matrix(cls, X, features: list[str], bins: int = 100) -> "DriftReference":
+        X = np.asarray(X, dtype=np.float64)
+        edges = np.nanquantile(X, np.linspace(0, 1, bins + 1)[1:-1], axis=0).T
+        return cls(features, edges, bin_counts(edges, X), np.nanmean(X, axis=0), np.nanstd(X, axis=0))
+
+def bin_counts(edges: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """(n_features, bins) counts; bin i holds edges[i-1] < x <= edges[i], NaNs are skipped."""
+    k, bins = edges.shape[0], edges.shape[1] + 1
+    if X.size * bins <= 1 << 16:
+        idx = (X[:, :, None] > edges).sum(axis=2)  # small requests: one broadcast compare
+    else:
+        idx = np.empty(X.shape, dtype=np.intp)
+        for j in range(k):
+            idx[:, j] = np.searchsorted(edges[j], X[:, j])
+    idx += np.arange(k) * bins
+    nan = np.isnan(X)
+    return np.bincount(idx[~nan] if nan.any() else idx.ravel(), minlength=k * bins).reshape(k, bins)
+
+class DriftMonitor:
+    """Constant-memory summary of live /predict inputs, compared against a DriftReference.
+
+    Each request folds its feature matrix into per-feature count/mean/M2,
+    min/max and counts over the training quantile bins: a few vectorized
+    calls, no per-row state. The bins double as a quantile sketch and give
+    PSI and KS against the training split. A background thread, started by
+    the first update in each process, writes the state to ``state_dir``
+    every ``flush_s`` seconds (its mtime doubles as a heartbeat); the
+    process removes its file at exit. ``report()`` merges all live files
+    for the same reference, so one worker answers for the fleet. A file
+    counts as live while its process runs (same host) or, from other
+    hosts, while it is younger than ``stale_s`` (default three flush
+    intervals).
+    """
+
+    def __init__(self, reference: DriftReference, state_dir: str | Path | None = None, flush_s: float = 5.0,
+                 stale_s: float | None = None):
+        self.dir = Path(state_dir) if state_dir else None
+        self.flush_s = float(flush_s)
+        self.stale_s = float(stale_s) if stale_s is not None else 3 * self.flush_s
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self.reset(reference)
+
+    def reset(self, reference: DriftReference):
+        k = len(reference.features)
+        with self._lock:
+            self.reference = reference
+            self.n = np.zeros(k, dtype=np.int64)
+            self.mean = np.zeros(k)
+            self.m2 = np.zeros(k)
+            self.min = np.full(k, np.inf)
+            self.max = np.full(k, -np.inf)
+            self.counts = np.zeros_like(reference.counts)
+            self._pid = os.getpid()
+
+    def update(self, X: np.ndarray):
+        if self._pid != os.getpid():
+            # Forked worker: the parent's traffic is not ours to report
+            self.reset(self.reference)
+        counts = bin_counts(self.reference.edges, X)
+        if np.isnan(X).any():
+            n_b = np.count_nonzero(~np.isnan(X), axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+                mean_b = np.where(n_b > 0, np.nansum(X, axis=0) / n_b, 0.0)
+                m2_b = np.nansum((X - mean_b) ** 2, axis=0)
+                lo, hi = np.nanmin(X, axis=0), np.nanmax(X, axis=0)
+        else:
+            n_b = np.full(X.shape[1], len(X))
+            mean_b = X.mean(axis=0)
+            m2_b = ((X - mean_b) ** 2).sum(axis=0)
+            lo, hi = X.min(axis=0), X.max(axis=0)
+        with self._lock:
+            self.counts += counts
+            _merge(self, n_b, mean_b, m2_b, lo, hi)
+        if self.dir is not None and self._thread_pid != os.getpid():
+            self._start_flusher()
+
+    def _start_flusher(self):
+        # Per process and lazily: threads do not survive a fork, and none may start in a preloading master
+        with self._lock:
+            if self._thread_pid == os.getpid() or self._stop.is_set():
+                return
+            self._thread = threading.Thread(target=self._flush_loop, name="drift-flush", daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_s):
+            self.flush()
+
+    def close(self):
+        """Stops the flush thread (the model this monitor belongs to was replaced)."""
+        self._stop.set()
+        if self._thread is not None and self._thread_pid == os.getpid():
+            self._thread.join(timeout=self.flush_s + 1)
+
+    def state(self) -> dict:
+        with self._lock:
+            return {"version": self.reference.version, "n": self.n.copy(), "mean": self.mean.copy(), "m2": self.m2.copy(),
+                    "min": self.min.copy(), "max": self.max.copy(), "counts": self.counts.copy()}
+
+    def flush(self):
+        if self.dir is None:
+            return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _STATE_DIRS.add(self.dir)
+        path = _own_file(self.dir)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(tmp, **self.state())
+        os.replace(tmp, path)
+
+    def remove(self):
+        """Delete this process's state file, so a stopped worker's traffic leaves the fleet report."""
+        if self.dir is not None:
+            _own_file(self.dir).unlink(missing_ok=True)
+
+    def _live(self, path: Path, host: str) -> bool:
+        name, _, pid = path.stem.rpartition("-")
+        if name == host and pid.isdigit():
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                return False
+            except PermissionError:
+                pass  # alive, owned by another user
+            return True
+        try:
+            return time.time() - path.stat().st_mtime <= self.stale_s
+        except OSError:
+            return False
+
+    def merged(self) -> tuple[dict, int]:
+        """This process's state plus every other live worker's file for the same reference."""
+        total, workers = self.state(), 1
+        host = socket.gethostname()
+        own = _own_file(Path()).name
+        for path in sorted(self.dir.glob("*.npz")) if self.dir is not None and self.dir.exists() else []:
+            if path.name == own or path.name.endswith(".tmp.npz") or not self._live(path, host):
+                continue
+            try:
+                with np.load(path) as z:
+                    other = {k: z[k] for k in z.files}
+            except (OSError, ValueError):
+                continue  # replaced or removed mid-read
+            if str(other["version"]) != self.reference.version:
+                continue
+            total["counts"] = total["counts"] + other["counts"]
+            _merge(_State(total), other["n"], other["mean"], other["m2"], other["min"], other["max"])
+            workers += 1
+        return total, workers
+
+    def report(self, psi_bins: int = 10, psi_alert: float = 0.2) -> dict:
+        ref = self.reference
+        s, workers = self.merged()
+        live = s["counts"]
+        # PSI on coarse groups of the fine quantile bins; KS on the fine bin edges
+        groups = np.array_split(np.arange(ref.bins), psi_bins)
+        expected = np.stack([ref.counts[:, g].sum(axis=1) for g in groups], axis=1) / ref.counts.sum(axis=1, keepdims=True)
+        rows = np.maximum(live.sum(axis=1, keepdims=True), 1)
+        actual = np.stack([live[:, g].sum(axis=1) for g in groups], axis=1) / rows
+        e, a = np.clip(expected, _EPS, None), np.clip(actual, _EPS, None)
+        psi = ((a - e) * np.log(a / e)).sum(axis=1)
+        cdf_ref = np.cumsum(ref.counts, axis=1)[:, :-1] / ref.counts.sum(axis=1, keepdims=True)
+        cdf_live = np.cumsum(live, axis=1)[:, :-1] / rows
+        ks = np.abs(cdf_live - cdf_ref).max(axis=1)
+        qs = _quantiles(ref.edges, live, s["min"], s["max"], (0.05, 0.5, 0.95))
+        std = np.sqrt(np.where(s["n"] > 0, s["m2"] / np.maximum(s["n"], 1), np.nan))
+
+        features = {}
+        for j, f in enumerate(ref.features):
+            seen = int(s["n"][j]) > 0
+            features[f] = {
+                "psi": float(psi[j]) if seen else None, "ks": float(ks[j]) if seen else None,
+                "mean": float(s["mean"][j]) if seen else None, "std": float(std[j]) if seen else None,
+                "train_mean": float(ref.mean[j]), "train_std": float(ref.std[j]),
+                **{f"p{round(q * 100):02d}": (float(v) if seen else None) for q, v in zip((0.05, 0.5, 0.95), qs[j])},
+            }
+        scored = {f: v["psi"] for f, v in features.items() if v["psi"] is not None}
+        return {
+            "reference_version": ref.version, "rows": int(s["n"].max(initial=0)), "workers": workers,
+            "psi_alert": psi_alert, "drifted": sorted(f for f, p in scored.items() if p >= psi_alert),
+            "features": features,
+        }
+
+class _State:
+    # Attribute view over a state dict so _merge works on monitors and merged snapshots alike
+    def __init__(self, d: dict):
+        self.__dict__ = d
+
+def _merge(st, n_b, mean_b, m2_b, lo, hi):
+    # Chan et al. pairwise merge of count/mean/M2, elementwise over features
+    n_a = st.n
+    n = n_a + n_b
+    delta = mean_b - st.mean
+    w = np.divide(n_b, n, out=np.zeros(len(n)), where=n > 0)
+    st.mean = st.mean + delta * w
+    st.m2 = st.m2 + m2_b + delta * delta * n_a * w
+    st.n = n
+    st.min = np.fmin(st.min, lo)
+    st.max = np.fmax(st.max, hi)
+
+def _quantiles(edges: np.ndarray, counts: np.ndarray, lo: np.ndarray, hi: np.ndarray, qs) -> np.ndarray:
+    """Quantiles read off the bin counts, linear within a bin; bin ends are the training edges and live min/max."""
+    k = len(edges)
+    out = np.full((k, len(qs)), np.nan)
+    for j in range(k):
+        total = counts[j].sum()
+        if total == 0:
+            continue
+        bounds = np.concatenate([[lo[j]], np.clip(edges[j], lo[j], hi[j]), [hi[j]]])
+        cum = np.concatenate([[0], np.cumsum(counts[j])]) / total
+        out[j] = np.interp(qs, cum, bounds)
+    return out
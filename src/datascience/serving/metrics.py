@@ -0,0 +1,207 @@
+from bisect import bisect_left
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 50us .. 2.5s; decode of one row sits at the bottom, large batches at the top
+LATENCY_BUCKETS = (5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+def _fmt(v) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        self._default = None if self.labelnames else self.labels()
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new())
+        return child
+
+    def _new(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._samples(key, child))
+        return lines
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+class Counter(_Metric):
+    kind = "counter"
+    _new = _Value
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def _samples(self, key, child):
+        return [f"{self.name}{_labels(self.labelnames, key)} {_fmt(child.value)}"]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; observe() is a bisect plus two adds under a lock."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new(self):
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def _samples(self, key, child):
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines, cum = [], 0
+        for le, c in zip((*self.buckets, float("inf")), counts):
+            cum += c
+            le_label = 'le="%s"' % _fmt(le)
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le_label)} {cum}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cum}")
+        return lines
+
+class _Callback:
+    """A value read from ``fn()`` at scrape time (counters kept by other objects)."""
+
+    def __init__(self, name: str, help: str, fn, kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.kind = kind
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}",
+                f"{self.name} {_fmt(float(self.fn()))}"]
+
+class Registry:
+    """In-process metrics rendered in the Prometheus text exposition format.
+
+    Each gunicorn worker keeps its own registry; scrape workers individually
+    (or run one worker per pod) when exact per-process series matter.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, fn, kind: str = "gauge") -> _Callback:
+        return self.register(_Callback(name, help, fn, kind))
+
+    def render(self) -> str:
+        return "\n".join(line for m in self._metrics for line in m.render()) + "\n"
+
+class ApiMetrics:
+    """The /predict instrumentation: per-stage latency, batch sizes, errors and in-flight requests."""
+
+    STAGES = ("parse", "validate", "monitor", "scale", "predict", "serialize")
+
+    def __init__(self, registry: Registry | None = None):
+        self.registry = registry or Registry()
+        r = self.registry
+        self.stage = r.histogram("wine_api_stage_seconds", "Time spent in each /predict stage.", ("stage",))
+        self.request = r.histogram("wine_api_request_seconds", "End-to-end /predict latency.")
+        self.batch_rows = r.histogram("wine_api_batch_rows", "Rows per model call.", buckets=SIZE_BUCKETS)
+        self.requests = r.counter("wine_api_requests_total", "Requests by endpoint and status code.", ("endpoint", "status"))
+        self.errors = r.counter("wine_api_errors_total", "Failed /predict requests by exception type.", ("type",))
+        self.in_flight = r.gauge("wine_api_in_flight_requests", "Requests currently being served.")
+        self.startup = r.gauge("wine_api_startup_seconds", "Cold-start phases: module import, model load, warm-up.", ("phase",))
+        # Resolved once so the hot path skips the label lookup
+        for name in self.STAGES:
+            setattr(self, name, self.stage.labels(name))
+        self.ok = self.requests.labels("/predict", 200)
+        self.rejected = self.requests.labels("/predict", 400)
+        self.overloaded = self.requests.labels("/predict", 429)
+        self.timed_out = self.requests.labels("/predict", 504)
+
+    def track_cache(self, cache):
+        r = self.registry
+        r.callback("wine_api_cache_hits_total", "Rows answered from the prediction cache.", lambda: cache.hits, "counter")
+        r.callback("wine_api_cache_misses_total", "Rows that went to the model.", lambda: cache.misses, "counter")
+        r.callback("wine_api_cache_evictions_total", "Entries dropped by the LRU bound.", lambda: cache.evictions, "counter")
+        r.callback("wine_api_cache_invalidations_total", "Cache flushes after a model change.", lambda: cache.invalidations, "counter")
+        r.callback("wine_api_cache_entries", "Rows currently cached.", lambda: len(cache))
+
+    def track_reloader(self, reloader):
+        r = self.registry
+        r.callback("wine_api_model_reloads_total", "Models swapped in without a restart.", lambda: reloader.swaps, "counter")
+        r.callback("wine_api_model_reload_failures_total", "New artifacts rejected by load or canary.", lambda: reloader.failures, "counter")
+
+    def render(self) -> str:
+        return self.registry.render()
@@ -0,0 +1,146 @@
+from pathlib import Path
+import hashlib, os, threading
+
+def artifact_version(paths) -> str:
+    """Short content hash of the model artifacts; identical across workers and hosts."""
+    h = hashlib.sha256()
+    for p in map(Path, paths):
+        if p.exists():
+            h.update(p.name.encode())
+            with open(p, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()[:12]
+
+class ModelSnapshot:
+    __slots__ = ("version", "features", "pipeline", "decoder", "run", "close", "monitor")
+
+    def __init__(self, version, features, pipeline, decoder, run, close=None, monitor=None):
+        self.version = version
+        self.features = features
+        self.pipeline = pipeline
+        self.decoder = decoder
+        self.run = run
+        self.close = close
+        self.monitor = monitor
+
+class ModelReloader:
+    """Serves ``current`` and swaps in retrained artifacts without a restart.
+
+    A background thread stats ``watch`` every ``poll_s`` seconds. A change
+    must hold for one full poll (so a trainer mid-write is not picked up),
+    then ``load()`` builds the new snapshot off the request path and
+    ``canary(snapshot)`` must not raise. Only then is ``current`` replaced,
+    by a single assignment: each request works on the snapshot it read
+    first, old or new, never a mix. Failed loads keep the old model and are
+    not retried until the files change again.
+
+    Requests hold their snapshot with ``acquire()``/``release()``. A replaced
+    snapshot goes to ``on_retire`` only once its last holder has released it,
+    so its resources (e.g. a micro-batcher) are never closed under a request.
+    """
+
+    def __init__(self, load, watch=(), poll_s: float = 2.0, canary=None, on_swap=None, on_retire=None):
+        self.load = load
+        self.watch = [Path(p) for p in watch]
+        self.poll = float(poll_s)
+        self.canary = canary
+        self.on_swap = on_swap
+        self.on_retire = on_retire
+        self._users = {}    # id(snapshot) -> requests holding it
+        self._retired = {}  # id(snapshot) -> replaced snapshot still held
+        self._users_lock = threading.Lock()
+        self.swaps = self.failures = 0
+        self.last_error = None
+        self._stamp = self._stat()
+        self._pending = self._failed = None
+        self.current = load()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def _stat(self) -> tuple:
+        stamps = []
+        for p in self.watch:
+            try:
+                st = p.stat()
+                stamps.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def check(self) -> bool:
+        """One poll; returns True when a new snapshot was swapped in."""
+        stamp = self._stat()
+        if stamp in (self._stamp, self._failed):
+            self._pending = None
+            return False
+        if stamp != self._pending:
+            self._pending = stamp
+            return False
+        self._pending = None
+        try:
+            snap = self.load()
+            if self.canary is not None:
+                self.canary(snap)
+        except Exception as e:
+            self._failed = stamp
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+        with self._users_lock:
+            old, self.current, self._stamp = self.current, snap, stamp
+            held = self._users.get(id(old), 0) > 0
+            if held:
+                self._retired[id(old)] = old
+        self.swaps += 1
+        self.last_error = None
+        if self.on_swap is not None:
+            self.on_swap(old, snap)
+        if not held and self.on_retire is not None:
+            self.on_retire(old)
+        return True
+
+    def acquire(self):
+        """The current snapshot, held until ``release()``."""
+        with self._users_lock:
+            snap = self.current
+            self._users[id(snap)] = self._users.get(id(snap), 0) + 1
+        return snap
+
+    def release(self, snap):
+        with self._users_lock:
+            key = id(snap)
+            self._users[key] -= 1
+            if self._users[key] > 0:
+                return
+            del self._users[key]
+            retired = self._retired.pop(key, None)
+        if retired is not None and self.on_retire is not None:
+            self.on_retire(retired)
+
+    def ensure_started(self):
+        # Per process: gunicorn forks workers after create_app when preloading
+        if self.poll <= 0 or (self._thread is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def _run(self):
+        stop = self._stop
+        while not stop.wait(self.poll):
+            try:
+                self.check()
+            except Exception as e:  # a bad poll must never kill the watcher
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def close(self):
+        if self._thread is not None and self._pid == os.getpid():
+            self._stop.set()
+            self._thread.join()
+        self._thread = None
@@ -0,0 +1,27 @@
+import numpy as np
+
+def parse_uncertainty(args) -> tuple[bool, list[float]]:
+    """``?std=1&quantiles=0.05,0.95`` query args -> (std, quantiles)."""
+    std = str(args.get("std", "")).lower() in ("1", "true", "yes")
+    raw = args.get("quantiles") or ""
+    try:
+        quantiles = [float(q) for q in raw.split(",") if q.strip()]
+    except ValueError:
+        raise ValueError(f"'quantiles' must be comma-separated numbers, got {raw!r}.") from None
+    if any(not 0.0 <= q <= 1.0 for q in quantiles):
+        raise ValueError("'quantiles' must lie in [0, 1].")
+    return std, quantiles
+
+def tree_spread(per_tree: np.ndarray, std: bool, quantiles: list[float]) -> dict:
+    """Mean prediction plus dispersion across trees, from one (n_rows, n_trees) array."""
+    out = {"predictions": per_tree.mean(axis=1)}
+    if std:
+        out["std"] = per_tree.std(axis=1)
+    if quantiles:
+        values = np.quantile(per_tree, quantiles, axis=1)
+        out["quantiles"] = {f"{q:g}": v for q, v in zip(quantiles, values)}
+    return out
+
+def as_json(out: dict) -> dict:
+    """tree_spread-style arrays -> lists for a JSON response."""
+    return {k: ({q: v.tolist() for q, v in val.items()} if isinstance(val, dict) else val.tolist()) for k, val in out.items()}
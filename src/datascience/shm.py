@@ -0,0 +1,48 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import numpy as np
+
+# Worker-side state (set by attach): views of one shared [X | y] block and the caller's extra
+X = y = extra = None
+_shm = None
+
+def attach(name: str, n_rows: int, n_cols: int, data=None):
+    global X, y, extra, _shm
+    _shm = shared_memory.SharedMemory(name=name)
+    buf = np.ndarray((n_rows, n_cols + 1), dtype=np.float64, buffer=_shm.buf)
+    X, y, extra = buf[:, :-1], buf[:, -1], data
+
+def detach():
+    global X, y, extra, _shm
+    shm, X, y, extra, _shm = _shm, None, None, None, None
+    if shm is not None:
+        shm.close()
+
+@contextmanager
+def shared_xy(X: np.ndarray, y: np.ndarray, workers: int, extra=None):
+    """Publishes ``[X | y]`` once in shared memory for the body's duration.
+
+    Yields a process pool whose workers map it (``shm.X``, ``shm.y`` and
+    ``shm.extra`` in the worker), or None for ``workers <= 1``, in which case
+    this process is attached itself and work runs in-process.
+    """
+    block = shared_memory.SharedMemory(create=True, size=X.nbytes + y.nbytes)
+    pool = buf = None
+    try:
+        buf = np.ndarray((len(X), X.shape[1] + 1), dtype=np.float64, buffer=block.buf)
+        buf[:, :-1], buf[:, -1] = X, y
+        init = (block.name, len(X), X.shape[1], extra)
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=attach, initargs=init)
+        else:
+            attach(*init)
+        yield pool
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        else:
+            detach()
+        del buf
+        block.close()
+        block.unlink()
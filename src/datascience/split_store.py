@@ -0,0 +1,113 @@
+from __future__ import annotations
+from pathlib import Path
+import json, os
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd  # imported lazily at runtime: serving reads npy splits without pandas
+
+class SplitStore:
+    """Reads and writes the processed train/test splits in the configured format.
+
+    ``io.split_format`` picks the on-disk format: ``npy`` (memory-mapped on
+    read, zero-copy), ``parquet``/``feather`` (need pyarrow) or ``csv``.
+    ``splits.json`` records the format and columns so readers never guess.
+    """
+
+    FORMATS = {"npy": ".npy", "parquet": ".parquet", "feather": ".feather", "csv": ".csv"}
+    MANIFEST = "splits.json"
+
+    def __init__(self, cfg: dict):
+        self.dir = Path(cfg["paths"]["data_processed_dir"])
+        io = cfg.get("io", {}) or {}
+        self.format = io.get("split_format", "csv")
+        self.export_csv = bool(io.get("split_csv_export", False))
+        if self.format not in self.FORMATS:
+            raise ValueError(f"io.split_format must be one of {sorted(self.FORMATS)}, got {self.format!r}")
+
+    def path(self, name: str, fmt: str | None = None) -> Path:
+        return self.dir / f"{name}{self.FORMATS[fmt or self.format]}"
+
+    def _write(self, obj: pd.DataFrame, fmt: str, path: Path):
+        # Write-then-rename so readers holding a memory map of the old file stay valid
+        tmp = path.with_name(path.name + ".tmp")
+        if fmt == "npy":
+            arr = obj.to_numpy()
+            if arr.dtype == object:
+                raise ValueError(f"{path.name}: npy splits must be numeric")
+            with open(tmp, "wb") as fh:
+                np.save(fh, np.ascontiguousarray(arr))
+        elif fmt == "csv":
+            obj.to_csv(tmp, index=False)
+        else:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError(f"io.split_format '{fmt}' needs pyarrow (pip install pyarrow)") from e
+            frame = obj.reset_index(drop=True)
+            if fmt == "parquet":
+                frame.to_parquet(tmp, index=False)
+            else:
+                frame.to_feather(tmp)
+        os.replace(tmp, path)
+
+    def save(self, splits: dict) -> str:
+        import pandas as pd
+        self.dir.mkdir(parents=True, exist_ok=True)
+        manifest = {"format": self.format, "splits": {}}
+        for name, obj in splits.items():
+            series = isinstance(obj, pd.Series)
+            frame = obj.to_frame() if series else obj
+            self._write(frame, self.format, self.path(name))
+            if self.export_csv and self.format != "csv":
+                self._write(frame, "csv", self.path(name, "csv"))
+            manifest["splits"][name] = {
+                "columns": [str(c) for c in frame.columns],
+                "series": series,
+                "rows": len(frame),
+            }
+        path = self.dir / self.MANIFEST
+        path.write_text(json.dumps(manifest, indent=2))
+        return str(path)
+
+    def _manifest(self) -> dict:
+        path = self.dir / self.MANIFEST
+        if path.exists():
+            return json.loads(path.read_text())
+        return {"format": "csv", "splits": {}}  # artifacts written before the manifest existed
+
+    def load(self, name: str):
+        import pandas as pd  # deferred: serving reads npy splits through load_array alone
+        manifest = self._manifest()
+        fmt = manifest["format"]
+        meta = manifest["splits"].get(name, {})
+        path = self.path(name, fmt)
+        if fmt == "npy":
+            arr = np.load(path, mmap_mode="r")
+            frame = pd.DataFrame(arr.reshape(len(arr), -1), columns=meta["columns"], copy=False)
+        elif fmt == "csv":
+            frame = pd.read_csv(path)
+        elif fmt == "parquet":
+            frame = pd.read_parquet(path, memory_map=True)
+        else:
+            frame = pd.read_feather(path)
+        if meta.get("series", name.startswith("y_")):
+            return frame.squeeze("columns")
+        return frame
+
+    def load_array(self, name: str, columns: list[str] | None = None) -> np.ndarray:
+        """Split as a float64 matrix, optionally reordered to ``columns``; npy splits never touch pandas."""
+        manifest = self._manifest()
+        if manifest["format"] != "npy":
+            frame = self.load(name)
+            return (frame if columns is None else frame[columns]).to_numpy(dtype=np.float64)
+        arr = np.load(self.path(name, "npy"), mmap_mode="r")
+        arr = arr.reshape(len(arr), -1)
+        if columns is not None:
+            names = manifest["splits"][name]["columns"]
+            missing = [c for c in columns if c not in names]
+            if missing:
+                raise KeyError(f"{name} has no columns {missing}")
+            arr = arr[:, [names.index(c) for c in columns]]
+        return np.asarray(arr, dtype=np.float64)
@@ -0,0 +1,91 @@
+from pathlib import Path
+import hashlib, importlib.util, json, os, time
+
+class StageCache:
+    """Content-addressed skip logic for main.py stages.
+
+    A stage's fingerprint hashes its input files (by content), the params and
+    config sections it depends on, and the source of the modules that run it.
+    When the fingerprint matches the last successful run and every recorded
+    output is still on disk unchanged, the stage is skipped.
+
+    File hashes are memoised by (size, mtime_ns) so a no-op rerun only stats files.
+    Files are keyed relative to the project root (the directory above the
+    config file), so a copied or moved checkout keeps its cache.
+    """
+
+    def __init__(self, cfg: dict, force: bool = False):
+        paths = cfg["paths"]
+        self.root = Path(cfg["_config_path"]).parent.parent if cfg.get("_config_path") else Path.cwd()
+        self.dir = Path(paths.get("cache_dir") or Path(paths["model_dir"]).parent / "stage_cache")
+        self.state_path = self.dir / "stages.json"
+        self.force = force
+        self.state = {"stages": {}, "files": {}}
+        self._dirty = False
+        if self.state_path.exists():
+            self.state = json.loads(self.state_path.read_text())
+
+    def key(self, path: str | Path) -> str:
+        p = (self.root / path).resolve()
+        return p.relative_to(self.root).as_posix() if p.is_relative_to(self.root) else str(p)
+
+    def file_hash(self, path: str | Path) -> str | None:
+        p = self.root / path
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            return None
+        key = self.key(p)
+        memo = self.state["files"].get(key)
+        if memo and memo["size"] == st.st_size and memo["mtime_ns"] == st.st_mtime_ns:
+            return memo["sha256"]
+        h = hashlib.sha256()
+        with open(p, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.state["files"][key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        self._dirty = True
+        return digest
+
+    def fingerprint(self, files=(), data=None, code=()) -> str:
+        h = hashlib.sha256()
+        sources = [importlib.util.find_spec(m).origin for m in code]
+        for p in sorted({self.key(f) for f in [*files, *sources]}):
+            h.update(p.encode())
+            h.update((self.file_hash(p) or "missing").encode())
+        h.update(json.dumps(data, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def outputs(self, stage: str) -> list[str]:
+        return [str(self.root / p) for p in self.state["stages"].get(stage, {}).get("outputs", {})]
+
+    def is_fresh(self, stage: str, fp: str) -> bool:
+        rec = self.state["stages"].get(stage)
+        if self.force or not rec or rec["fingerprint"] != fp:
+            return False
+        return all(self.file_hash(p) == digest for p, digest in rec["outputs"].items())
+
+    def run(self, stage: str, fn, files=(), data=None, code=(), outputs=lambda result: []):
+        """Runs ``fn()`` unless cached; returns (result, ran). ``outputs(result)`` lists files to record."""
+        fp = self.fingerprint(files, data, code)
+        if self.is_fresh(stage, fp):
+            self.save()
+            return None, False
+        t0 = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - t0
+        produced = {self.key(p): self.file_hash(p) for p in outputs(result)}
+        self.state["stages"][stage] = {"fingerprint": fp, "outputs": produced, "seconds": seconds}
+        self._dirty = True
+        self.save()
+        return result, True
+
+    def save(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2))
+        os.replace(tmp, self.state_path)
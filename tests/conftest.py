@@ -1,5 +1,5 @@
 # tests/conftest.py
-import sys, pathlib, pytest
+import sys, pathlib, pytest, yaml
 sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
 
 from datascience.config_manager import load_config
@@ -19,3 +19,17 @@ def build_artifacts_once():
     DataTransformation(params, cfg).split_and_transform(df)
     ModelTrainer(params, cfg).train()
     ModelEvaluation(params, cfg).evaluate()
+
+@pytest.fixture
+def app_config(tmp_path):
+    """Factory for a config.yaml in tmp_path: the repo config with ``serving`` sections and ``paths`` overridden."""
+    def make(serving: dict | None = None, paths: dict | None = None) -> str:
+        cfg = {k: v for k, v in load_config("config/config.yaml").items() if not k.startswith("_")}
+        base = cfg.get("serving", {}) or {}
+        cfg["serving"] = {**base, **{k: {**(base.get(k) or {}), **v} if isinstance(v, dict) else v
+                                     for k, v in (serving or {}).items()}}
+        cfg["paths"] = {**cfg["paths"], **(paths or {})}
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.safe_dump(cfg))
+        return str(path)
+    return make
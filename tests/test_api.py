@@ -1,4 +1,4 @@
-import json
+import json, subprocess, sys
 import pandas as pd
 from datascience.config_manager import load_config
 from app import create_app
@@ -34,3 +34,18 @@ def test_predict_one_row():
     assert "predictions" in body and isinstance(body["predictions"], list)
     assert len(body["predictions"]) == 1
     assert isinstance(body["predictions"][0], float)
+
+def test_serving_path_skips_heavy_imports():
+    # Fresh interpreter: the fused model serves without pandas, sklearn or matplotlib
+    code = (
+        "import sys\n"
+        "from app import create_app\n"
+        "client = create_app().test_client()\n"
+        "body = open('single_payload.json').read()\n"
+        "assert client.post('/predict', data=body, content_type='application/json').status_code == 200\n"
+        "loaded = [m for m in ('pandas', 'sklearn', 'scipy', 'matplotlib') if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+        "text = client.get('/metrics').get_data(as_text=True)\n"
+        "assert text.count('wine_api_startup_seconds{phase=') == 3\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
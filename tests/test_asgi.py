@@ -0,0 +1,44 @@
+import asyncio, json
+from app import create_app
+from asgi import create_asgi_app
+from datascience.config_manager import load_config
+
+def _features():
+    cfg = load_config("config/config.yaml")
+    return json.loads(open(cfg["paths"]["model_dir"] + "/features.json").read())
+
+async def _call(app, method, path, body=b"", delay=0.0):
+    sent = []
+
+    async def receive():
+        await asyncio.sleep(delay)
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(msg):
+        sent.append(msg)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    return sent[0]["status"], sent[1]["body"]
+
+def test_async_predict_matches_flask():
+    body = {"data": [{f: 1.0 + i for f in _features()} for i in range(3)]}
+    status, out = asyncio.run(_call(create_asgi_app(), "POST", "/predict", json.dumps(body).encode()))
+    expected = create_app().test_client().post("/predict", json=body).get_json()
+    assert status == 200 and json.loads(out) == expected
+
+    status, out = asyncio.run(_call(create_asgi_app(), "POST", "/predict", b'{"data": {"alcohol": 1}}'))
+    assert status == 400 and "Missing keys" in json.loads(out)["error"]
+
+def test_async_rejects_when_full_and_times_out(app_config):
+    app = create_asgi_app(app_config({"async": {"workers": 1, "max_queue": 0}}))
+    body = json.dumps({"data": {f: 1.0 for f in _features()}}).encode()
+
+    async def burst():
+        return await asyncio.gather(*(_call(app, "POST", "/predict", body, delay=0.01) for _ in range(3)))
+
+    statuses = sorted(s for s, _ in asyncio.run(burst()))
+    assert statuses == [200, 429, 429]
+
+    slow = create_asgi_app(app_config({"async": {"timeout_ms": 10}}))
+    status, out = asyncio.run(_call(slow, "POST", "/predict", body, delay=0.2))
+    assert status == 504 and "Timed out" in json.loads(out)["error"]
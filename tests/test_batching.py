@@ -0,0 +1,54 @@
+import json, threading
+import numpy as np
+import pytest
+from datascience.serving.batching import MicroBatcher
+from app import create_app
+
+def test_concurrent_submits_are_coalesced_and_split_back():
+    calls = []
+    def predict(X):
+        calls.append(len(X))
+        return X[:, 0] * 2.0
+
+    batcher = MicroBatcher(predict, max_batch_size=1000, max_wait_ms=50)
+    inputs = [np.full((i % 3 + 1, 2), float(i)) for i in range(24)]
+    results = [None] * len(inputs)
+
+    def worker(i):
+        results[i] = batcher.predict(inputs[i], timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(inputs))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    for X, out in zip(inputs, results):
+        np.testing.assert_array_equal(out, X[:, 0] * 2.0)
+    assert sum(calls) == sum(len(X) for X in inputs)
+    assert len(calls) < len(inputs)
+
+def test_predict_errors_reach_every_caller():
+    def boom(X):
+        raise RuntimeError("model exploded")
+    batcher = MicroBatcher(boom, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="exploded"):
+        batcher.predict(np.zeros((1, 3)), timeout=5)
+    batcher.close()
+
+def test_api_with_batching_enabled(app_config):
+    client = create_app(app_config({"batching": {"enabled": True, "max_batch_size": 8, "max_wait_ms": 1}})).test_client()
+    body = json.loads(open("batch_payload.json").read())
+    resp = client.post("/predict", data=json.dumps(body), content_type="application/json")
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.get_json()["n"] == len(body["data"])
+
+def test_close_answers_queued_requests_and_rejects_new_ones():
+    batcher = MicroBatcher(lambda X: X[:, 0], max_wait_ms=50)
+    fut = batcher.submit(np.ones((1, 2)))
+    batcher.close()
+    np.testing.assert_array_equal(fut.result(timeout=1), [1.0])
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(np.ones((1, 2)))
+    assert batcher._thread is None
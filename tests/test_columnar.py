@@ -0,0 +1,67 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from app import create_app
+from asgi import create_asgi_app
+from datascience.config_manager import load_config
+from datascience.serving import columnar
+
+def _frame(n=5):
+    cfg = load_config("config/config.yaml")
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    return df.drop(columns=[cfg["features"]["target"]]).head(n)
+
+def _decode_response(body: bytes) -> dict:
+    header, offset = columnar.read_header(body)
+    data = np.frombuffer(body, dtype=header["dtype"], offset=offset).reshape(len(header["columns"]), header["rows"])
+    return dict(zip(header["columns"], data))
+
+def test_decode_roundtrip_reorder_and_errors():
+    feats = ["a", "b", "c"]
+    dec = columnar.ColumnarDecoder(feats)
+    cols = {"a": [1.0, 2.0], "b": [3.0, 4.0], "c": [5.0, np.nan]}
+    X = dec.decode(columnar.encode(cols))
+    assert X.shape == (2, 3) and not X.flags.writeable and X.flags.f_contiguous
+    np.testing.assert_array_equal(X, np.array([[1, 3, 5], [2, 4, np.nan]]))
+    shuffled = columnar.encode({"c": cols["c"], "a": cols["a"], "b": cols["b"]}, dtype="<f4")
+    np.testing.assert_array_equal(dec.decode(shuffled), X)
+
+    body = columnar.encode(cols)
+    for bad in (b"JSON" + body[4:], body[:-8], columnar.encode({"a": [1.0], "b": [2.0]}),
+                columnar.encode({**cols, "d": [0.0, 0.0]}), body.replace(b'"<f8"', b'"<i8"')):
+        with pytest.raises(ValueError):
+            dec.decode(bad)
+
+def test_predict_binary_matches_json():
+    client = create_app().test_client()
+    df = _frame()
+    plain = client.post("/predict", json={"data": df.to_dict(orient="records")}).get_json()
+    body = columnar.encode({c: df[c].to_numpy() for c in df.columns})
+    resp = client.post("/predict?std=1", data=body, content_type=columnar.CONTENT_TYPE)
+    assert resp.status_code == 200 and resp.mimetype == columnar.CONTENT_TYPE
+    out = _decode_response(resp.data)
+    assert list(out) == ["prediction", "std"]
+    np.testing.assert_allclose(out["prediction"], plain["predictions"])
+
+    as_json = client.post("/predict", data=body, content_type=columnar.CONTENT_TYPE, headers={"Accept": "application/json"})
+    assert as_json.get_json() == {**plain, "n": len(df)}
+    assert client.post("/predict", data=body[:-8], content_type=columnar.CONTENT_TYPE).status_code == 400
+
+def test_asgi_predict_binary():
+    app = create_asgi_app()
+    df = _frame(2)
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": columnar.encode({c: df[c].to_numpy() for c in df.columns}), "more_body": False}
+
+    async def send(msg):
+        sent.append(msg)
+
+    scope = {"type": "http", "method": "POST", "path": "/predict", "query_string": b"quantiles=0.5",
+             "headers": [(b"content-type", columnar.CONTENT_TYPE.encode())]}
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]["status"] == 200 and (b"content-type", columnar.CONTENT_TYPE.encode()) in sent[0]["headers"]
+    out = _decode_response(sent[1]["body"])
+    assert list(out) == ["prediction", "q0.5"] and len(out["prediction"]) == 2
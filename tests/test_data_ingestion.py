@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datascience.components.data_ingestion import DataIngestion
+from datascience.components.data_validation import DataValidation
+from datascience.config_manager import load_config, load_schema
+
+def _setup(tmp_path, text=None, **ingestion):
+    cfg = load_config("config/config.yaml")
+    schema = load_schema(cfg["paths"]["schema_file"])
+    if text is not None:
+        raw = tmp_path / "wine.csv"
+        raw.write_text(text)
+        cfg = {**cfg, "paths": {**cfg["paths"], "data_raw": str(raw)}}
+    cfg = {**cfg, "ingestion": {**cfg.get("ingestion", {}), **ingestion}}
+    return cfg, schema
+
+def test_chunked_typed_load_matches_plain_read_and_summarises():
+    cfg, schema = _setup(None, chunk_rows=250, float32=True)
+    validation = DataValidation(schema, cfg)
+    df = DataIngestion(cfg, schema).load(validation)
+    plain = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg["io"]["csv_sep"])
+
+    assert df.shape == plain.shape and df["quality"].dtype == np.int64
+    assert (df.drop(columns="quality").dtypes == np.float32).all()
+    np.testing.assert_allclose(df.to_numpy(np.float64), plain.to_numpy(np.float64), rtol=1e-6)
+
+    summary = validation.summary()
+    assert summary["rows"] == len(plain)
+    alcohol = summary["columns"]["alcohol"]
+    assert alcohol["count"] == len(plain) and alcohol["nulls"] == 0
+    assert alcohol["mean"] == pytest.approx(plain["alcohol"].mean(), rel=1e-6)
+    assert alcohol["std"] == pytest.approx(plain["alcohol"].std(), rel=1e-6)
+    assert alcohol["max"] == pytest.approx(plain["alcohol"].max(), rel=1e-6)
+
+def test_load_fills_columns_across_chunks_and_null_upcasts(tmp_path):
+    cfg = load_config("config/config.yaml")
+    lines = open(cfg["paths"]["data_raw"]).read().splitlines()
+    lines[8] = lines[8].rsplit(";", 1)[0] + ";"  # quality missing in the third chunk
+    cfg, schema = _setup(tmp_path, "\r\n".join(lines[:11]), chunk_rows=3)
+    schema = {**schema, "nullable": ["quality"]}
+    df = DataIngestion(cfg, schema).load(DataValidation(schema, cfg))
+    plain = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg["io"]["csv_sep"])
+
+    assert len(df) == 10 and df["quality"].dtype == "Int64" and df["quality"].isna().tolist() == [False] * 7 + [True] + [False] * 2
+    np.testing.assert_array_equal(df["quality"].to_numpy(float, na_value=-1)[:7], plain["quality"][:7])
+    np.testing.assert_array_equal(df["alcohol"].to_numpy(), plain["alcohol"][:10])
+
+@pytest.mark.parametrize("bad, message", [
+    ("7.4;0.7;0;1.9;0.076;11;34;0.9978;3.51;0.56;;5", "'alcohol': 1 nulls, first at data row 5"),
+    ("7.4;0.7;0;1.9;0.076;11;34;0.9978;19.0;0.56;9.4;5", "'pH': 19.0 at data row 5 outside [0, 14]"),
+    ("7.4;0.7;0;1.9;0.076;11;34;0.9978;3.51;0.56;9.4;5.5", "'quality': non-integer 5.5 at data row 5"),
+    ("7.4;0.7;0;1.9;0.076;11;34;0.9978;3.51;abc;9.4;5", "chunk starting at data row 4"),
+])
+def test_first_bad_chunk_fails_fast(tmp_path, bad, message):
+    cfg = load_config("config/config.yaml")
+    lines = open(cfg["paths"]["data_raw"]).read().splitlines()
+    text = "\n".join(lines[:6] + [bad] + lines[6:12]) + "\n"
+    cfg, schema = _setup(tmp_path, text, chunk_rows=4)
+    validation = DataValidation(schema, cfg)
+    seen = []
+    with pytest.raises(ValueError, match=message.replace("[", r"\[").replace("]", r"\]").replace("(", r"\(")):
+        for chunk in DataIngestion(cfg, schema).chunks(validation):
+            seen.append(len(chunk))
+    assert seen == [4]  # the good chunk streamed through; nothing past the bad one was yielded
@@ -0,0 +1,99 @@
+import gc, json, os, socket, subprocess, sys, time, weakref
+import numpy as np
+import pandas as pd
+from app import create_app
+from datascience.config_manager import load_config
+from datascience.serving.drift import DriftMonitor, DriftReference
+
+FEATURES = ["a", "b"]
+
+def _reference(rng):
+    return DriftReference.from_matrix(rng.normal(size=(20000, 2)), FEATURES)
+
+def test_scores_stable_and_shifted_traffic():
+    rng = np.random.default_rng(0)
+    monitor = DriftMonitor(_reference(rng))
+    for _ in range(50):  # many small requests, like live traffic
+        batch = rng.normal(size=(100, 2))
+        batch[:, 1] += 1.0
+        monitor.update(batch)
+    report = monitor.report()
+    a, b = report["features"]["a"], report["features"]["b"]
+    assert report["rows"] == 5000 and report["drifted"] == ["b"]
+    assert a["psi"] < 0.02 and a["ks"] < 0.03
+    assert b["psi"] > 0.5 and abs(b["ks"] - 0.38) < 0.05
+    assert abs(b["mean"] - 1.0) < 0.05 and abs(b["std"] - 1.0) < 0.05
+    assert abs(b["p50"] - 1.0) < 0.05 and abs(a["p95"] - 1.645) < 0.1
+
+def test_worker_states_merge(tmp_path):
+    rng = np.random.default_rng(1)
+    ref = _reference(rng)
+    X1, X2 = rng.normal(size=(300, 2)), rng.normal(2.0, 3.0, size=(200, 2))
+    X1[::10, 0] = np.nan
+
+    other = DriftMonitor(ref, tmp_path)
+    other.update(X1)
+    other.flush()
+    (tmp_path / next(tmp_path.glob("*.npz")).name).rename(tmp_path / "otherhost-1.npz")  # as if another worker wrote it
+    DriftMonitor(_reference(np.random.default_rng(9)), tmp_path).flush()  # different reference: ignored
+
+    monitor = DriftMonitor(ref, tmp_path)
+    monitor.update(X2)
+    state, workers = monitor.merged()
+    both = np.vstack([X1, X2])
+    assert workers == 2
+    np.testing.assert_array_equal(state["n"], [470, 500])
+    np.testing.assert_allclose(state["mean"], np.nanmean(both, axis=0))
+    np.testing.assert_allclose(state["m2"] / state["n"], np.nanvar(both, axis=0))
+    np.testing.assert_array_equal(state["counts"].sum(axis=1), [470, 500])
+
+def test_dead_and_stale_states_are_left_out(tmp_path):
+    rng = np.random.default_rng(2)
+    ref = _reference(rng)
+    writer = DriftMonitor(ref, tmp_path)
+    writer.update(rng.normal(size=(50, 2)))
+    writer.flush()
+    own = tmp_path / f"{socket.gethostname()}-{os.getpid()}.npz"
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    for name in (f"{socket.gethostname()}-{dead.stdout.strip()}.npz", "otherhost-7.npz", "otherhost-8.npz"):
+        (tmp_path / name).write_bytes(own.read_bytes())
+    old = time.time() - 60
+    os.utime(tmp_path / "otherhost-8.npz", (old, old))
+    writer.remove()
+    assert not own.exists()
+
+    monitor = DriftMonitor(ref, tmp_path, flush_s=5)
+    state, workers = monitor.merged()
+    assert workers == 2 and state["n"].tolist() == [50, 50]  # only otherhost-7
+
+def test_state_is_flushed_off_the_request_path(tmp_path):
+    rng = np.random.default_rng(3)
+    monitor = DriftMonitor(_reference(rng), tmp_path, flush_s=0.05)
+    monitor.update(rng.normal(size=(30, 2)))
+    assert not list(tmp_path.glob("*.npz"))  # update() never writes
+    own = tmp_path / f"{socket.gethostname()}-{os.getpid()}.npz"
+    for _ in range(100):
+        if own.exists():
+            break
+        time.sleep(0.02)
+    with np.load(own) as z:
+        assert z["n"].tolist() == [30, 30]
+
+    # A replaced monitor stops its thread and nothing else keeps it alive
+    ref = weakref.ref(monitor)
+    monitor.close()
+    del monitor
+    gc.collect()
+    assert ref() is None
+
+def test_drift_endpoint_counts_predict_traffic(app_config, tmp_path):
+    config = app_config({"drift": {"enabled": True}}, {"drift_dir": str(tmp_path / "drift")})
+    cfg = load_config(config)
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    rows = df.drop(columns=[cfg["features"]["target"]]).head(40).to_dict(orient="records")
+    client = create_app(config).test_client()
+    assert client.post("/predict", data=json.dumps({"data": rows}), content_type="application/json").status_code == 200
+    report = client.get("/drift").get_json()
+    assert report["rows"] == 40 and report["workers"] == 1
+    assert set(report["features"]) == set(rows[0])
+    assert all(f["psi"] is not None for f in report["features"].values())
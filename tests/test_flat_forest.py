@@ -0,0 +1,63 @@
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import MinMaxScaler
+from datascience.config_manager import load_config
+from datascience.flat_forest import FlatForest
+
+def _data():
+    cfg = load_config("config/config.yaml")
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    target = cfg["features"]["target"]
+    return cfg, df.drop(columns=[target]), df[target]
+
+def test_exported_forest_matches_sklearn_on_raw_features():
+    cfg, X, _ = _data()
+    model_dir, proc = Path(cfg["paths"]["model_dir"]), Path(cfg["paths"]["data_processed_dir"])
+    model = joblib.load(model_dir / "model.joblib")
+    scaler = joblib.load(proc / "scaler.joblib")
+    forest = FlatForest.load(model_dir / "forest.npz")
+
+    X = X[list(model.feature_names_in_)]
+    expected = model.predict(pd.DataFrame(scaler.transform(X), columns=X.columns))
+    np.testing.assert_allclose(forest.predict(X.to_numpy()), expected, rtol=1e-12)
+    assert forest.n_trees == len(model.estimators_)
+
+def test_minmax_folding_and_missing_values(tmp_path):
+    _, X, y = _data()
+    X = X.to_numpy()
+    scaler = MinMaxScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=10, max_depth=8, random_state=0).fit(scaler.transform(X), y)
+
+    raw = X[:200].copy()
+    raw[::7, 3] = np.nan
+    forest = FlatForest.load(FlatForest.from_model(model, scaler).save(tmp_path / "f.npz"))
+    np.testing.assert_allclose(forest.predict(raw), model.predict(scaler.transform(raw)), rtol=1e-12)
+
+def test_grouped_walk_matches_one_group():
+    _, X, y = _data()
+    X = X.to_numpy()
+    model = RandomForestRegressor(n_estimators=10, max_depth=8, random_state=0).fit(X, y)
+    forest = FlatForest.from_model(model)
+    raw = X[:300].copy()
+    raw[::11, 5] = np.nan
+    leaves = forest.apply(raw, chunk_pairs=1 << 30)
+    for chunk_pairs in (1, 700, 1000):  # one tree per group, uneven groups, exact groups
+        np.testing.assert_array_equal(forest.apply(raw, chunk_pairs=chunk_pairs), leaves)
+        np.testing.assert_array_equal(forest.apply(np.asfortranarray(raw), chunk_pairs=chunk_pairs), leaves)
+    np.testing.assert_array_equal(leaves, np.stack([t.apply(raw.astype(np.float32)) for t in model.estimators_], axis=1)
+                                  + forest.roots)
+
+def test_path_contributions_sum_to_prediction():
+    _, X, y = _data()
+    X = X.to_numpy()
+    model = RandomForestRegressor(n_estimators=10, max_depth=6, random_state=0).fit(X, y)
+    forest = FlatForest.from_model(model)
+    raw = X[:100].copy()
+    raw[::5, 2] = np.nan
+    bias, contrib = forest.contributions(raw)
+    assert contrib.shape == raw.shape
+    np.testing.assert_allclose(bias + contrib.sum(axis=1), forest.predict(raw), atol=1e-12)
+    assert bias == np.mean([t.tree_.value[0, 0, 0] for t in model.estimators_])
@@ -0,0 +1,81 @@
+import json
+import joblib
+import numpy as np
+from datascience.components.incremental_trainer import IncrementalTrainer
+from datascience.config_manager import load_config
+from datascience.params_loader import load_params
+from datascience.split_store import SplitStore
+
+def _setup(tmp_path):
+    base = load_config("config/config.yaml")
+    lines = open(base["paths"]["data_raw"]).read().splitlines(keepends=True)
+    raw = tmp_path / "wine.csv"
+    raw.write_text("".join(lines[:1001]))
+    cfg = {**base, "paths": {**base["paths"], "data_raw": str(raw),
+                             "data_processed_dir": str(tmp_path / "processed"), "model_dir": str(tmp_path / "model")}}
+    params = load_params("params.yaml")
+    params["model"] = {**params["model"], "n_estimators": 10, "n_jobs": 1}
+    params["incremental"] = {"enabled": True, "trees_per_update": 4}
+    return cfg, params, raw, lines
+
+def _run(cfg, params) -> dict:
+    return json.loads(open(IncrementalTrainer(params, cfg).run()).read())
+
+def test_appended_rows_grow_the_forest_exactly(tmp_path):
+    cfg, params, raw, lines = _setup(tmp_path)
+    state = _run(cfg, params)
+    assert state["last_run"]["mode"] == "full" and state["rows"] == 1000
+
+    with open(raw, "a") as fh:
+        fh.write("".join(lines[1001:1201]) + lines[1201].rstrip("\n")[:10])  # trailing partial row
+    state = _run(cfg, params)
+    assert state["last_run"]["mode"] == "update" and state["rows"] == 1200
+    assert [s["trees"] for s in state["slices"]] == [[0, 10], [10, 12]]
+    assert state["slices"][1]["rows"] == [1000, 1200]
+
+    store = SplitStore(cfg)
+    assert len(store.load("X_train_raw")) + len(store.load("X_test_raw")) == 1200
+    model_dir = tmp_path / "model"
+    model = joblib.load(model_dir / "model.joblib")
+    pipeline = joblib.load(model_dir / "pipeline.joblib")
+    scalers = joblib.load(model_dir / "scalers.joblib")
+    X = store.load("X_test_raw")[pipeline.features]
+    # Each tree sees inputs scaled with the statistics it was grown under
+    per_tree = [
+        tree.predict(scalers[s["scaler"]].transform(X))
+        for s in state["slices"] for tree in model.estimators_[slice(*s["trees"])]
+    ]
+    np.testing.assert_allclose(pipeline.predict(X.to_numpy()), np.mean(per_tree, axis=0), rtol=1e-12)
+
+    assert _run(cfg, params)["last_run"]["mode"] == "noop"
+    raw.write_text(lines[0] + "".join(lines[2:1201]))  # history edited
+    state = _run(cfg, params)
+    assert state["last_run"]["mode"] == "full" and len(state["slices"]) == 1
+
+def test_small_deltas_wait_and_growth_is_bounded(tmp_path):
+    cfg, params, raw, lines = _setup(tmp_path)
+    params["incremental"].update(min_rows=50, max_growth=1.5)
+    size = _run(cfg, params)["bytes"]
+
+    with open(raw, "a") as fh:
+        fh.write(lines[1001])
+    state = _run(cfg, params)
+    assert state["last_run"]["mode"] == "noop" and state["bytes"] == size and len(state["slices"]) == 1
+
+    with open(raw, "a") as fh:
+        fh.write("".join(lines[1002:1061]))
+    state = _run(cfg, params)
+    # 60 rows against 10 trees on 1000: one tree, not trees_per_update
+    assert state["last_run"]["mode"] == "update" and state["slices"][1]["rows"] == [1000, 1060]
+    assert [s["trees"] for s in state["slices"]] == [[0, 10], [10, 11]]
+
+    with open(raw, "a") as fh:
+        fh.write("".join(lines[1061:1461]))
+    state = _run(cfg, params)
+    assert state["last_run"]["mode"] == "update" and state["slices"][-1]["trees"] == [11, 15]
+
+    with open(raw, "a") as fh:
+        fh.write("".join(lines[1461:1561]))
+    state = _run(cfg, params)
+    assert state["last_run"]["mode"] == "full" and "max_growth" in state["last_run"]["reason"]
+    assert [s["trees"] for s in state["slices"]] == [[0, 10]] and state["rows"] == 1560
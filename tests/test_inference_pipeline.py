@@ -0,0 +1,34 @@
+from pathlib import Path
+import joblib
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from datascience.config_manager import load_config
+from datascience.inference import InferencePipeline
+from datascience.split_store import SplitStore
+
+def _raw_split():
+    cfg = load_config("config/config.yaml")
+    store = SplitStore(cfg)
+    return cfg, store.load("X_test_raw"), store.load("X_test")
+
+def test_pipeline_artifact_matches_model_on_scaled_split():
+    cfg, Xraw, Xscaled = _raw_split()
+    model_dir = Path(cfg["paths"]["model_dir"])
+    pipeline = joblib.load(model_dir / "pipeline.joblib")
+    model = joblib.load(model_dir / "model.joblib")
+
+    Xin = Xraw[pipeline.features].to_numpy()
+    before = Xin.copy()
+    np.testing.assert_allclose(pipeline.predict(Xin), model.predict(Xscaled), rtol=1e-12)
+    np.testing.assert_array_equal(Xin, before)  # copy=True leaves the caller's matrix alone
+
+def test_linear_model_folds_scaler_into_coefficients():
+    _, Xraw, _ = _raw_split()
+    y = Xraw["alcohol"] * 0.3 - Xraw["volatile acidity"] + 5.0
+    for scaler in (StandardScaler(), MinMaxScaler()):
+        Xs = scaler.fit_transform(Xraw)
+        lr = LinearRegression().fit(Xs, y)
+        pipe = InferencePipeline.fuse(list(Xraw.columns), lr, scaler)
+        assert pipe.fused and pipe.model is None
+        np.testing.assert_allclose(pipe.predict(Xraw.to_numpy()), lr.predict(Xs), atol=1e-9)
@@ -0,0 +1,35 @@
+import json
+from datascience.serving.metrics import Registry, SIZE_BUCKETS
+from app import create_app
+
+def test_histogram_renders_cumulative_buckets():
+    reg = Registry()
+    h = reg.histogram("rows", "Rows.", buckets=SIZE_BUCKETS)
+    for v in (1, 3, 3, 5000):
+        h.observe(v)
+    c = reg.counter("errors_total", "Errors.", ("type",))
+    c.labels("ValueError").inc()
+    text = reg.render()
+    assert 'rows_bucket{le="1"} 1' in text
+    assert 'rows_bucket{le="4"} 3' in text
+    assert 'rows_bucket{le="+Inf"} 4' in text
+    assert "rows_count 4" in text and "rows_sum 5007.0" in text
+    assert 'errors_total{type="ValueError"} 1.0' in text
+
+def test_metrics_endpoint_counts_stages_and_errors():
+    from datascience.config_manager import load_config
+    features = json.loads(open(load_config("config/config.yaml")["paths"]["model_dir"] + "/features.json").read())
+    client = create_app().test_client()
+    ok = client.post("/predict", json={"data": [{f: 1.0 for f in features}] * 3})
+    bad = client.post("/predict", json={"data": {"alcohol": 1.0}})
+    assert ok.status_code == 200 and bad.status_code == 400
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.content_type.startswith("text/plain")
+    text = resp.get_data(as_text=True)
+    for stage in ("parse", "validate", "scale", "predict", "serialize"):
+        assert f'wine_api_stage_seconds_count{{stage="{stage}"}} 1' in text
+    assert 'wine_api_batch_rows_bucket{le="4"} 1' in text
+    assert 'wine_api_errors_total{type="ValueError"} 1.0' in text
+    assert 'wine_api_requests_total{endpoint="/predict",status="200"} 1.0' in text
+    assert "wine_api_in_flight_requests 0.0" in text
@@ -0,0 +1,34 @@
+import json, subprocess, sys
+from datascience.config_manager import load_config
+from datascience.params_loader import load_params
+from datascience.components.model_diagnostics import ModelDiagnostics
+
+def test_parallel_render_with_svg_and_data_exports(tmp_path):
+    cfg = load_config("config/config.yaml")
+    cfg["paths"] = {**cfg["paths"], "reports_dir": str(tmp_path)}
+    params = load_params("params.yaml")
+    params["diagnostics"] = {"n_workers": 2, "formats": ["png", "svg"], "export_data": True, "max_scatter_points": 50}
+    paths = ModelDiagnostics(params, cfg).run()
+
+    names = {p.split("/")[-1] for p in paths}
+    for plot in ("residuals_hist", "pred_vs_true", "error_by_target", "feature_importance"):
+        assert {f"{plot}.png", f"{plot}.svg", f"{plot}.data.json"} <= names
+    assert (tmp_path / "pred_vs_true.svg").read_text().lstrip().startswith("<?xml")
+    scatter = json.loads((tmp_path / "pred_vs_true.data.json").read_text())
+    assert len(scatter["y_true"]) == 50 < scatter["rows"]
+    timings = json.loads((tmp_path / "diagnostics_timings.json").read_text())
+    assert set(timings["plots"]) == {"residuals_hist", "pred_vs_true", "error_by_target", "feature_importance",
+                                     "permutation_importance"}
+    report = (tmp_path / "report.md").read_text()
+    assert "render seconds" in report and "Permutation importance" in report and "Tree-path attributions" in report
+    assert {"permutation_importance.json", "attributions.csv"} <= names
+
+def test_render_needs_no_pyplot(tmp_path):
+    code = (
+        "import sys, numpy as np\n"
+        "from datascience.components.model_diagnostics import _render\n"
+        f"_render('residuals_hist', {{'residuals': np.arange(100.0)}}, {str(tmp_path)!r}, ['png'], 72, False)\n"
+        "assert 'matplotlib.pyplot' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert (tmp_path / "residuals_hist.png").stat().st_size > 0
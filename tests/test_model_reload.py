@@ -0,0 +1,101 @@
+import json, shutil, threading, time
+import joblib
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from app import create_app
+from datascience.components.model_trainer import _replace
+from datascience.config_manager import load_config
+from datascience.inference import InferencePipeline
+from datascience.serving.reloader import ModelReloader
+from datascience.split_store import SplitStore
+
+def test_reloader_waits_for_stable_files_and_canary(tmp_path):
+    watched = tmp_path / "pipeline.joblib"
+    watched.write_text("v1")
+    loads = []
+
+    def load():
+        loads.append(watched.read_text())
+        return loads[-1]
+
+    def canary(snap):
+        if snap == "broken":
+            raise ValueError("bad model")
+
+    r = ModelReloader(load, watch=[watched], poll_s=0, canary=canary)
+    assert r.current == "v1" and not r.check()
+
+    watched.write_text("v2-new")
+    assert not r.check()  # first sighting: wait for the writer to finish
+    assert r.check() and r.current == "v2-new" and r.swaps == 1
+
+    watched.write_text("broken")
+    assert not r.check() and not r.check()
+    assert r.current == "v2-new" and r.failures == 1 and "bad model" in r.last_error
+    assert not r.check() and len(loads) == 3  # not retried until the files change again
+
+def test_app_swaps_model_without_restart(tmp_path, app_config):
+    base = load_config("config/config.yaml")
+    model_dir = tmp_path / "model"
+    shutil.copytree(base["paths"]["model_dir"], model_dir)
+    # serving.mmap stays on: artifacts are published write-then-rename, so the old model keeps its mapping
+    path = app_config({"reload": {"enabled": True, "poll_s": 0.05}, "cache": {"enabled": False}},
+                      paths={"model_dir": str(model_dir)})
+
+    features = json.loads((model_dir / "features.json").read_text())
+    Xraw = SplitStore(base).load("X_test_raw")[features]
+    body = {"data": Xraw.head(3).to_dict(orient="records")}
+    client = create_app(path).test_client()
+    v1 = client.get("/health").get_json()["model_version"]
+    before = client.post("/predict", json=body).get_json()["predictions"]
+
+    def wait_for_version(old, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            version = client.get("/health").get_json()["model_version"]
+            if version != old:
+                return version
+            time.sleep(0.05)
+        return old
+
+    # A broken artifact is rejected and the old model keeps serving
+    _replace(model_dir / "pipeline.joblib", lambda p: p.write_bytes(b"not a pickle"))
+    time.sleep(0.5)
+    assert client.post("/predict", json=body).get_json()["predictions"] == before
+
+    lr = LinearRegression().fit(Xraw.to_numpy(), np.arange(len(Xraw)) % 7)
+    new = InferencePipeline.fuse(features, lr)
+    _replace(model_dir / "pipeline.joblib", lambda p: joblib.dump(new, p))
+    v2 = wait_for_version(v1)
+    assert v2 != v1
+    after = client.post("/predict", json=body).get_json()["predictions"]
+    np.testing.assert_allclose(after, new.predict(Xraw.head(3).to_numpy()))
+    text = client.get("/metrics").get_data(as_text=True)
+    assert "wine_api_model_reloads_total 1.0" in text
+    assert "wine_api_model_reload_failures_total 1.0" in text
+
+def test_replaced_snapshot_retires_after_its_last_request(tmp_path):
+    watched = tmp_path / "pipeline.joblib"
+    watched.write_text("v1")
+    retired = []
+    r = ModelReloader(lambda: [watched.read_text()], watch=[watched], poll_s=0, on_retire=retired.append)
+    held = r.acquire()
+
+    watched.write_text("v2-new")
+    assert not r.check() and r.check()
+    assert r.current == ["v2-new"] and retired == []  # still in use
+    r.release(held)
+    assert retired == [["v1"]]
+
+    watched.write_text("v3-newer")
+    assert not r.check() and r.check()
+    assert retired == [["v1"], ["v2-new"]]  # idle: retired at the swap
+
+def test_warmup_leaves_the_reloader_to_the_first_request(app_config):
+    # Under preload_app, create_app() runs in the gunicorn master: no thread may start there
+    reloaders = lambda: sum(t.name == "model-reloader" for t in threading.enumerate())
+    before = reloaders()
+    client = create_app(app_config({"warmup": True, "reload": {"enabled": True, "poll_s": 60}})).test_client()
+    assert reloaders() == before
+    assert client.get("/health").status_code == 200
+    assert reloaders() == before + 1
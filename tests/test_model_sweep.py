@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+import joblib
+from datascience.config_manager import load_config
+from datascience.params_loader import load_params
+from datascience.components.model_sweep import ModelSweep
+
+def test_sweep_halves_candidates_and_writes_winner(tmp_path):
+    cfg = load_config("config/config.yaml")
+    cfg["paths"] = {**cfg["paths"], "model_dir": str(tmp_path / "model"), "reports_dir": str(tmp_path / "reports")}
+    params = load_params("params.yaml")
+    params["sweep"] = {
+        "cv_folds": 3, "min_folds": 1, "halving_factor": 2, "n_workers": 2,
+        "grid": {"type": ["random_forest", "linear"], "n_estimators": [5, 10], "max_depth": [4]},
+    }
+
+    sweep = ModelSweep(params, cfg)
+    assert len(sweep.candidates()) == 3  # linear collapses the tree-only keys
+
+    out = json.loads(Path(sweep.run()).read_text())
+    assert out["rungs"] == [1, 2, 3]
+    assert [sum(t["rung"] == r for t in out["trials"]) for r in range(3)] == [3, 2, 1]
+    assert all(t["wall_time_s"] > 0 and len(t["fold_scores"]) == t["folds"] for t in out["trials"])
+
+    best = out["best"]
+    assert best["folds"] == 3
+    pipeline = joblib.load(tmp_path / "model" / "pipeline.joblib")
+    assert pipeline.features and (pipeline.coef_ is not None) == (best["model"]["type"] == "linear")
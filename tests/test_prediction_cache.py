@@ -0,0 +1,61 @@
+import json, os, time
+import numpy as np
+from app import create_app
+from datascience.config_manager import load_config
+from datascience.serving.cache import PredictionCache
+
+class _Model:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, X):
+        self.calls.append(len(X))
+        return X.sum(axis=1)
+
+def test_batch_only_computes_distinct_misses():
+    cache, model = PredictionCache(max_size=10), _Model()
+    X = np.array([[1.0, 2.0], [3.0, 4.0]])
+    np.testing.assert_array_equal(cache.predict(X, model), [3.0, 7.0])
+    batch = np.array([[3.0, 4.0], [5.0, 6.0], [5.0, 6.0], [-0.0, 1.0], [0.0, 1.0]])
+    np.testing.assert_array_equal(cache.predict(batch, model), [7.0, 11.0, 11.0, 1.0, 1.0])
+    assert model.calls == [2, 2]
+    assert (cache.hits, cache.misses) == (1, 6)
+
+def test_lru_ttl_and_file_invalidation(tmp_path):
+    watched = tmp_path / "model.joblib"
+    watched.write_bytes(b"v1")
+    cache, model = PredictionCache(max_size=2, ttl_s=0.05, watch=[watched], check_interval_s=0), _Model()
+    rows = [np.array([[float(i)]]) for i in range(3)]
+    for r in rows:
+        cache.predict(r, model)
+    assert len(cache) == 2 and cache.evictions == 1
+    cache.predict(rows[2], model)
+    assert model.calls == [1, 1, 1]
+    time.sleep(0.06)
+    cache.predict(rows[2], model)
+    assert model.calls == [1, 1, 1, 1]  # expired
+
+    watched.write_bytes(b"v2-longer")
+    cache.predict(rows[2], model)
+    assert cache.invalidations == 1 and model.calls == [1, 1, 1, 1, 1]
+
+def test_app_cache_counters_on_metrics(app_config):
+    cfg = load_config("config/config.yaml")
+    features = json.loads(open(os.path.join(cfg["paths"]["model_dir"], "features.json")).read())
+
+    client = create_app(app_config({"cache": {"enabled": True, "max_size": 100}})).test_client()
+    body = {"data": {f: 1.0 for f in features}}
+    first = client.post("/predict", json=body).get_json()
+    second = client.post("/predict", json=body).get_json()
+    assert first == second
+    text = client.get("/metrics").get_data(as_text=True)
+    assert "wine_api_cache_hits_total 1.0" in text and "wine_api_cache_misses_total 1.0" in text
+
+def test_tags_keep_models_apart_across_a_clear():
+    cache = PredictionCache(max_size=10)
+    old, new = (lambda X: np.full(len(X), 4.66)), (lambda X: np.full(len(X), 997.46))
+    X = np.array([[1.0, 2.0]])
+    cache.clear()  # swap: then a request still holding the old snapshot finishes
+    assert cache.predict(X, old, tag=b"v1")[0] == 4.66
+    assert cache.predict(X, new, tag=b"v2")[0] == 997.46
+    assert cache.predict(X, old, tag=b"v1")[0] == 4.66 and cache.hits == 1
@@ -0,0 +1,41 @@
+import json
+import numpy as np
+import pandas as pd
+from datascience.config_manager import load_config
+from app import _load_artifacts
+from score import score_file
+
+def _expected():
+    cfg = load_config("config/config.yaml")
+    features, pipeline = _load_artifacts(cfg)
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    return cfg, df, pipeline.predict(df[features].to_numpy())
+
+def test_csv_stream_matches_pipeline(tmp_path):
+    cfg, df, expected = _expected()
+    out = tmp_path / "pred.csv"
+    stats = score_file(cfg["paths"]["data_raw"], str(out), chunk_size=250, workers=2)
+    assert stats["rows"] == len(df) and stats["rows_per_sec"] > 0
+    np.testing.assert_array_equal(pd.read_csv(out)["prediction"].to_numpy(), expected)
+
+def test_jsonl_stream_keeps_input_columns(tmp_path):
+    _, df, expected = _expected()
+    src = tmp_path / "rows.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in df.head(120).to_dict(orient="records")))
+    out = tmp_path / "pred.jsonl"
+    score_file(str(src), str(out), chunk_size=50, workers=1, with_input=True)
+
+    lines = [json.loads(l) for l in out.read_text().splitlines()]
+    assert len(lines) == 120 and lines[0]["quality"] == df["quality"].iloc[0]
+    np.testing.assert_array_equal([l["prediction"] for l in lines], expected[:120])
+
+def test_csv_sep_overrides_config_and_output_is_comma_separated(tmp_path):
+    _, df, expected = _expected()
+    src = tmp_path / "rows.csv"
+    df.head(80).to_csv(src, index=False)  # comma-separated, unlike io.csv_sep
+    out = tmp_path / "pred.csv"
+    score_file(str(src), str(out), chunk_size=30, workers=1, with_input=True, sep=",")
+
+    scored = pd.read_csv(out)
+    assert list(scored.columns) == [*df.columns, "prediction"]
+    np.testing.assert_array_equal(scored["prediction"].to_numpy(), expected[:80])
@@ -0,0 +1,39 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from datascience.config_manager import load_config
+from datascience.serving.decoder import RequestDecoder
+from app import _load_artifacts
+
+def _sample_rows(n):
+    cfg = load_config("config/config.yaml")
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    return cfg, df.drop(columns=[cfg["features"]["target"]]).head(n).to_dict(orient="records")
+
+def test_decoder_matches_legacy_frame():
+    cfg, rows = _sample_rows(5)
+    features, _ = _load_artifacts(cfg)
+    payload = json.loads(json.dumps({"data": rows}))
+
+    X = RequestDecoder(features).decode(payload)
+    # Reference: the pandas framing /predict used before the decoder
+    legacy = pd.DataFrame(payload["data"], columns=features).apply(pd.to_numeric, errors="raise")
+    assert X.dtype == np.float64 and X.shape == (5, len(features))
+    np.testing.assert_array_equal(X, legacy.to_numpy(dtype=np.float64))
+
+def test_decoder_rejects_bad_payloads():
+    cfg, rows = _sample_rows(2)
+    features = list(rows[0].keys())
+    dec = RequestDecoder(features)
+
+    with pytest.raises(ValueError, match="'data' key"):
+        dec.decode([rows[0]])
+    with pytest.raises(ValueError, match="non-empty"):
+        dec.decode({"data": []})
+    with pytest.raises(ValueError, match="Missing keys"):
+        dec.decode({"data": [rows[0], {k: v for k, v in rows[1].items() if k != "pH"}]})
+    with pytest.raises(ValueError, match="Unexpected keys"):
+        dec.decode({"data": {**rows[0], "color": 1.0}})
+    with pytest.raises(ValueError):
+        dec.decode({"data": {**rows[0], "pH": "acidic"}})
@@ -0,0 +1,30 @@
+from pathlib import Path
+import numpy as np
+from app import _load_artifacts
+from datascience.config_manager import load_config
+from datascience.flat_forest import FlatForest
+from datascience.serving.memory import memory_usage
+from datascience.split_store import SplitStore
+
+def _mapped_file(a) -> str | None:
+    while a is not None:
+        if isinstance(a, np.memmap):
+            return a.filename
+        a = getattr(a, "base", None)
+    return None
+
+def test_mmap_load_shares_arrays_and_predicts_identically():
+    cfg = load_config("config/config.yaml")
+    features, mapped = _load_artifacts({**cfg, "serving": {"mmap": True}})
+    _, loaded = _load_artifacts({**cfg, "serving": {"mmap": False}})
+    X = SplitStore(cfg).load("X_test_raw")[features].to_numpy()
+    np.testing.assert_array_equal(mapped.predict(X), loaded.predict(X))
+    if isinstance(mapped.model, FlatForest):
+        assert type(mapped.model.threshold) is np.ndarray  # plain view, no memmap subclass overhead
+        # The published file itself, so every worker (and every reload) maps the same pages
+        assert _mapped_file(mapped.model.threshold) == str(Path(cfg["paths"]["model_dir"]) / "pipeline.joblib")
+
+def test_memory_usage_reports_current_process():
+    usage = memory_usage()
+    assert set(usage) == {"rss_mb", "pss_mb", "shared_mb", "uss_mb"}
+    assert usage["rss_mb"] > 0
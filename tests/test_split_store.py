@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datascience.split_store import SplitStore
+
+def _store(tmp_path, fmt, export_csv=False):
+    cfg = {"paths": {"data_processed_dir": str(tmp_path)},
+           "io": {"split_format": fmt, "split_csv_export": export_csv}}
+    return SplitStore(cfg)
+
+def _splits():
+    X = pd.DataFrame({"alcohol": [9.4, 9.8, 10.1], "pH": [3.51, 3.2, 3.26]}, index=[7, 3, 5])
+    y = pd.Series([5, 6, 5], name="quality", index=[7, 3, 5])
+    return X, y
+
+@pytest.mark.parametrize("fmt", ["npy", "csv", "parquet", "feather"])
+def test_round_trip(tmp_path, fmt):
+    if fmt in ("parquet", "feather"):
+        pytest.importorskip("pyarrow")
+    X, y = _splits()
+    store = _store(tmp_path, fmt)
+    store.save({"X_train": X, "y_train": y})
+
+    X2, y2 = store.load("X_train"), store.load("y_train")
+    assert list(X2.columns) == list(X.columns)
+    np.testing.assert_array_equal(X2.to_numpy(), X.to_numpy())
+    assert isinstance(y2, pd.Series) and y2.tolist() == y.tolist()
+
+def test_npy_is_memory_mapped_and_survives_rewrite(tmp_path):
+    X, y = _splits()
+    store = _store(tmp_path, "npy", export_csv=True)
+    store.save({"X_test": X, "y_test": y})
+    assert (tmp_path / "X_test.csv").exists()
+
+    first = store.load("X_test")
+    base = first.to_numpy()
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert base is not None, "npy split should be a view of the memory-mapped file"
+    store.save({"X_test": X * 2, "y_test": y})
+    np.testing.assert_array_equal(first.to_numpy(), X.to_numpy())  # old mapping still valid
+    np.testing.assert_array_equal(store.load("X_test").to_numpy(), X.to_numpy() * 2)
+
+@pytest.mark.parametrize("fmt", ["npy", "csv"])
+def test_load_array_reorders_columns(tmp_path, fmt):
+    X, _ = _splits()
+    store = _store(tmp_path, fmt)
+    store.save({"X_train": X})
+    arr = store.load_array("X_train", ["pH", "alcohol"])
+    assert arr.dtype == np.float64
+    np.testing.assert_array_equal(arr, X[["pH", "alcohol"]].to_numpy())
+    with pytest.raises(KeyError):
+        store.load_array("X_train", ["density"])
+
+def test_unknown_format_rejected(tmp_path):
+    with pytest.raises(ValueError, match="split_format"):
+        _store(tmp_path, "xlsx")
@@ -0,0 +1,69 @@
+import os, shutil
+from datascience.stage_cache import StageCache
+
+def _cache(tmp_path, force=False):
+    return StageCache({"paths": {"cache_dir": str(tmp_path / "cache"), "model_dir": str(tmp_path)}}, force=force)
+
+def _stage(tmp_path, calls):
+    out = tmp_path / "out.txt"
+    def fn():
+        calls.append(1)
+        out.write_text((tmp_path / "in.txt").read_text().upper())
+        return str(out)
+    return fn
+
+def test_stage_skips_until_inputs_or_outputs_change(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("red wine")
+    calls = []
+    fn = _stage(tmp_path, calls)
+    spec = dict(files=[src], data={"model": {"n_estimators": 200}}, outputs=lambda p: [p])
+
+    assert _cache(tmp_path).run("s", fn, **spec)[1] is True
+    assert _cache(tmp_path).state["stages"]["s"]["seconds"] >= 0
+    assert _cache(tmp_path).run("s", fn, **spec)[1] is False  # fresh process, same inputs
+
+    spec["data"] = {"model": {"n_estimators": 300}}
+    assert _cache(tmp_path).run("s", fn, **spec)[1] is True
+
+    src.write_text("white wine")
+    assert _cache(tmp_path).run("s", fn, **spec)[1] is True
+
+    os.remove(tmp_path / "out.txt")
+    assert _cache(tmp_path).run("s", fn, **spec)[1] is True
+
+    assert _cache(tmp_path, force=True).run("s", fn, **spec)[1] is True
+    assert len(calls) == 5
+
+def test_touch_without_content_change_stays_cached(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("red wine")
+    calls = []
+    fn = _stage(tmp_path, calls)
+    spec = dict(files=[src], outputs=lambda p: [p])
+    _cache(tmp_path).run("s", fn, **spec)
+
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert _cache(tmp_path).run("s", fn, **spec)[1] is False
+    assert len(calls) == 1
+
+def test_cache_survives_moving_the_checkout(tmp_path):
+    def project(root):
+        cache = StageCache({"paths": {"cache_dir": str(root / "cache"), "model_dir": str(root)},
+                            "_config_path": str(root / "config" / "config.yaml")})
+        return cache, dict(files=[root / "in.txt"], outputs=lambda p: [p])
+
+    a = tmp_path / "a"
+    a.mkdir()
+    (a / "in.txt").write_text("red wine")
+    calls = []
+    cache, spec = project(a)
+    cache.run("s", _stage(a, calls), **spec)
+    assert list(cache.state["stages"]["s"]["outputs"]) == ["out.txt"]
+
+    b = tmp_path / "b"
+    shutil.copytree(a, b)
+    cache, spec = project(b)
+    assert cache.run("s", _stage(b, calls), **spec)[1] is False
+    assert cache.outputs("s") == [str(b / "out.txt")] and len(calls) == 1
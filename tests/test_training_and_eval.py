@@ -1,12 +1,14 @@
 from pathlib import Path
-import json
+import json, math
+import numpy as np
+from sklearn.metrics import mean_squared_error, r2_score
 from datascience.config_manager import load_config
 from datascience.params_loader import load_params
 from datascience.components.data_ingestion import DataIngestion
 from datascience.components.data_validation import DataValidation
 from datascience.components.data_transformation import DataTransformation
 from datascience.components.model_trainer import ModelTrainer
-from datascience.components.model_evaluation import ModelEvaluation
+from datascience.components.model_evaluation import ModelEvaluation, bootstrap_metrics
 
 def test_train_and_evaluate():
     CFG = load_config("config/config.yaml")
@@ -23,3 +25,21 @@ def test_train_and_evaluate():
     metrics = json.loads(metrics_file.read_text())
     assert "baseline" in metrics and "model" in metrics
     assert metrics["model"]["rmse"] <= metrics["baseline"]["rmse"] + 1e-9
+    boot = metrics["bootstrap"]
+    assert boot["model"]["rmse"]["low"] <= metrics["model"]["rmse"] <= boot["model"]["rmse"]["high"]
+    assert boot["model_vs_baseline"]["rmse"]["p_better"] > 0.95
+
+def test_bootstrap_matches_a_loop_over_resamples():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=50)
+    pred = y + rng.normal(scale=0.5, size=50)
+    boot = bootstrap_metrics(y, {"model": pred, "zero": 0.0}, n_resamples=300, seed=3, max_cells=50 * 7)
+
+    # same draws, one resample at a time
+    draws = np.random.default_rng(3)
+    idx = np.vstack([draws.integers(0, 50, size=(min(7, 300 - s), 50)) for s in range(0, 300, 7)])
+    rmse = [math.sqrt(mean_squared_error(y[i], pred[i])) for i in idx]
+    r2 = [r2_score(y[i], pred[i]) for i in idx]
+    np.testing.assert_allclose([boot["model"]["rmse"]["low"], boot["model"]["rmse"]["high"]], np.percentile(rmse, [2.5, 97.5]))
+    np.testing.assert_allclose(boot["model"]["r2"]["std"], np.std(r2))
+    assert boot["model_vs_zero"]["mae"]["high"] < 0
@@ -0,0 +1,50 @@
+import asyncio, json
+import numpy as np
+import pandas as pd
+import pytest
+from app import create_app
+from asgi import create_asgi_app
+from datascience.config_manager import load_config
+from datascience.serving.uncertainty import as_json, parse_uncertainty, tree_spread
+
+def _rows(n=3):
+    cfg = load_config("config/config.yaml")
+    df = pd.read_csv(cfg["paths"]["data_raw"], sep=cfg.get("io", {}).get("csv_sep", ","))
+    return df.drop(columns=[cfg["features"]["target"]]).head(n).to_dict(orient="records")
+
+def test_parse_and_spread():
+    assert parse_uncertainty({}) == (False, [])
+    assert parse_uncertainty({"std": "true", "quantiles": "0.1, 0.9"}) == (True, [0.1, 0.9])
+    for bad in ("1.5", "low"):
+        with pytest.raises(ValueError):
+            parse_uncertainty({"quantiles": bad})
+    per_tree = np.array([[1.0, 2.0, 3.0], [5.0, 5.0, 5.0]])
+    out = as_json(tree_spread(per_tree, True, [0.5]))
+    assert out == {"predictions": [2.0, 5.0], "std": [pytest.approx(np.std([1, 2, 3])), 0.0], "quantiles": {"0.5": [2.0, 5.0]}}
+
+def test_predict_returns_tree_spread():
+    client = create_app().test_client()
+    body = json.dumps({"data": _rows()})
+    plain = client.post("/predict", data=body, content_type="application/json").get_json()
+    resp = client.post("/predict?std=1&quantiles=0,0.5,1", data=body, content_type="application/json")
+    assert resp.status_code == 200, resp.get_json()
+    out = resp.get_json()
+    assert out["predictions"] == plain["predictions"] and out["n"] == 3
+    lo, hi = out["quantiles"]["0"], out["quantiles"]["1"]
+    assert all(l <= p <= h and s > 0 for l, p, h, s in zip(lo, out["predictions"], hi, out["std"]))
+    assert client.post("/predict?quantiles=2", data=body, content_type="application/json").status_code == 400
+
+def test_asgi_predict_returns_tree_spread():
+    app = create_asgi_app()
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": json.dumps({"data": _rows(1)}).encode(), "more_body": False}
+
+    async def send(msg):
+        sent.append(msg)
+
+    scope = {"type": "http", "method": "POST", "path": "/predict", "query_string": b"std=1"}
+    asyncio.run(app(scope, receive, send))
+    out = json.loads(sent[1]["body"])
+    assert sent[0]["status"] == 200 and len(out["std"]) == 1 and "quantiles" not in out